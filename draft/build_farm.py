@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Build farm: XC8 compiles on worker processes over TCP
+
+The coordinator (compile_v2.py --farm, scons farm=...) preprocesses each
+source locally, so workers need neither the project tree nor its headers,
+and ships the preprocessed code and the code generation flags to the
+workers; they compile it with their own XC8 and send the .p1 back.
+
+Protocol: one JSON object per line in each direction on a TCP connection,
+file contents base64-encoded.
+
+  {"op": "hello"}                 -> {"ok": true, "worker": ..., "jobs": N}
+  {"op": "compile", "key": ...,   -> {"ok": true, "object": ..., "output": ...}
+   "name": "main.c", "flags": [...], "source": ...}
+
+Objects are keyed by the SHA-1 of the compiler, the flags and the
+preprocessed code: identical units in one build are compiled once, and
+both the coordinator (build/farm_cache/) and each worker keep the objects
+they have seen, so a unit already built anywhere is not compiled again.
+When a worker drops a connection its jobs go back in the queue for the
+others (up to MAX_ATTEMPTS per unit); with no worker left, the remaining
+units are compiled locally.
+
+Example (several workers on loopback):
+  python build_farm.py worker --port 7101 &
+  python build_farm.py worker --port 7102 --die-after 2 &
+  python compile_v2.py --farm localhost:7101,localhost:7102
+"""
+
+import os
+import sys
+import json
+import queue
+import base64
+import socket
+import hashlib
+import argparse
+import tempfile
+import functools
+import threading
+import subprocess
+import socketserver
+from pathlib import Path
+
+# Farm configuration
+DEFAULT_PORT = 7100
+CACHE_DIR = Path(__file__).resolve().parent.parent / "build" / "farm_cache"
+WORKER_CACHE_DIR = Path(tempfile.gettempdir()) / "pic_farm_worker"
+CONNECT_TIMEOUT = 5.0  # seconds
+COMPILE_TIMEOUT = 300.0  # seconds, one unit
+MAX_ATTEMPTS = 3
+CC_ENV = "PIC_CC"
+XC8_VERSION = "3.00"
+
+# Flags only the preprocessor needs: applied by the coordinator, not sent
+PREPROCESSOR_PREFIXES = ("-I", "-D", "-U")
+
+
+class FarmError(Exception):
+    """A unit could not be compiled, remotely or locally"""
+
+
+class WorkerLost(Exception):
+    """The connection to a worker broke"""
+
+
+def find_cc():
+    """XC8 driver: $PIC_CC, else xc8_wrapper's lookup"""
+    if os.environ.get(CC_ENV):
+        return os.environ[CC_ENV]
+    from xc8_wrapper import get_xc8_tool_path
+
+    path, _ = get_xc8_tool_path("cc", XC8_VERSION)
+    return str(path)
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_id(cc):
+    """Identifies a compiler build in cache keys"""
+    result = subprocess.run([cc, "--version"], capture_output=True, text=True)
+    lines = (result.stdout or result.stderr).strip().splitlines()
+    return lines[0] if lines else str(cc)
+
+
+def codegen_flags(flags):
+    return [flag for flag in flags if not flag.startswith(PREPROCESSOR_PREFIXES)]
+
+
+def unit_key(compiler, flags, preprocessed):
+    digest = hashlib.sha1(json.dumps([compiler, flags]).encode())
+    digest.update(preprocessed)
+    return digest.hexdigest()
+
+
+def compile_unit(cc, flags, name, preprocessed, cache_dir):
+    """Compile preprocessed code to an object: (ok, object bytes, compiler output)"""
+    key = unit_key(compiler_id(cc), flags, preprocessed)
+    cached = cache_dir / f"{key}.p1"
+    if cached.exists():
+        return True, cached.read_bytes(), ""
+    with tempfile.TemporaryDirectory(prefix="pic_farm_") as work:
+        source = Path(work) / f"{Path(name).stem}.i"
+        obj = Path(work) / f"{Path(name).stem}.p1"
+        source.write_bytes(preprocessed)
+        result = subprocess.run([cc] + flags + ["-c", "-o", str(obj), str(source)],
+                                capture_output=True, text=True, timeout=COMPILE_TIMEOUT)
+        output = result.stdout + result.stderr
+        if result.returncode != 0 or not obj.exists():
+            return False, b"", output
+        data = obj.read_bytes()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cached.write_bytes(data)
+    return True, data, output
+
+
+# Worker
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        for line in self.rfile:
+            request = json.loads(line)
+            if request.get("op") == "hello":
+                reply = {"ok": True, "worker": server.name, "jobs": server.jobs}
+            elif request.get("op") == "compile":
+                with server.slots:
+                    ok, data, output = compile_unit(
+                        server.cc, request["flags"], request["name"],
+                        base64.b64decode(request["source"]), server.cache_dir,
+                    )
+                reply = {"ok": ok, "key": request["key"], "output": output,
+                         "object": base64.b64encode(data).decode()}
+                server.count_compile()
+            else:
+                reply = {"ok": False, "output": f"unknown op {request.get('op')!r}"}
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+            self.wfile.flush()
+
+
+class WorkerServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Compiles units for coordinators, `jobs` at a time"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, cc, jobs=1, cache_dir=WORKER_CACHE_DIR, die_after=None):
+        super().__init__(address, _WorkerHandler)
+        self.cc = cc
+        self.jobs = jobs
+        self.slots = threading.Semaphore(jobs)
+        self.cache_dir = Path(cache_dir)
+        self.name = f"{socket.gethostname()}:{self.server_address[1]}"
+        self.die_after = die_after
+        self.compiled = 0
+        self._lock = threading.Lock()
+
+    def count_compile(self):
+        with self._lock:
+            self.compiled += 1
+            if self.die_after is not None and self.compiled >= self.die_after:
+                print(f"⚠️ {self.name}: exiting after {self.compiled} unit(s) (--die-after)", flush=True)
+                os._exit(1)
+
+
+# Coordinator
+
+
+def parse_workers(text):
+    """"host:port,host:port" -> [(host, port)]"""
+    workers = []
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        host, separator, port = item.rpartition(":")
+        if not separator:
+            host, port = item, DEFAULT_PORT
+        workers.append((host, int(port)))
+    return workers
+
+
+class _Connection:
+    def __init__(self, address):
+        self.sock = socket.create_connection(address, timeout=CONNECT_TIMEOUT)
+        self.sock.settimeout(COMPILE_TIMEOUT)
+        self.stream = self.sock.makefile("rwb")
+
+    def request(self, message):
+        try:
+            self.stream.write((json.dumps(message) + "\n").encode())
+            self.stream.flush()
+            line = self.stream.readline()
+        except OSError as e:
+            raise WorkerLost(str(e))
+        if not line:
+            raise WorkerLost("connection closed")
+        return json.loads(line)
+
+    def close(self):
+        try:
+            self.stream.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class FarmCoordinator:
+    """Compiles a set of sources on the workers"""
+
+    def __init__(self, workers, cc, flags, cache_dir=CACHE_DIR, log=print):
+        self.workers = workers
+        self.cc = cc
+        self.flags = list(flags)
+        self.remote_flags = codegen_flags(self.flags)
+        self.cache_dir = Path(cache_dir)
+        self._log = log
+        self._log_lock = threading.Lock()
+        self.stats = {"cached": 0, "deduplicated": 0, "remote": 0, "local": 0, "retried": 0}
+
+    def log(self, message):
+        with self._log_lock:
+            self._log(message)
+
+    def preprocess(self, source):
+        result = subprocess.run([self.cc] + self.flags + ["-E", str(source)], capture_output=True)
+        if result.returncode != 0:
+            raise FarmError(f"Preprocessing {source} failed: {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout
+
+    def compile_all(self, jobs):
+        """Compile [(source, object path)]; raises FarmError on failure"""
+        compiler = compiler_id(self.cc)
+        units = {}  # key -> (name, preprocessed, [object paths])
+        for source, obj in jobs:
+            preprocessed = self.preprocess(source)
+            key = unit_key(compiler, self.remote_flags, preprocessed)
+            if key in units:
+                units[key][2].append(Path(obj))
+                self.stats["deduplicated"] += 1
+            else:
+                units[key] = (Path(source).name, preprocessed, [Path(obj)])
+
+        pending = queue.Queue()
+        for key, (name, _, objects) in units.items():
+            cached = self.cache_dir / f"{key}.p1"
+            if cached.exists():
+                self._store(key, cached.read_bytes(), objects)
+                self.stats["cached"] += 1
+            else:
+                pending.put((key, 0))
+
+        errors = []
+        if not pending.empty():
+            self._run_workers(units, pending, errors)
+        # Whatever the workers could not take (all of them lost)
+        while not pending.empty():
+            key, _ = pending.get()
+            name, preprocessed, objects = units[key]
+            self.log(f"   🖥️ {name}: compiling locally")
+            ok, data, output = compile_unit(self.cc, self.remote_flags, name, preprocessed, self.cache_dir)
+            self.stats["local"] += 1
+            if output.strip():
+                self.log(output.rstrip())
+            if ok:
+                self._store(key, data, objects)
+            else:
+                errors.append(name)
+        if errors:
+            raise FarmError(f"Compilation failed: {', '.join(errors)}")
+
+    def _store(self, key, data, objects):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / f"{key}.p1").write_bytes(data)
+        for obj in objects:
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            obj.write_bytes(data)
+
+    def _run_workers(self, units, pending, errors):
+        lock = threading.Lock()
+        remaining = [pending.qsize()]
+        done = threading.Event()
+
+        def finish():
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+
+        def serve(address):
+            try:
+                hello = _Connection(address)
+                slots = max(1, int(hello.request({"op": "hello"}).get("jobs", 1)))
+                hello.close()
+            except (OSError, WorkerLost) as e:
+                self.log(f"   ⚠️ Worker {address[0]}:{address[1]} unavailable: {e}")
+                return
+            threads = [threading.Thread(target=run_slot, args=(address,)) for _ in range(slots)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        def run_slot(address):
+            try:
+                connection = _Connection(address)
+            except OSError:
+                return
+            try:
+                while not done.is_set():
+                    try:
+                        key, attempts = pending.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    name, preprocessed, objects = units[key]
+                    try:
+                        reply = connection.request({
+                            "op": "compile", "key": key, "name": name, "flags": self.remote_flags,
+                            "source": base64.b64encode(preprocessed).decode(),
+                        })
+                    except WorkerLost as e:
+                        self.log(f"   ⚠️ Worker {address[0]}:{address[1]} lost while compiling {name}: {e}")
+                        with lock:
+                            self.stats["retried"] += 1
+                        if attempts + 1 < MAX_ATTEMPTS:
+                            pending.put((key, attempts + 1))
+                        else:
+                            errors.append(f"{name} (worker lost {MAX_ATTEMPTS} times)")
+                            finish()
+                        return
+                    if reply.get("output", "").strip():
+                        self.log(reply["output"].rstrip())
+                    if reply.get("ok"):
+                        self._store(key, base64.b64decode(reply["object"]), objects)
+                        self.log(f"   ✅ {name} ← {address[0]}:{address[1]}")
+                        with lock:
+                            self.stats["remote"] += 1
+                    else:
+                        errors.append(name)
+                    finish()
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=serve, args=(address,)) for address in self.workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def print_stats(self):
+        self.log("   🏭 Farm: " + ", ".join(f"{count} {what}" for what, count in self.stats.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed XC8 compiles over TCP")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker = subparsers.add_parser("worker", help="Compile units for coordinators")
+    worker.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    worker.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    worker.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Parallel compiles")
+    worker.add_argument("--cache-dir", default=str(WORKER_CACHE_DIR), help="Objects already compiled")
+    worker.add_argument("--die-after", type=int, help="Exit after N compiles (to test retries)")
+
+    compile_parser = subparsers.add_parser("compile", help="Compile sources on the farm")
+    compile_parser.add_argument("sources", nargs="+", help="C sources")
+    compile_parser.add_argument("--workers", required=True, help="host:port,host:port...")
+    compile_parser.add_argument("--output-dir", default="build", help="Directory for the .p1 files")
+    compile_parser.add_argument("--flags", default="-mcpu=PIC16F876A -O2 -std=c99 -Wall -D_XTAL_FREQ=4000000UL",
+                                help="Compiler flags")
+    args = parser.parse_args()
+
+    cc = find_cc()
+    if args.command == "worker":
+        with WorkerServer((args.host, args.port), cc, args.jobs, args.cache_dir, args.die_after) as server:
+            print(f"✅ Worker {server.name} ready ({args.jobs} job(s), {cc})", flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return
+
+    farm = FarmCoordinator(parse_workers(args.workers), cc, args.flags.split())
+    jobs = [(source, Path(args.output_dir) / f"{Path(source).stem}.p1") for source in args.sources]
+    try:
+        farm.compile_all(jobs)
+    except FarmError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        farm.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Code-size and build-time regression history for PIC16F876A builds
+
+Stores each build's flash/RAM totals, per-symbol sizes (from the linker map
+and memory_summary.xml, see memory_report.py) and per-stage timings (from
+build/timings.json, written by compile_v2.py and build.py) in a local SQLite
+database keyed by (commit, env, flags).
+
+The `check` command compares a build with its baseline and fails when flash,
+RAM or build time grows past the configured budgets.
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import subprocess
+from pathlib import Path
+
+from memory_report import (
+    DEFAULT_MAP_FILE,
+    DEFAULT_SUMMARY_FILE,
+    FLASH_WORDS,
+    RAM_BYTES,
+    build_report,
+)
+
+# History configuration
+DEFAULT_DB_FILE = Path("build_history.db")
+DEFAULT_TIMINGS_FILE = Path("build/timings.json")
+DEFAULT_ENV = "c-multi"
+DEFAULT_FLAGS = "-O2 -std=c99"
+
+# Default budgets (growth allowed compared with the baseline)
+DEFAULT_MAX_FLASH_GROWTH = 64  # words
+DEFAULT_MAX_RAM_GROWTH = 8  # bytes
+DEFAULT_MAX_TIME_GROWTH = 25.0  # percent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    commit_id TEXT NOT NULL,
+    env TEXT NOT NULL,
+    flags TEXT NOT NULL,
+    created REAL NOT NULL,
+    flash INTEGER NOT NULL,
+    ram INTEGER NOT NULL,
+    build_time REAL NOT NULL,
+    UNIQUE (commit_id, env, flags)
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    build_id INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    build_id INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_symbols_build ON symbols(build_id);
+CREATE INDEX IF NOT EXISTS idx_stages_build ON stages(build_id);
+"""
+
+
+def open_db(db_file):
+    """Open (and create if needed) the history database"""
+    conn = sqlite3.connect(str(db_file))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def current_commit():
+    """Return HEAD's commit id, suffixed with -dirty for modified trees"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def load_timings(timings_file):
+    """Load per-stage timings written by compile_v2.py/build.py"""
+    path = Path(timings_file)
+    if not path.exists():
+        return {}
+    try:
+        return {stage: float(sec) for stage, sec in json.loads(path.read_text()).items()}
+    except ValueError:
+        return {}
+
+
+def write_timings(timings, timings_file=DEFAULT_TIMINGS_FILE):
+    """Replace timings_file with the stage timings of one successful build
+
+    Stages of earlier runs are not kept: they would be summed into the
+    build time of this one.
+    """
+    path = Path(timings_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(timings, indent=2))
+
+
+def record_build(conn, commit, env, flags, report, timings):
+    """Insert (or replace) the record for (commit, env, flags)"""
+    build_time = timings.get("total", sum(timings.values()))
+    with conn:
+        conn.execute(
+            "DELETE FROM builds WHERE commit_id = ? AND env = ? AND flags = ?",
+            (commit, env, flags),
+        )
+        cursor = conn.execute(
+            "INSERT INTO builds (commit_id, env, flags, created, flash, ram, build_time)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (commit, env, flags, time.time(), report.flash_used, report.ram_used, build_time),
+        )
+        build_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO symbols (build_id, name, size) VALUES (?, ?, ?)",
+            [(build_id, name, size) for name, size in report.symbol_sizes().items()],
+        )
+        conn.executemany(
+            "INSERT INTO stages (build_id, stage, seconds) VALUES (?, ?, ?)",
+            [(build_id, stage, sec) for stage, sec in timings.items()],
+        )
+    return build_id
+
+
+def find_build(conn, env, flags, commit=None, before_id=None):
+    """Find a build by commit, or the latest one (optionally older than before_id)"""
+    query = "SELECT * FROM builds WHERE env = ? AND flags = ?"
+    params = [env, flags]
+    if commit is not None:
+        query += " AND commit_id = ?"
+        params.append(commit)
+    if before_id is not None:
+        query += " AND id < ?"
+        params.append(before_id)
+    query += " ORDER BY id DESC LIMIT 1"
+    return conn.execute(query, params).fetchone()
+
+
+def build_symbols(conn, build_id):
+    rows = conn.execute("SELECT name, size FROM symbols WHERE build_id = ?", (build_id,))
+    return {row["name"]: row["size"] for row in rows}
+
+
+def build_stages(conn, build_id):
+    rows = conn.execute("SELECT stage, seconds FROM stages WHERE build_id = ?", (build_id,))
+    return {row["stage"]: row["seconds"] for row in rows}
+
+
+def check_build(build, baseline, max_flash, max_ram, max_time_pct):
+    """Compare a build with its baseline, return the list of budget violations"""
+    failures = []
+
+    if build["flash"] > FLASH_WORDS:
+        failures.append(f"flash {build['flash']} words exceeds device size {FLASH_WORDS}")
+    if build["ram"] > RAM_BYTES:
+        failures.append(f"RAM {build['ram']} bytes exceeds device size {RAM_BYTES}")
+
+    if baseline is None:
+        return failures
+
+    flash_growth = build["flash"] - baseline["flash"]
+    ram_growth = build["ram"] - baseline["ram"]
+    if flash_growth > max_flash:
+        failures.append(f"flash grew by {flash_growth} words (budget {max_flash})")
+    if ram_growth > max_ram:
+        failures.append(f"RAM grew by {ram_growth} bytes (budget {max_ram})")
+
+    if baseline["build_time"] > 0:
+        time_growth = 100.0 * (build["build_time"] - baseline["build_time"]) / baseline["build_time"]
+        if time_growth > max_time_pct:
+            failures.append(
+                f"build time grew by {time_growth:.1f}% "
+                f"({baseline['build_time']:.2f}s → {build['build_time']:.2f}s, budget {max_time_pct}%)"
+            )
+
+    return failures
+
+
+def print_growth(conn, build, baseline, top=10):
+    """Print the symbols and stages that grew the most"""
+    old_symbols = build_symbols(conn, baseline["id"])
+    new_symbols = build_symbols(conn, build["id"])
+    growth = sorted(
+        ((new_symbols.get(n, 0) - old_symbols.get(n, 0), n) for n in set(old_symbols) | set(new_symbols)),
+        reverse=True,
+    )
+    growth = [(delta, name) for delta, name in growth if delta > 0][:top]
+    if growth:
+        print("🔺 Largest symbol growth:")
+        for delta, name in growth:
+            print(f"  {name:40s} {delta:+d}")
+
+    old_stages = build_stages(conn, baseline["id"])
+    new_stages = build_stages(conn, build["id"])
+    slower = sorted(
+        ((new_stages[s] - old_stages[s], s) for s in new_stages if s in old_stages),
+        reverse=True,
+    )
+    slower = [(delta, stage) for delta, stage in slower if delta > 0][:top]
+    if slower:
+        print("🐢 Slowest-growing stages:")
+        for delta, stage in slower:
+            print(f"  {stage:40s} {delta:+.3f}s")
+
+
+def cmd_record(conn, args):
+    # A missing file means no (successful) link: recording it would store a
+    # zero-size build, which then becomes the baseline
+    missing = [path for path in (args.map, args.summary) if not Path(path).exists()]
+    if missing:
+        print(f"❌ Missing {', '.join(missing)} - build and link before recording")
+        return 1
+    report = build_report(args.map, args.summary)
+    timings = load_timings(args.timings)
+    commit = args.commit or current_commit()
+    record_build(conn, commit, args.env, args.flags, report, timings)
+    print(f"✅ Recorded {commit} [{args.env}] flash={report.flash_used} ram={report.ram_used}"
+          f" time={timings.get('total', sum(timings.values())):.2f}s")
+    return 0
+
+
+def cmd_check(conn, args):
+    commit = args.commit or current_commit()
+    build = find_build(conn, args.env, args.flags, commit=commit)
+    if build is None:
+        print(f"❌ No recorded build for {commit} [{args.env}] - run `record` first")
+        return 1
+
+    if args.baseline:
+        baseline = find_build(conn, args.env, args.flags, commit=args.baseline)
+        if baseline is None:
+            print(f"❌ Baseline {args.baseline} [{args.env}] not found")
+            return 1
+    else:
+        baseline = find_build(conn, args.env, args.flags, before_id=build["id"])
+
+    if baseline is None:
+        print("⚠️  No baseline build found, checking device limits only")
+    else:
+        print(f"🔍 Checking {build['commit_id']} against baseline {baseline['commit_id']} [{args.env}]")
+        print(f"  Flash: {baseline['flash']} → {build['flash']} words")
+        print(f"  RAM:   {baseline['ram']} → {build['ram']} bytes")
+        print(f"  Time:  {baseline['build_time']:.2f}s → {build['build_time']:.2f}s")
+
+    failures = check_build(
+        build, baseline, args.max_flash_growth, args.max_ram_growth, args.max_time_growth
+    )
+    if baseline is not None and (failures or args.verbose):
+        print_growth(conn, build, baseline)
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+
+    print("✅ Within budgets")
+    return 0
+
+
+def cmd_list(conn, args):
+    rows = conn.execute(
+        "SELECT * FROM builds WHERE env = ? ORDER BY id DESC LIMIT ?",
+        (args.env, args.limit),
+    ).fetchall()
+    for row in rows:
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created"]))
+        print(f"  {created}  {row['commit_id']:16s} {row['flags']:20s}"
+              f" flash={row['flash']:5d} ram={row['ram']:4d} time={row['build_time']:.2f}s")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Code-size and build-time regression history"
+    )
+    parser.add_argument("--db", default=str(DEFAULT_DB_FILE), help="History database")
+    parser.add_argument("--env", default=DEFAULT_ENV, help="Build environment name")
+    parser.add_argument("--flags", default=DEFAULT_FLAGS, help="Build flags key")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="Record the current build")
+    record.add_argument("--commit", help="Commit id (default: git HEAD)")
+    record.add_argument("--map", default=str(DEFAULT_MAP_FILE), help="Linker map file")
+    record.add_argument("--summary", default=str(DEFAULT_SUMMARY_FILE), help="memory_summary.xml")
+    record.add_argument("--timings", default=str(DEFAULT_TIMINGS_FILE), help="Stage timings JSON")
+
+    check = subparsers.add_parser("check", help="Fail if a build exceeds its budgets")
+    check.add_argument("--commit", help="Commit id to check (default: git HEAD)")
+    check.add_argument("--baseline", help="Baseline commit (default: previous record)")
+    check.add_argument("--max-flash-growth", type=int, default=DEFAULT_MAX_FLASH_GROWTH,
+                       help=f"Allowed flash growth in words (default: {DEFAULT_MAX_FLASH_GROWTH})")
+    check.add_argument("--max-ram-growth", type=int, default=DEFAULT_MAX_RAM_GROWTH,
+                       help=f"Allowed RAM growth in bytes (default: {DEFAULT_MAX_RAM_GROWTH})")
+    check.add_argument("--max-time-growth", type=float, default=DEFAULT_MAX_TIME_GROWTH,
+                       help=f"Allowed build time growth in percent (default: {DEFAULT_MAX_TIME_GROWTH})")
+    check.add_argument("--verbose", "-v", action="store_true", help="Always show growth details")
+
+    history = subparsers.add_parser("list", help="List recorded builds")
+    history.add_argument("--limit", type=int, default=20, help="Number of builds to show")
+
+    args = parser.parse_args()
+
+    conn = open_db(args.db)
+    try:
+        handler = {"record": cmd_record, "check": cmd_check, "list": cmd_list}[args.command]
+        sys.exit(handler(conn, args))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
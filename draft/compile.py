@@ -4,8 +4,7 @@ Simple compilation wrapper that calls xc8-wrapper with default arguments
 """
 
 import typer
-from logger import log
-from xc8_wrapper.core import handle_cc_tool
+from logger import flush as flush_log, log
 
 # Version information
 __version__ = "0.1.0"
@@ -155,7 +154,12 @@ def main(
     log.debug(f"  - Link Flags: {len(XC8_LINK_FLAGS)} flags")
 
     try:
-        # Call xc8_wrapper directly instead of using subprocess
+        # Imported here: --version/--help do not need xc8-wrapper
+        from xc8_wrapper.core import handle_cc_tool
+
+        # Call xc8_wrapper directly instead of using subprocess; it prints
+        # to stdout itself, so the queued log lines go out first
+        flush_log()
         handle_cc_tool(args)
         log.info("✓ Compilation completed successfully")
 
@@ -4,22 +4,46 @@ Compilation script for PIC16F876A using xc8-wrapper
 """
 
 import sys
+import time
 import argparse
 from pathlib import Path
 
 try:
-    from xc8_wrapper import get_xc8_tool_path, run_command, log
+    from xc8_wrapper import get_xc8_tool_path, log
 except ImportError as e:
     print(f"❌ Cannot import xc8_wrapper: {e}")
     print("🔄 Using xc8-wrapper compilation required...")
     sys.exit(1)
 
+from build_history import write_timings
+from memory_report import build_report, print_report
+from profiling import StageProfiler, add_arguments as add_profile_arguments
+from xc8_diagnostics import Diagnostic, DiagnosticParser, parse_line, stream_command
+
 # Project configuration
 PROJECT_NAME = "pic_test_project"
 TARGET_CHIP = "PIC16F876A"
 SOURCE_DIR = Path("src/multi")
+COMMON_DIR = Path("src/common")  # modules shared with cpp-multi
 OUTPUT_DIR = Path("output")
 BUILD_DIR = Path("build")
+TIMINGS_FILE = BUILD_DIR / "timings.json"
+
+# xc8-cc flags of every compile step, local or on the farm (plus -O<level>)
+COMPILE_FLAGS = [
+    f"-mcpu={TARGET_CHIP}",
+    "-std=c99",
+    "-Wall",
+    "-D_XTAL_FREQ=4000000UL",
+    f"-I{SOURCE_DIR}",
+    f"-I{COMMON_DIR}",
+]
+
+# Per-stage wall-clock timings (seconds), written to TIMINGS_FILE
+stage_timings = {}
+
+# Stage profiler, enabled by --profile
+profiler = StageProfiler(None, "compile_v2")
 
 
 def setup_environment():
@@ -36,13 +60,52 @@ def setup_environment():
 
 def find_source_files():
     """Find all C source files"""
-    source_files = list(SOURCE_DIR.glob("*.c"))
+    source_files = list(SOURCE_DIR.glob("*.c")) + list(COMMON_DIR.glob("*.c"))
     print(f"Source files found: {[str(f) for f in source_files]}")
     return source_files
 
 
+def record_stage(stage, started):
+    """Record the duration of a pipeline stage started at `started`"""
+    stage_timings[stage] = time.perf_counter() - started
+
+
+# xc8-cc diagnostics of the whole build; a warning repeated by every unit
+# that includes the same header is printed once
+diagnostics = DiagnosticParser()
+
+
+def run_command(args, description):
+    """Run xc8-cc, printing its diagnostics as they are produced
+
+    Output lines that are not diagnostics are kept and printed if the
+    command fails, so a failure is never reported without its reason.
+    """
+    log.debug(f"{description}: {' '.join(str(arg) for arg in args)}")
+    unparsed = []
+
+    def show(record):
+        # The memory summary is reported by memory_report after linking
+        if isinstance(record, Diagnostic):
+            print(f"   {record}", flush=True)
+
+    def keep(line):
+        if line.strip() and parse_line(line) is None:
+            unparsed.append(line)
+
+    try:
+        returncode = stream_command(args, diagnostics, on_record=show, on_line=keep)
+    except OSError as e:
+        print(f"   ❌ Cannot run {args[0]}: {e}")
+        return False
+    if returncode != 0:
+        for line in unparsed:
+            print(f"   {line}")
+    return returncode == 0
+
+
 def compile_with_xc8_wrapper_direct(
-    optimization_level="2", xc8_version="3.00", separate_compilation=True
+    optimization_level="2", xc8_version="3.00", separate_compilation=True, farm=None
 ):
     """Compile project using xc8-wrapper module directly (not subprocess)"""
 
@@ -68,7 +131,7 @@ def compile_with_xc8_wrapper_direct(
 
         if separate_compilation:
             return compile_separate_with_xc8_wrapper(
-                source_files, output_file, optimization_level, xc8_version
+                source_files, output_file, optimization_level, xc8_version, farm
             )
         else:
             return compile_monolithic_with_xc8_wrapper(
@@ -81,10 +144,35 @@ def compile_with_xc8_wrapper_direct(
         return False
 
 
+def compile_on_farm(workers, xc8_cc_path, source_files, object_files, optimization_level):
+    """Step 1 on the build farm workers (see build_farm.py)"""
+    from build_farm import FarmCoordinator, FarmError, parse_workers
+
+    flags = COMPILE_FLAGS + [f"-O{optimization_level}"]
+    farm = FarmCoordinator(parse_workers(workers), str(xc8_cc_path), flags)
+    print(f"🏭 Step 1: Compiling {len(source_files)} files on {workers}")
+
+    started = time.perf_counter()
+    try:
+        with profiler.stage("compile:farm"):
+            farm.compile_all(list(zip(source_files, object_files)))
+    except FarmError as e:
+        print(f"   ❌ {e}")
+        return False
+    finally:
+        farm.print_stats()
+    record_stage("compile:farm", started)
+    return True
+
+
 def compile_separate_with_xc8_wrapper(
-    source_files, output_file, optimization_level, xc8_version
+    source_files, output_file, optimization_level, xc8_version, farm=None
 ):
-    """Separate compilation using xc8-wrapper module"""
+    """Separate compilation using xc8-wrapper module
+
+    With `farm` ("host:port,..."), the objects are compiled by build_farm.py
+    workers instead of one after the other here.
+    """
 
     try:
         # Get path to XC8
@@ -99,32 +187,34 @@ def compile_separate_with_xc8_wrapper(
         # Step 1: Separate compilation
         object_files = []
 
-        for i, source_file in enumerate(source_files, 1):
-            print(f"📄 Step {i}/{len(source_files)}: Compiling {source_file.name}")
-
-            object_file = BUILD_DIR / f"{source_file.stem}.p1"
-            object_files.append(object_file)
-
-            # Build compilation arguments
-            compile_args = [
-                xc8_cc_path,
-                f"-mcpu={TARGET_CHIP}",
-                "-c",  # Compile only
-                f"-O{optimization_level}",
-                "-std=c99",
-                "-Wall",
-                f"-D_XTAL_FREQ=4000000UL",
-                "-o",
-                str(object_file),
-                str(source_file),
-            ]
-
-            # Use run_command from xc8-wrapper module
-            if not run_command(compile_args, f"Compiling {source_file.name}"):
-                print(f"   ❌ Compilation error {source_file.name}")
+        if farm:
+            object_files = [BUILD_DIR / f"{source_file.stem}.p1" for source_file in source_files]
+            if not compile_on_farm(farm, xc8_cc_path, source_files, object_files, optimization_level):
                 return False
-
-            print(f"   ✅ {source_file.name} → {object_file.name}")
+        else:
+            for i, source_file in enumerate(source_files, 1):
+                print(f"📄 Step {i}/{len(source_files)}: Compiling {source_file.name}")
+
+                object_file = BUILD_DIR / f"{source_file.stem}.p1"
+                object_files.append(object_file)
+
+                # Build compilation arguments
+                compile_args = (
+                    [xc8_cc_path, "-c", f"-O{optimization_level}"]  # Compile only
+                    + COMPILE_FLAGS
+                    + ["-o", str(object_file), str(source_file)]
+                )
+
+                # Stream xc8-cc output through the diagnostics parser
+                started = time.perf_counter()
+                with profiler.stage(f"compile:{source_file.name}"):
+                    compiled = run_command(compile_args, f"Compiling {source_file.name}")
+                if not compiled:
+                    print(f"   ❌ Compilation error {source_file.name}")
+                    return False
+                record_stage(f"compile:{source_file.name}", started)
+
+                print(f"   ✅ {source_file.name} → {object_file.name}")
 
         print()
 
@@ -149,12 +239,20 @@ def compile_separate_with_xc8_wrapper(
         for obj_file in object_files:
             link_args.append(str(obj_file))
 
-        # Use run_command from xc8-wrapper module
-        if not run_command(link_args, "Linking"):
+        # Stream xc8-cc output through the diagnostics parser
+        started = time.perf_counter()
+        with profiler.stage("link"):
+            linked = run_command(link_args, "Linking")
+        if not linked:
             print("   ❌ Linking error")
             return False
+        record_stage("link", started)
 
         print(f"   ✅ Linking successful → {elf_file.name}")
+        print()
+        with profiler.stage("memory_report"):
+            report = build_report(map_file, BUILD_DIR / "memory_summary.xml")
+        print_report(report)
 
         # Step 3: Copy HEX file
         generated_hex = BUILD_DIR / f"{PROJECT_NAME}.hex"
@@ -188,24 +286,20 @@ def compile_monolithic_with_xc8_wrapper(
         print()
 
         # Build compilation arguments
-        compile_args = [
-            xc8_cc_path,
-            f"-mcpu={TARGET_CHIP}",
-            f"-O{optimization_level}",
-            "-std=c99",
-            "-Wall",
-            f"-D_XTAL_FREQ=4000000UL",
-            f"-o{output_file}",
-        ]
+        compile_args = [xc8_cc_path, f"-O{optimization_level}"] + COMPILE_FLAGS + [f"-o{output_file}"]
 
         # Add all source files
         for src in source_files:
             compile_args.append(str(src))
 
-        # Use run_command from xc8-wrapper module
-        if not run_command(compile_args, "Compiling project"):
+        # Stream xc8-cc output through the diagnostics parser
+        started = time.perf_counter()
+        with profiler.stage("compile:monolithic"):
+            compiled = run_command(compile_args, "Compiling project")
+        if not compiled:
             print("❌ Monolithic compilation error")
             return False
+        record_stage("compile:monolithic", started)
 
         print("✅ Monolithic compilation with xc8-wrapper completed!")
         return True
@@ -252,6 +346,10 @@ def main():
     compilation_mode.add_argument(
         "--monolithic", action="store_true", help="Use monolithic compilation"
     )
+    parser.add_argument(
+        "--farm", metavar="HOST:PORT,...", help="Compile on build_farm.py workers (separate mode)"
+    )
+    add_profile_arguments(parser)
 
     args = parser.parse_args()
 
@@ -269,9 +367,18 @@ def main():
         not args.monolithic
     )  # If --monolithic is specified, separate_mode = False
 
+    global profiler
+    profiler = StageProfiler.from_args(args, "compile_v2")
+
+    started = time.perf_counter()
     success = compile_with_xc8_wrapper_direct(
-        args.optimization, args.xc8_version, separate_mode
+        args.optimization, args.xc8_version, separate_mode, args.farm
     )
+    record_stage("total", started)
+    if success:
+        write_timings(stage_timings, TIMINGS_FILE)
+    profiler.print_summary()
+    print(f"🧾 Diagnostics: {diagnostics.summary()}")
 
     if success:
         print("\n🎉 Compilation completed successfully!")
@@ -0,0 +1,731 @@
+#!/usr/bin/env python3
+"""
+Static cycle-count and WCET estimator for PIC16 assembly
+
+Parses handwritten assembly (src/asm-simple/main.s), the assembly files
+XC8 writes with -fasmfile, or the listings produced with -Wa,-a, splits
+the code into basic blocks and computes cycles per block and worst-case
+cycles per function.
+
+Loop bounds come from, in order:
+  - --bound LABEL=N on the command line or a "; @bound N" comment on the
+    loop header line
+  - DECFSZ/INCFSZ counters loaded with MOVLW/MOVWF before the loop
+  - Timer0 polling loops (BTFSS INTCON,T0IF), bounded by the TMR0 load
+    value and the prescaler from OPTION_REG (or --prescaler)
+
+Example:
+  python cycle_count.py src/asm-simple/main.s
+  python cycle_count.py build/timer0.s -f Timer0_delay50ms --bound l42=20
+"""
+
+import re
+import sys
+import math
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pic16 import (
+    CALL,
+    DESTINATIONS,
+    GOTO,
+    INSTRUCTIONS,
+    RETURN,
+    SFR_ADDRESSES,
+    SFR_BITS,
+    SKIP,
+    TMR0_WRITE_INHIBIT,
+    instruction_cycle_time,
+    timer0_prescale,
+)
+
+# Default clock (board_build.f_cpu in platformio.ini)
+DEFAULT_F_CPU = 4000000
+# Timer0 prescaler assumed when OPTION_REG cannot be resolved statically
+DEFAULT_PRESCALER = 256
+
+# Directives that define data rather than code
+DATA_DIRECTIVES = {"DS", "DB", "DW", "DABS", "DLABS"}
+CONSTANT_DIRECTIVES = {"EQU", "SET"}
+
+INTCON = SFR_ADDRESSES["INTCON"]
+T0IF = SFR_BITS["T0IF"]
+
+_LISTING_LINE = re.compile(r"^\s*\d+\s+(?:[0-9A-Fa-f]{4}\s+(?:[0-9A-Fa-f]{4}\s+)?)?(.*)$")
+_BOUND_COMMENT = re.compile(r"@bound\s+(\d+)", re.IGNORECASE)
+_NUMBER = re.compile(
+    r"0[xX][0-9A-Fa-f]+|0[bB][01]+|[0-9][0-9A-Fa-f]*[hH]\b|[hH]'[0-9A-Fa-f]+'"
+    r"|[bB]'[01]+'|[dD]'[0-9]+'|[0-9]+"
+)
+_SYMBOL = re.compile(r"[A-Za-z_?$.][A-Za-z0-9_?$.@]*")
+_OPERATORS = {"low": lambda value: value & 0xFF, "high": lambda value: (value >> 8) & 0xFF}
+
+
+@dataclass
+class Instruction:
+    index: int
+    line: int
+    mnemonic: str
+    operands: list
+    comment: str = ""
+    labels: list = field(default_factory=list)
+
+    @property
+    def words(self):
+        return INSTRUCTIONS[self.mnemonic][0]
+
+    @property
+    def cycles(self):
+        return INSTRUCTIONS[self.mnemonic][1]
+
+    @property
+    def kind(self):
+        return INSTRUCTIONS[self.mnemonic][2]
+
+    def __str__(self):
+        return f"{self.mnemonic} {', '.join(self.operands)}".strip()
+
+
+@dataclass
+class Program:
+    path: Path
+    instructions: list = field(default_factory=list)
+    labels: dict = field(default_factory=dict)
+    constants: dict = field(default_factory=dict)
+    globals: set = field(default_factory=set)
+    psect_starts: set = field(default_factory=set)
+
+
+@dataclass
+class Block:
+    start: int
+    end: int  # exclusive
+    cycles: int = 0
+    calls: list = field(default_factory=list)
+    successors: list = field(default_factory=list)  # [(block start, edge cycles)]
+
+
+@dataclass
+class LoopInfo:
+    header: str
+    bound: object
+    source: str
+    iteration_cycles: int
+
+
+@dataclass
+class FunctionTiming:
+    name: str
+    wcet: object  # int, or None when unbounded
+    blocks: list = field(default_factory=list)
+    loops: list = field(default_factory=list)
+    problems: list = field(default_factory=list)
+    period: object = None  # cycles per iteration of an endless loop
+
+
+def _strip_block_comments(text):
+    """Remove /* ... */ comments (used for doxygen blocks in main.s)"""
+    return re.sub(r"/\*.*?\*/", lambda m: "\n" * m.group(0).count("\n"), text, flags=re.S)
+
+
+def _split_operands(text):
+    operands = []
+    depth = 0
+    current = ""
+    for char in text:
+        if char == "," and depth == 0:
+            operands.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current.strip():
+        operands.append(current.strip())
+    return operands
+
+
+def parse_source(path):
+    """Parse an assembly file or listing into a Program"""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8", errors="replace")
+    listing = path.suffix.lower() == ".lst"
+    if not listing:
+        text = _strip_block_comments(text)
+
+    program = Program(path)
+    pending_labels = []
+    pending_bound = None
+    new_psect = False
+
+    for line_no, raw in enumerate(text.splitlines(), 1):
+        if listing:
+            match = _LISTING_LINE.match(raw)
+            if match is None:
+                continue
+            raw = match.group(1)
+
+        code, _, comment = raw.partition(";")
+        code = code.split("//", 1)[0].rstrip()
+        if not code.strip() or code.lstrip().startswith("#"):
+            continue
+
+        # Labels: "NAME:" anywhere at the start of the line
+        while True:
+            match = re.match(r"^\s*([A-Za-z_?$.][\w?$.@]*):", code)
+            if match is None:
+                break
+            pending_labels.append(match.group(1))
+            code = code[match.end():]
+
+        bound = _BOUND_COMMENT.search(comment)
+        if bound:
+            pending_bound = int(bound.group(1))
+
+        tokens = code.split(None, 1)
+        if not tokens:
+            continue
+
+        # "NAME EQU value" constants
+        parts = code.split(None, 2)
+        if len(parts) == 3 and parts[1].upper() in CONSTANT_DIRECTIVES:
+            try:
+                program.constants[parts[0]] = evaluate(parts[2], program)
+            except ValueError:
+                pass
+            continue
+
+        mnemonic = tokens[0].upper()
+        operand_text = tokens[1] if len(tokens) > 1 else ""
+
+        if mnemonic in DATA_DIRECTIVES:
+            pending_labels.clear()  # data labels, not code
+            continue
+        if mnemonic in ("GLOBAL", "GLOBL"):
+            program.globals.update(s.strip() for s in operand_text.split(","))
+            continue
+        if mnemonic == "PSECT":
+            new_psect = True
+            continue
+        if mnemonic not in INSTRUCTIONS:
+            continue  # other directives (PROCESSOR, CONFIG, END, opt, line...)
+
+        instruction = Instruction(
+            index=len(program.instructions),
+            line=line_no,
+            mnemonic=mnemonic,
+            operands=_split_operands(operand_text),
+            comment=comment.strip(),
+            labels=pending_labels,
+        )
+        for label in pending_labels:
+            program.labels[label] = instruction.index
+            if pending_bound is not None:
+                program.constants[f"@bound:{label}"] = pending_bound
+        pending_bound = None
+        if new_psect:
+            program.psect_starts.add(instruction.index)
+            new_psect = False
+        pending_labels = []
+        program.instructions.append(instruction)
+
+    return program
+
+
+def _number(token):
+    if token[:2].lower() == "0x":
+        return int(token, 16)
+    if token[:2].lower() == "0b":
+        return int(token[2:], 2)
+    if token[-1] in "hH":
+        return int(token[:-1], 16)
+    if token[1:2] == "'":
+        base = {"h": 16, "b": 2, "d": 10}[token[0].lower()]
+        return int(token[2:-1], base)
+    return int(token, 10)
+
+
+def evaluate(expr, program):
+    """Evaluate an operand expression (numbers, SFRs, EQU constants, labels)"""
+    out = ""
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        char = expr[pos]
+        number = _NUMBER.match(expr, pos)
+        if number and (pos == 0 or not (expr[pos - 1].isalnum() or expr[pos - 1] == "_")):
+            out += str(_number(number.group(0)))
+            pos = number.end()
+            continue
+        symbol = _SYMBOL.match(expr, pos)
+        if symbol:
+            name = symbol.group(0)
+            if name.lower() in ("low", "high"):
+                out += name.lower()
+                pos = symbol.end()
+                continue
+            for table in (program.constants, SFR_ADDRESSES, SFR_BITS, DESTINATIONS, program.labels):
+                if name in table:
+                    out += str(table[name])
+                    break
+                if name.upper() in table:
+                    out += str(table[name.upper()])
+                    break
+            else:
+                raise ValueError(f"unknown symbol {name}")
+            pos = symbol.end()
+            continue
+        if char in "+-*/%&|^~<>() ":
+            out += "//" if char == "/" else char
+            pos += 1
+            continue
+        raise ValueError(f"cannot evaluate {expr!r}")
+    try:
+        return int(eval(out, {"__builtins__": {}}, _OPERATORS))
+    except Exception as e:
+        raise ValueError(f"cannot evaluate {expr!r}: {e}")
+
+
+def _try_evaluate(expr, program):
+    try:
+        return evaluate(expr, program)
+    except ValueError:
+        return None
+
+
+def _file_address(instruction, program):
+    """Register-file operand of an instruction, or None if unresolved"""
+    if not instruction.operands:
+        return None
+    value = _try_evaluate(instruction.operands[0], program)
+    return None if value is None else value & 0x1FF
+
+
+def _bit_operand(instruction, program):
+    """(register, bit) for a bit instruction, resolving XC8's (addr/8),(addr)&7 form"""
+    if len(instruction.operands) < 2:
+        return None
+    register = _try_evaluate(instruction.operands[0], program)
+    bit = _try_evaluate(instruction.operands[1], program)
+    if register is None or bit is None:
+        return None
+    return register & 0x7F, bit & 0x7
+
+
+def _writes_pcl(instruction, program):
+    if instruction.mnemonic == "MOVWF":
+        return _file_address(instruction, program) == SFR_ADDRESSES["PCL"]
+    if instruction.mnemonic in ("ADDWF", "IORWF", "XORWF", "ANDWF") and len(instruction.operands) > 1:
+        return (
+            _file_address(instruction, program) == SFR_ADDRESSES["PCL"]
+            and _try_evaluate(instruction.operands[1], program) == 1
+        )
+    return False
+
+
+def _target(instruction, program):
+    """Label index targeted by a GOTO/CALL, or None"""
+    if not instruction.operands:
+        return None
+    name = instruction.operands[0].strip()
+    if name.startswith("(") and name.endswith(")"):
+        name = name[1:-1].strip()
+    return program.labels.get(name)
+
+
+def build_blocks(program):
+    """Split the program into basic blocks keyed by first instruction index"""
+    instructions = program.instructions
+    leaders = {0} | set(program.labels.values())
+    for ins in instructions:
+        if ins.kind in (GOTO, RETURN, CALL) or _writes_pcl(ins, program):
+            leaders.add(ins.index + 1)
+        if ins.kind == SKIP:
+            leaders.update((ins.index + 1, ins.index + 2))
+        if ins.kind in (GOTO, CALL):
+            target = _target(ins, program)
+            if target is not None:
+                leaders.add(target)
+
+    ordered = sorted(i for i in leaders if i < len(instructions))
+    blocks = {}
+    for start, end in zip(ordered, ordered[1:] + [len(instructions)]):
+        block = Block(start, end)
+        for ins in instructions[start:end]:
+            block.cycles += ins.cycles
+            if ins.kind == CALL:
+                block.calls.append(ins)
+
+        last = instructions[end - 1]
+        if _writes_pcl(last, program):
+            # Computed jump into a RETLW table: 2 cycles for the jump, 2 for RETLW
+            block.cycles += 1 + INSTRUCTIONS["RETLW"][1]
+        elif last.kind == RETURN:
+            pass
+        elif last.kind == GOTO:
+            target = _target(last, program)
+            if target is not None:
+                block.successors.append((target, 0))
+        elif last.kind == SKIP:
+            block.successors.append((end, 0))
+            if end + 1 <= len(instructions):
+                block.successors.append((end + 1, 1))
+        elif end < len(instructions):
+            block.successors.append((end, 0))
+        blocks[start] = block
+
+    for block in blocks.values():
+        block.successors = [(s, c) for s, c in block.successors if s in blocks]
+    return blocks
+
+
+def find_functions(program):
+    """Function entry points: call targets, globals and labels after a return/jump"""
+    entries = {}
+    for ins in program.instructions:
+        if ins.kind == CALL:
+            target = _target(ins, program)
+            if target is not None:
+                entries[target] = ins.operands[0]
+    for label, index in program.labels.items():
+        if label in program.globals:
+            entries.setdefault(index, label)
+    for ins in program.instructions:
+        previous = program.instructions[ins.index - 1] if ins.index else None
+        starts_code = ins.index in program.psect_starts or (
+            previous is not None and previous.kind in (RETURN, GOTO)
+        )
+        if ins.labels and starts_code:
+            entries.setdefault(ins.index, ins.labels[0])
+    return {name: index for index, name in entries.items()}
+
+
+def detect_prescaler(program):
+    """Timer0 prescaler from a MOVLW k / MOVWF OPTION_REG sequence, or None"""
+    option_reg = SFR_ADDRESSES["OPTION_REG"]
+    for ins in program.instructions[1:]:
+        if ins.mnemonic == "MOVWF" and _file_address(ins, program) == option_reg:
+            previous = program.instructions[ins.index - 1]
+            if previous.mnemonic == "MOVLW":
+                value = _try_evaluate(previous.operands[0], program)
+                if value is not None:
+                    return timer0_prescale(value)
+    return None
+
+
+class Estimator:
+    """Computes worst-case cycle counts for the functions of a Program"""
+
+    def __init__(self, program, bounds=None, prescaler=None):
+        self.program = program
+        self.blocks = build_blocks(program)
+        self.bounds = dict(bounds or {})
+        self.prescaler = prescaler or detect_prescaler(program) or DEFAULT_PRESCALER
+        self.functions = find_functions(program)
+        self._timings = {}
+        self._in_progress = set()
+
+    def label_of(self, index):
+        labels = self.program.instructions[index].labels
+        return labels[0] if labels else f"L{self.program.instructions[index].line}"
+
+    def block_cost(self, start, problems):
+        block = self.blocks[start]
+        cycles = block.cycles
+        for call in block.calls:
+            target = _target(call, self.program)
+            if target is None:
+                problems.append(f"call to unknown {call.operands[0]} (0 cycles assumed)")
+                continue
+            callee = self.timing_at(target, call.operands[0])
+            if callee.wcet is None:
+                problems.append(f"callee {callee.name} is unbounded")
+                return None
+            cycles += callee.wcet
+        return cycles
+
+    def timing(self, name):
+        name = name if name in self.program.labels else f"_{name}"
+        if name not in self.program.labels:
+            raise KeyError(name)
+        return self.timing_at(self.program.labels[name], name)
+
+    def timing_at(self, entry, name):
+        if entry in self._timings:
+            return self._timings[entry]
+        if entry in self._in_progress:
+            return FunctionTiming(name, None, problems=["recursive call"])
+        self._in_progress.add(entry)
+        try:
+            timing = self._compute(entry, name)
+        finally:
+            self._in_progress.discard(entry)
+        self._timings[entry] = timing
+        return timing
+
+    def _loop_bound(self, header, body, iteration_cycles):
+        """(bound, source) for the loop starting at instruction `header`"""
+        program = self.program
+        labels = program.instructions[header].labels
+        for label in labels:
+            if label in self.bounds:
+                return self.bounds[label], "--bound"
+            if f"@bound:{label}" in program.constants:
+                return program.constants[f"@bound:{label}"], "@bound comment"
+
+        body_instructions = [
+            ins for start in body for ins in program.instructions[start:self.blocks[start].end]
+        ]
+
+        # DECFSZ/INCFSZ counter loaded before the loop with MOVLW/MOVWF
+        for ins in body_instructions:
+            if ins.mnemonic not in ("DECFSZ", "INCFSZ"):
+                continue
+            counter = _file_address(ins, program)
+            for previous in reversed(program.instructions[:header]):
+                if previous.mnemonic == "MOVWF" and _file_address(previous, program) == counter:
+                    load = program.instructions[previous.index - 1]
+                    if load.mnemonic == "MOVLW":
+                        value = _try_evaluate(load.operands[0], program)
+                        if value is not None:
+                            value &= 0xFF
+                            if ins.mnemonic == "DECFSZ":
+                                return value or 256, f"{ins.mnemonic} counter"
+                            return (256 - value) or 256, f"{ins.mnemonic} counter"
+                    break
+                if previous.kind in (RETURN,) or previous.index in self.functions.values():
+                    break
+
+        # Timer0 overflow polling: BTFSS/BTFSC INTCON,T0IF
+        for ins in body_instructions:
+            if ins.mnemonic in ("BTFSS", "BTFSC") and _bit_operand(ins, program) == (INTCON, T0IF):
+                load = self._tmr0_load_before(header)
+                wait = (256 - load) * self.prescaler + TMR0_WRITE_INHIBIT
+                bound = math.ceil(wait / max(iteration_cycles, 1)) + 1
+                return bound, f"Timer0 wait ({256 - load} ticks x {self.prescaler})"
+
+        return None, "unbounded"
+
+    def _tmr0_load_before(self, header):
+        """TMR0 value loaded before a polling loop (0, the longest wait, if unknown)"""
+        program = self.program
+        tmr0 = SFR_ADDRESSES["TMR0"]
+        for previous in reversed(program.instructions[max(0, header - 16):header]):
+            if _file_address(previous, program) != tmr0:
+                continue
+            if previous.mnemonic == "CLRF":
+                return 0
+            if previous.mnemonic == "MOVWF":
+                load = program.instructions[previous.index - 1]
+                if load.mnemonic == "MOVLW":
+                    value = _try_evaluate(load.operands[0], program)
+                    if value is not None:
+                        return value & 0xFF
+            break
+        return 0
+
+    def _compute(self, entry, name):
+        timing = FunctionTiming(name, None)
+
+        # Reachable blocks (calls are summarized, not followed)
+        nodes = []
+        seen = set()
+        stack = [entry]
+        while stack:
+            start = stack.pop()
+            if start in seen or start not in self.blocks:
+                continue
+            seen.add(start)
+            nodes.append(start)
+            stack.extend(s for s, _ in self.blocks[start].successors)
+
+        cost = {}
+        for start in nodes:
+            cycles = self.block_cost(start, timing.problems)
+            if cycles is None:
+                return timing
+            cost[start] = cycles
+            timing.blocks.append((self.label_of(start), start, cycles))
+        edges = {start: dict(self.blocks[start].successors) for start in nodes}
+
+        # Natural loops from DFS back edges
+        back_edges = []
+        state = {}
+
+        def dfs(node):
+            state[node] = 1
+            for succ in edges[node]:
+                if state.get(succ) == 1:
+                    back_edges.append((node, succ))
+                elif succ not in state:
+                    dfs(succ)
+            state[node] = 2
+
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+        dfs(entry)
+
+        preds = {n: set() for n in nodes}
+        for node in nodes:
+            for succ in edges[node]:
+                preds[succ].add(node)
+
+        loops = {}
+        for tail, header in back_edges:
+            body = loops.setdefault(header, {header})
+            work = [tail]
+            while work:
+                node = work.pop()
+                if node not in body:
+                    body.add(node)
+                    work.extend(preds[node])
+
+        # Collapse loops innermost first; each loop becomes its header node
+        alive = set(nodes)
+        for header, body in sorted(loops.items(), key=lambda item: len(item[1])):
+            body = body & alive
+            latches = [n for n in body if header in edges[n]]
+            dist = self._longest_paths(header, body, edges, cost)
+            iteration = max(dist[t] + edges[t][header] for t in latches)
+            exits = [
+                (n, succ, edge_cost)
+                for n in body
+                for succ, edge_cost in edges[n].items()
+                if succ not in body
+            ]
+
+            if not exits:
+                timing.period = iteration
+                timing.loops.append(LoopInfo(self.label_of(header), None, "endless loop", iteration))
+                timing.problems.append(f"endless loop at {self.label_of(header)}")
+                return timing
+
+            bound, source = self._loop_bound(header, body, iteration)
+            timing.loops.append(LoopInfo(self.label_of(header), bound, source, iteration))
+            if bound is None:
+                timing.problems.append(
+                    f"unbounded loop at {self.label_of(header)} (use --bound {self.label_of(header)}=N)"
+                )
+                return timing
+
+            exit_cost = max(dist[n] + edge_cost for n, _, edge_cost in exits)
+            cost[header] = (bound - 1) * iteration + exit_cost
+            edges[header] = {}
+            for _, succ, _ in exits:
+                edges[header][succ] = 0
+            for node in body - {header}:
+                alive.discard(node)
+                for pred in list(preds[node]):
+                    if pred in alive and pred not in body:
+                        edges[pred][header] = edges[pred].pop(node)
+            for node in alive:
+                edges[node] = {s: c for s, c in edges[node].items() if s in alive}
+
+        dist = self._longest_paths(entry, alive, edges, cost)
+        terminals = [n for n in alive if not edges[n]]
+        timing.wcet = max(dist[n] for n in terminals if n in dist)
+        return timing
+
+    @staticmethod
+    def _longest_paths(source, nodes, edges, cost):
+        """Longest (cost-weighted) paths from source over the acyclic subgraph"""
+        order = []
+        seen = set()
+
+        def visit(node):
+            seen.add(node)
+            for succ in edges[node]:
+                if succ in nodes and succ != source and succ not in seen:
+                    visit(succ)
+            order.append(node)
+
+        visit(source)
+        dist = {source: cost[source]}
+        for node in reversed(order):
+            if node not in dist:
+                continue
+            for succ, edge_cost in edges[node].items():
+                if succ in nodes and succ != source:
+                    candidate = dist[node] + edge_cost + cost[succ]
+                    if candidate > dist.get(succ, -1):
+                        dist[succ] = candidate
+        return dist
+
+
+def parse_bounds(values):
+    bounds = {}
+    for value in values or []:
+        label, _, count = value.partition("=")
+        bounds[label.strip()] = int(count, 0)
+    return bounds
+
+
+def print_timing(timing, f_cpu, show_blocks=False):
+    tcy_us = instruction_cycle_time(f_cpu) * 1e6
+    if timing.wcet is not None:
+        print(f"⏱️  {timing.name}: WCET {timing.wcet:,} cycles ({timing.wcet * tcy_us:,.1f} µs)")
+    elif timing.period is not None:
+        print(f"🔁 {timing.name}: endless loop, {timing.period:,} cycles per iteration "
+              f"({timing.period * tcy_us:,.1f} µs)")
+    else:
+        print(f"❓ {timing.name}: WCET unknown")
+
+    for loop in timing.loops:
+        bound = "∞" if loop.bound is None else f"{loop.bound:,}"
+        print(f"     loop {loop.header}: {loop.iteration_cycles} cycles/iteration × {bound} ({loop.source})")
+    for problem in timing.problems:
+        print(f"     ⚠️  {problem}")
+    if show_blocks:
+        for label, start, cycles in sorted(timing.blocks, key=lambda b: b[1]):
+            print(f"       block {label:24s} @{start:4d}: {cycles:,} cycles")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Static cycle-count / WCET estimator for PIC16 assembly"
+    )
+    parser.add_argument("source", help="Assembly file (.s/.as/.asm) or listing (.lst)")
+    parser.add_argument(
+        "--function", "-f", action="append",
+        help="Function to analyze (repeatable, default: all detected functions)",
+    )
+    parser.add_argument(
+        "--bound", "-b", action="append", help="Loop bound LABEL=N (repeatable)"
+    )
+    parser.add_argument(
+        "--prescaler", type=int, help="Timer0 prescaler (default: from OPTION_REG writes, else 256)"
+    )
+    parser.add_argument(
+        "--f-cpu", type=int, default=DEFAULT_F_CPU, help=f"Oscillator frequency (default: {DEFAULT_F_CPU})"
+    )
+    parser.add_argument("--blocks", action="store_true", help="Show per-block cycle counts")
+
+    args = parser.parse_args()
+
+    if not Path(args.source).exists():
+        print(f"❌ Source not found: {args.source}")
+        sys.exit(1)
+
+    program = parse_source(args.source)
+    estimator = Estimator(program, parse_bounds(args.bound), args.prescaler)
+    print(f"📄 {args.source}: {len(program.instructions)} instructions, "
+          f"{len(estimator.blocks)} basic blocks, Timer0 prescaler 1:{estimator.prescaler}")
+    print()
+
+    names = args.function or sorted(estimator.functions, key=lambda n: estimator.functions[n])
+    failed = False
+    for name in names:
+        try:
+            timing = estimator.timing(name)
+        except KeyError:
+            print(f"❌ Function not found: {name}")
+            failed = True
+            continue
+        print_timing(timing, args.f_cpu, args.blocks)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Cycle-exact delay routine generator for PIC16 assembly (src/asm-simple)
+
+Emits a pic-as subroutine that lasts exactly the requested time at a given
+oscillator frequency, CALL and RETURN included:
+  - loop mode: nested DECFSZ counters (as few registers as possible),
+    padded with GOTO $+1 / NOP to the exact cycle
+  - timer0 mode: counts Timer0 overflows from a TMR0 preload, then pads
+    the rest with a short counted loop
+
+Every routine is assembled and run on the pic_sim.py core before it is
+printed, so the cycle count in its header is measured, not estimated.
+
+With --update, the routine replaces the block between its begin/end
+markers in an assembly file, so a new crystal only needs a rerun:
+  python delay_gen.py 500ms --f-cpu 20000000 --mode timer0 --prescaler 256 \\
+      --name DELAY_500MS --update ../src/asm-simple/main.s
+
+Examples:
+  python delay_gen.py 500ms
+  python delay_gen.py 250us --registers 1
+  python delay_gen.py 1s --mode timer0 --name DELAY_1S
+"""
+
+import re
+import sys
+import argparse
+from pathlib import Path
+
+from pic16 import SFR_ADDRESSES, SFR_BITS
+from pic_sim import PIC16Simulator
+
+# Default clock (board_build.f_cpu in platformio.ini)
+DEFAULT_F_CPU = 4000000
+DEFAULT_REGISTERS = 3
+
+CALL_RETURN_CYCLES = 4  # CALL (2) + RETURN (2)
+PAD_ONLY_CYCLES = 8  # Below this, GOTO $+1 / NOP padding beats a loop
+PRESCALERS = (2, 4, 8, 16, 32, 64, 128, 256)
+
+# RAM used for counters when verifying (bank 0 general purpose registers)
+VERIFY_RAM_START = 0x20
+VERIFY_CYCLE_LIMIT = 1 << 32
+
+MARKER_BEGIN = "; >>> delay_gen {name}"
+MARKER_END = "; <<< delay_gen {name}"
+
+_DELAY = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*(s|ms|us|cycles?)?\s*$", re.IGNORECASE)
+_UNITS = {"s": 1.0, "ms": 1e-3, "us": 1e-6}
+
+
+def parse_delay(text, f_cpu):
+    """Delay as instruction cycles: '500ms', '250us', '1.5s' or '1000cycles'"""
+    match = _DELAY.match(text)
+    if not match:
+        raise ValueError(f"Invalid delay {text!r} (expected e.g. 500ms, 250us, 1s, 1000cycles)")
+    value, unit = float(match.group(1)), (match.group(2) or "ms").lower()
+    if unit.startswith("cycle"):
+        return int(value)
+    return round(value * _UNITS[unit] * f_cpu / 4)
+
+
+def loop_cycles(registers, iterations):
+    """Cycles of a `registers`-deep DECFSZ loop running `iterations` times, loads included"""
+    return 2 * registers + (2 * registers + 1) * iterations - 1
+
+
+def padding(cycles):
+    """GOTO $+1 (2 cycles, 1 word) and NOP to burn an exact number of cycles"""
+    lines = ["    GOTO    $+1"] * (cycles // 2)
+    if cycles % 2:
+        lines.append("    NOP")
+    return lines
+
+
+def counted_loop(cycles, name, max_registers):
+    """Instructions and counter registers for an exact `cycles` delay
+
+    Uses the fewest counters that reach the delay: with k counters each
+    pass costs 2k+1 cycles and the last one 2k, so k counters cover up to
+    (2k+1) * 256^k cycles.
+    """
+    if cycles < 0:
+        raise ValueError(f"Negative delay ({cycles} cycles)")
+    if cycles <= PAD_ONLY_CYCLES:
+        return padding(cycles), []
+
+    for registers in range(1, max_registers + 1):
+        iterations = (cycles - 2 * registers + 1) // (2 * registers + 1)
+        if iterations < 1:
+            return padding(cycles), []
+        if iterations > 256 ** registers:
+            continue
+
+        counters = [f"{name}_D{i + 1}" for i in range(registers)]
+        lines = []
+        digits = iterations - 1
+        for counter in counters:
+            lines.append(f"    MOVLW   {(digits % 256 + 1) & 0xFF}")
+            lines.append(f"    MOVWF   {counter}")
+            digits //= 256
+        lines.append(f"{name}_LOOP:")
+        for counter in counters[:-1]:
+            lines.append(f"    DECFSZ  {counter}, F")
+            lines.append("    GOTO    $+2")
+        lines.append(f"    DECFSZ  {counters[-1]}, F")
+        lines.append(f"    GOTO    {name}_LOOP")
+        lines += padding(cycles - loop_cycles(registers, iterations))
+        return lines, counters
+
+    limit = loop_cycles(max_registers, 256 ** max_registers) + 2 * max_registers
+    raise ValueError(
+        f"{cycles} cycles need more than {max_registers} counter register(s) "
+        f"(max {limit} cycles); raise --registers or use --mode timer0"
+    )
+
+
+def timer0_body(iterations, preload, name):
+    """Timer0 overflow-counting loop (the counter is {name}_N)"""
+    t0if = SFR_BITS["T0IF"]
+    return [
+        f"    MOVLW   {iterations & 0xFF}",
+        f"    MOVWF   {name}_N",
+        f"{name}_T0:",
+        f"    MOVLW   {preload}",
+        "    MOVWF   TMR0            ; Restarts the prescaler",
+        f"    BCF     INTCON, {t0if}       ; Clear TMR0IF",
+        f"{name}_WAIT:",
+        f"    BTFSS   INTCON, {t0if}",
+        f"    GOTO    {name}_WAIT",
+        f"    DECFSZ  {name}_N, F",
+        f"    GOTO    {name}_T0",
+    ]
+
+
+class Assembler:
+    """Minimal assembler for the instructions this generator emits"""
+
+    LITERAL = {"MOVLW": 0x3000}
+    FILE = {"MOVWF": 0x0080, "CLRF": 0x0180}
+    FILE_DEST = {"DECFSZ": 0x0B00}
+    BIT = {"BCF": 0x1000, "BSF": 0x1400, "BTFSS": 0x1C00}
+    JUMP = {"GOTO": 0x2800, "CALL": 0x2000}
+    BARE = {"NOP": 0x0000, "RETURN": 0x0008, "SLEEP": 0x0063}
+
+    def __init__(self, registers):
+        self.symbols = {name: address & 0x7F for name, address in SFR_ADDRESSES.items()}
+        for i, register in enumerate(registers):
+            self.symbols[register] = VERIFY_RAM_START + i
+
+    def value(self, token):
+        token = token.strip()
+        if token in self.symbols:
+            return self.symbols[token]
+        return int(token, 0)
+
+    def assemble(self, lines, origin=0):
+        statements = []
+        labels = {}
+        for line in lines:
+            line = line.split(";")[0].strip()
+            if not line:
+                continue
+            if line.endswith(":"):
+                labels[line[:-1]] = origin + len(statements)
+                continue
+            statements.append(line)
+
+        words = []
+        for pc, statement in enumerate(statements, origin):
+            mnemonic, _, rest = statement.partition(" ")
+            mnemonic = mnemonic.upper()
+            operands = [op.strip() for op in rest.split(",")] if rest.strip() else []
+            if mnemonic in self.BARE:
+                words.append(self.BARE[mnemonic])
+            elif mnemonic in self.LITERAL:
+                words.append(self.LITERAL[mnemonic] | (self.value(operands[0]) & 0xFF))
+            elif mnemonic in self.FILE:
+                words.append(self.FILE[mnemonic] | self.value(operands[0]))
+            elif mnemonic in self.FILE_DEST:
+                dest = 1 if operands[1].upper() == "F" else 0
+                words.append(self.FILE_DEST[mnemonic] | dest << 7 | self.value(operands[0]))
+            elif mnemonic in self.BIT:
+                bit = self.value(operands[1])
+                words.append(self.BIT[mnemonic] | bit << 7 | self.value(operands[0]))
+            elif mnemonic in self.JUMP:
+                target = operands[0]
+                if target.startswith("$"):
+                    address = pc + int(target[1:] or 0)
+                else:
+                    address = labels[target]
+                words.append(self.JUMP[mnemonic] | address)
+            else:
+                raise ValueError(f"Cannot assemble {statement!r}")
+        return words
+
+
+def measure(lines, registers, option_reg=0xFF):
+    """Cycles from CALL to the end of RETURN, measured on the simulator"""
+    harness = [
+        f"    MOVLW   {option_reg}",
+        f"    BSF     STATUS, {SFR_BITS['RP0']}",
+        "    MOVWF   OPTION_REG",
+        f"    BCF     STATUS, {SFR_BITS['RP0']}",
+        "    CALL    ROUTINE",
+        "    SLEEP",
+        "ROUTINE:",
+    ]
+    program = Assembler(registers).assemble(harness + lines + ["    RETURN"])
+    sim = PIC16Simulator(program)
+    sim.run(VERIFY_CYCLE_LIMIT)
+    if not sim.halted:
+        raise RuntimeError("Generated routine did not return")
+    return sim.cycles - 4 - 1  # setup before CALL, SLEEP
+
+
+def generate_loop(name, cycles, max_registers):
+    body, registers = counted_loop(cycles - CALL_RETURN_CYCLES, name, max_registers)
+    return body, registers, None
+
+
+def option_value(prescaler):
+    """OPTION_REG for Timer0 on the internal clock (PORTB pull-ups off)"""
+    return 0x80 | (PRESCALERS.index(prescaler))
+
+
+def generate_timer0(name, cycles, max_registers, prescaler=None):
+    """Timer0 overflow loop plus an exact counted-loop tail"""
+    if max_registers < 1:
+        raise ValueError("Timer0 mode needs at least 1 register (overflow counter)")
+    budget = cycles - CALL_RETURN_CYCLES
+    candidates = [prescaler] if prescaler else PRESCALERS
+    for scale in candidates:
+        iterations = -(-budget // (scale * 256))
+        if iterations > 256:
+            continue
+        counts = min(256, budget // (iterations * scale))
+        while counts > 0:
+            preload = (256 - counts) & 0xFF
+            body = timer0_body(iterations, preload, name)
+            base = measure(body, [f"{name}_N"], option_value(scale))
+            if base <= cycles:
+                tail, registers = counted_loop(cycles - base, f"{name}_PAD", max_registers - 1)
+                return body + tail, [f"{name}_N"] + registers, scale
+            counts -= 1
+    raise ValueError(
+        f"{cycles} cycles do not fit 256 Timer0 overflows"
+        + (f" at 1:{prescaler}" if prescaler else "")
+        + "; use a larger prescaler or --mode loop"
+    )
+
+
+def render(name, body, registers, cycles, f_cpu, delay_text, prescaler, command):
+    """pic-as source: counters in bank 0, then the routine"""
+    seconds = cycles * 4.0 / f_cpu
+    lines = [
+        MARKER_BEGIN.format(name=name),
+        f"; {name}: {delay_text} at {f_cpu} Hz = {cycles} cycles, CALL and RETURN included",
+        f"; Generated by: {command}",
+    ]
+    if prescaler:
+        ps = PRESCALERS.index(prescaler)
+        lines.append(f"; Requires Timer0 on the internal clock, prescaler 1:{prescaler} "
+                     f"(PSA = 0, PS2:PS0 = {ps:03b}), bank 0 selected")
+    lines.append(f"; Verified on pic_sim: {cycles} cycles ({seconds * 1e3:.6f} ms)")
+    if registers:
+        lines.append("PSECT udata_bank0")
+        lines += [f"{register}: DS 1" for register in registers]
+        lines.append("PSECT code")
+    lines.append(f"{name}:")
+    lines += body
+    lines.append("    RETURN")
+    lines.append(MARKER_END.format(name=name))
+    return "\n".join(lines) + "\n"
+
+
+def update_file(path, name, text):
+    """Replace the marked block of routine `name` in an assembly file"""
+    source = path.read_text()
+    begin = MARKER_BEGIN.format(name=name)
+    end = MARKER_END.format(name=name)
+    start = source.find(begin)
+    stop = source.find(end)
+    if start < 0 or stop < start:
+        raise ValueError(f"{path}: no '{begin}' ... '{end}' block to update")
+    stop += len(end) + 1
+    path.write_text(source[:start] + text + source[stop:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cycle-exact PIC16 delay routine generator")
+    parser.add_argument("delay", help="Delay: 500ms, 250us, 1s or 1000cycles (default unit: ms)")
+    parser.add_argument("--f-cpu", type=int, default=DEFAULT_F_CPU, help="Oscillator frequency in Hz")
+    parser.add_argument("--registers", type=int, default=DEFAULT_REGISTERS, help="Counter register budget")
+    parser.add_argument("--mode", choices=["loop", "timer0"], default="loop", help="Delay technique")
+    parser.add_argument("--prescaler", type=int, choices=PRESCALERS,
+                        help="Timer0 prescaler in timer0 mode (default: smallest that fits)")
+    parser.add_argument("--name", help="Routine label (default: DELAY_<delay>)")
+    parser.add_argument("--update", type=Path, help="Replace the routine's marked block in this file")
+    args = parser.parse_args()
+
+    name = args.name or "DELAY_" + re.sub(r"\W", "_", args.delay.strip().upper())
+
+    try:
+        cycles = parse_delay(args.delay, args.f_cpu)
+        if cycles < CALL_RETURN_CYCLES:
+            raise ValueError(f"{cycles} cycles is shorter than CALL + RETURN ({CALL_RETURN_CYCLES})")
+        if args.mode == "timer0":
+            body, registers, prescaler = generate_timer0(name, cycles, args.registers, args.prescaler)
+        else:
+            body, registers, prescaler = generate_loop(name, cycles, args.registers)
+
+        measured = measure(body, registers, option_value(prescaler) if prescaler else 0xFF)
+        if measured != cycles:
+            raise RuntimeError(f"{name} measured {measured} cycles instead of {cycles}")
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    command = "python delay_gen.py " + " ".join(sys.argv[1:])
+    text = render(name, body, registers, cycles, args.f_cpu, args.delay, prescaler, command)
+
+    if args.update:
+        try:
+            update_file(args.update, name, text)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ {name}: {cycles} cycles, {len(registers)} register(s) -> {args.update}")
+    else:
+        print(text, end="")
+
+
+if __name__ == "__main__":
+    main()
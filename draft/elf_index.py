@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Symbol and line index for built ELF files
+
+The link uses -gdwarf-3, so build/*.elf carries debug information. This
+script parses the ELF/DWARF once into a compact binary index stored next to
+the ELF (build/<name>.idx) and memory-maps it for instant queries:
+
+  python elf_index.py at 0x1A3            # what is at PC 0x1A3
+  python elf_index.py size Timer0_delay   # size of a function
+  python elf_index.py callers Led_turnOn  # who calls a function
+
+The index is rebuilt automatically when the ELF changes (size/mtime), so it
+is cheap enough to run after every build. Other tools use it through
+load_index().
+"""
+
+import sys
+import mmap
+import struct
+import argparse
+from bisect import bisect_right
+from pathlib import Path
+
+# Project configuration
+PROJECT_NAME = "pic_test_project"
+BUILD_DIR = Path("build")
+DEFAULT_ELF_FILE = BUILD_DIR / f"{PROJECT_NAME}.elf"
+
+# Index file layout:
+#   header (HEADER_FORMAT)
+#   string offsets (u32 * n_strings) + string blob (NUL separated)
+#   functions: starts, ends, name ids, file ids, lines   (u32 * n_functions each)
+#   lines: addresses, file ids, line numbers               (u32 * n_lines each)
+#   calls: caller ids, callee ids (function indexes)       (u32 * n_calls each)
+INDEX_MAGIC = b"PICIDX01"
+HEADER_FORMAT = "<8sQQIIIIII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+NO_ID = 0xFFFFFFFF
+
+# Machines whose ELF addresses are already instruction addresses
+HOST_MACHINES = {"EM_386", "EM_X86_64", "EM_ARM", "EM_AARCH64", "EM_RISCV"}
+
+# PIC16 midrange instruction encodings used to recover the call graph
+PCLATH = 0x0A
+OP_CALL, OP_CALL_MASK = 0x2000, 0x3800
+OP_MOVLW, OP_MOVLW_MASK = 0x3000, 0x3C00
+OP_MOVWF, OP_MOVWF_MASK = 0x0080, 0x3F80
+OP_BSF, OP_BCF, OP_BIT_MASK = 0x1400, 0x1000, 0x3C00
+
+
+def index_path(elf_file):
+    """Location of the cached index for an ELF file"""
+    return Path(elf_file).with_suffix(".idx")
+
+
+class ElfIndex:
+    """Memory-mapped view over an index file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic, self.elf_size, self.elf_mtime, self.pc_scale,
+            n_strings, blob_size, n_functions, n_lines, n_calls,
+        ) = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{path} is not an ELF index")
+
+        view = self._view = memoryview(self._map)
+        offset = HEADER_SIZE
+
+        def u32_array(count):
+            nonlocal offset
+            array = view[offset:offset + 4 * count].cast("I")
+            offset += 4 * count
+            return array
+
+        self._string_offsets = u32_array(n_strings)
+        self._blob = view[offset:offset + blob_size]
+        offset += blob_size
+        offset += (-offset) % 4
+
+        self.func_starts = u32_array(n_functions)
+        self.func_ends = u32_array(n_functions)
+        self.func_names = u32_array(n_functions)
+        self.func_files = u32_array(n_functions)
+        self.func_lines = u32_array(n_functions)
+        self.line_addrs = u32_array(n_lines)
+        self.line_files = u32_array(n_lines)
+        self.line_nums = u32_array(n_lines)
+        self.call_from = u32_array(n_calls)
+        self.call_to = u32_array(n_calls)
+        self._by_name = None
+
+    def close(self):
+        for name in (
+            "_string_offsets", "_blob", "func_starts", "func_ends", "func_names",
+            "func_files", "func_lines", "line_addrs", "line_files", "line_nums",
+            "call_from", "call_to",
+        ):
+            getattr(self, name).release()
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def string(self, string_id):
+        if string_id == NO_ID:
+            return ""
+        start = self._string_offsets[string_id]
+        end = start
+        while self._blob[end] != 0:
+            end += 1
+        return bytes(self._blob[start:end]).decode("utf-8", "replace")
+
+    def function_name(self, func_id):
+        return self.string(self.func_names[func_id])
+
+    def find_function(self, name):
+        """Return the function index for `name` (with or without XC8's '_' prefix)"""
+        if self._by_name is None:
+            self._by_name = {}
+            for func_id in range(len(self.func_names)):
+                func_name = self.function_name(func_id)
+                self._by_name.setdefault(func_name, func_id)
+                self._by_name.setdefault(func_name.lstrip("_"), func_id)
+        return self._by_name.get(name, self._by_name.get(name.lstrip("_")))
+
+    def function_at(self, address):
+        """Index of the function containing an ELF address, or None"""
+        pos = bisect_right(self.func_starts, address) - 1
+        if pos >= 0 and address < self.func_ends[pos]:
+            return pos
+        return None
+
+    def line_at(self, address):
+        """(file, line) for an ELF address, or None"""
+        pos = bisect_right(self.line_addrs, address) - 1
+        if pos < 0:
+            return None
+        return self.string(self.line_files[pos]), self.line_nums[pos]
+
+    def lookup_pc(self, pc):
+        """Describe a program counter (instruction address)"""
+        address = pc * self.pc_scale
+        func_id = self.function_at(address)
+        result = {"pc": pc, "address": address, "function": None, "offset": None, "line": None}
+        if func_id is not None:
+            result["function"] = self.function_name(func_id)
+            result["offset"] = (address - self.func_starts[func_id]) // self.pc_scale
+        result["line"] = self.line_at(address)
+        return result
+
+    def function_size(self, name):
+        """Size of a function in instructions (words on PIC16), or None"""
+        func_id = self.find_function(name)
+        if func_id is None:
+            return None
+        return (self.func_ends[func_id] - self.func_starts[func_id]) // self.pc_scale
+
+    def callers(self, name):
+        """Names of the functions that call `name`"""
+        func_id = self.find_function(name)
+        if func_id is None:
+            return None
+        return sorted({
+            self.function_name(self.call_from[i])
+            for i in range(len(self.call_to))
+            if self.call_to[i] == func_id
+        })
+
+    def callees(self, name):
+        """Names of the functions called by `name`"""
+        func_id = self.find_function(name)
+        if func_id is None:
+            return None
+        return sorted({
+            self.function_name(self.call_to[i])
+            for i in range(len(self.call_from))
+            if self.call_from[i] == func_id
+        })
+
+    def functions(self):
+        """Yield (name, start pc, size) for every function"""
+        for func_id in range(len(self.func_starts)):
+            start = self.func_starts[func_id]
+            yield (
+                self.function_name(func_id),
+                start // self.pc_scale,
+                (self.func_ends[func_id] - start) // self.pc_scale,
+            )
+
+
+class _Strings:
+    """String table builder"""
+
+    def __init__(self):
+        self.ids = {}
+        self.items = []
+
+    def add(self, text):
+        if not text:
+            return NO_ID
+        if text not in self.ids:
+            self.ids[text] = len(self.items)
+            self.items.append(text)
+        return self.ids[text]
+
+
+def _attr(die, name):
+    attr = die.attributes.get(name)
+    return None if attr is None else attr.value
+
+
+def _read_dwarf(elf, strings):
+    """Collect functions and line rows from the DWARF sections"""
+    functions = {}
+    lines = []
+    dwarf = elf.get_dwarf_info()
+
+    for cu in dwarf.iter_CUs():
+        for die in cu.iter_DIEs():
+            if die.tag != "DW_TAG_subprogram":
+                continue
+            low = _attr(die, "DW_AT_low_pc")
+            high_attr = die.attributes.get("DW_AT_high_pc")
+            name = _attr(die, "DW_AT_name")
+            if low is None or high_attr is None or name is None:
+                continue
+            high = high_attr.value
+            # DWARF 4+ may encode high_pc as an offset from low_pc
+            if high_attr.form != "DW_FORM_addr":
+                high = low + high
+            functions[low] = (
+                high,
+                name.decode("utf-8", "replace"),
+                _attr(die, "DW_AT_decl_line") or 0,
+            )
+
+        lineprog = dwarf.line_program_for_CU(cu)
+        if lineprog is None:
+            continue
+        file_entries = lineprog.header["file_entry"]
+        version = lineprog.header["version"]
+        for entry in lineprog.get_entries():
+            state = entry.state
+            if state is None or state.end_sequence:
+                continue
+            file_index = state.file if version >= 5 else state.file - 1
+            if 0 <= file_index < len(file_entries):
+                file_name = file_entries[file_index].name.decode("utf-8", "replace")
+            else:
+                file_name = ""
+            lines.append((state.address, strings.add(file_name), state.line))
+
+    return functions, lines
+
+
+def _read_symtab(elf):
+    """Collect functions from the ELF symbol table (fallback without DWARF)"""
+    functions = {}
+    symtab = elf.get_section_by_name(".symtab")
+    if symtab is None:
+        return functions
+    for sym in symtab.iter_symbols():
+        if sym["st_info"]["type"] == "STT_FUNC" and sym["st_size"] > 0:
+            functions.setdefault(sym["st_value"], (sym["st_value"] + sym["st_size"], sym.name, 0))
+    return functions
+
+
+def _decode_pic16_calls(elf, pc_scale, starts, ends):
+    """Recover (caller, callee) pairs by decoding PIC16 CALL instructions"""
+    calls = set()
+    for section in elf.iter_sections():
+        if not section["sh_flags"] & 0x4 or section["sh_type"] != "SHT_PROGBITS":
+            continue  # not executable code
+        data = section.data()
+        base = section["sh_addr"]
+        w_reg = None
+        pclath = None
+        for offset in range(0, len(data) - 1, 2):
+            address = base + offset
+            word = (data[offset] | (data[offset + 1] << 8)) & 0x3FFF
+            caller = bisect_right(starts, address) - 1
+            if caller < 0 or address >= ends[caller]:
+                continue
+
+            if word & OP_MOVLW_MASK == OP_MOVLW:
+                w_reg = word & 0xFF
+            elif word & OP_MOVWF_MASK == OP_MOVWF and word & 0x7F == PCLATH:
+                pclath = w_reg
+            elif word & OP_BIT_MASK in (OP_BSF, OP_BCF) and word & 0x7F == PCLATH:
+                bit = (word >> 7) & 0x7
+                current = pclath if pclath is not None else (address // pc_scale) >> 8
+                if word & OP_BIT_MASK == OP_BSF:
+                    pclath = current | (1 << bit)
+                else:
+                    pclath = current & ~(1 << bit)
+            elif word & OP_CALL_MASK == OP_CALL:
+                page = pclath if pclath is not None else (address // pc_scale) >> 8
+                target = (((page >> 3) & 0x3) << 11 | (word & 0x7FF)) * pc_scale
+                callee = bisect_right(starts, target) - 1
+                if callee >= 0 and starts[callee] == target:
+                    calls.add((caller, callee))
+    return calls
+
+
+def _read_dwarf_calls(elf, starts):
+    """Recover (caller, callee) pairs from DWARF call-site entries, if present"""
+    calls = set()
+    dwarf = elf.get_dwarf_info()
+    start_ids = {start: i for i, start in enumerate(starts)}
+    for cu in dwarf.iter_CUs():
+        caller = None
+        for die in cu.iter_DIEs():
+            if die.tag == "DW_TAG_subprogram":
+                caller = start_ids.get(_attr(die, "DW_AT_low_pc"))
+            elif die.tag in ("DW_TAG_call_site", "DW_TAG_GNU_call_site") and caller is not None:
+                origin = die.attributes.get("DW_AT_call_origin") or die.attributes.get(
+                    "DW_AT_abstract_origin"
+                )
+                if origin is None:
+                    continue
+                target = die.get_DIE_from_attribute(origin.name)
+                callee = start_ids.get(_attr(target, "DW_AT_low_pc"))
+                if callee is not None:
+                    calls.add((caller, callee))
+    return calls
+
+
+def build_index(elf_file, output=None):
+    """Parse an ELF file and write its index, return the index path"""
+    try:
+        from elftools.elf.elffile import ELFFile
+    except ImportError as e:
+        print(f"❌ Cannot import pyelftools: {e}")
+        print("🔄 pip install pyelftools")
+        sys.exit(1)
+
+    elf_file = Path(elf_file)
+    output = Path(output) if output else index_path(elf_file)
+    stat = elf_file.stat()
+    strings = _Strings()
+
+    with open(elf_file, "rb") as f:
+        elf = ELFFile(f)
+        pc_scale = 1 if elf["e_machine"] in HOST_MACHINES else 2
+
+        functions, lines = ({}, [])
+        if elf.has_dwarf_info():
+            functions, lines = _read_dwarf(elf, strings)
+        for start, entry in _read_symtab(elf).items():
+            functions.setdefault(start, entry)
+
+        ordered = sorted(functions.items())
+        starts = [start for start, _ in ordered]
+        ends = [entry[0] for _, entry in ordered]
+
+        calls = set()
+        if elf.has_dwarf_info():
+            calls = _read_dwarf_calls(elf, starts)
+        if not calls and pc_scale != 1:
+            calls = _decode_pic16_calls(elf, pc_scale, starts, ends)
+
+    names = [strings.add(entry[1]) for _, entry in ordered]
+    decl_lines = [entry[2] for _, entry in ordered]
+    # A function's file is the file of its first line row
+    lines.sort()
+    line_addrs = [row[0] for row in lines]
+    files = []
+    for start in starts:
+        pos = bisect_right(line_addrs, start) - 1
+        files.append(lines[pos][1] if pos >= 0 else NO_ID)
+
+    blob = bytearray()
+    string_offsets = []
+    for text in strings.items:
+        string_offsets.append(len(blob))
+        blob += text.encode("utf-8") + b"\0"
+    blob += b"\0" * ((-(HEADER_SIZE + 4 * len(string_offsets) + len(blob))) % 4)
+
+    calls = sorted(calls)
+    with open(output, "wb") as out:
+        out.write(struct.pack(
+            HEADER_FORMAT, INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, pc_scale,
+            len(string_offsets), len(blob), len(starts), len(lines), len(calls),
+        ))
+        for array in (
+            string_offsets, None,
+            starts, ends, names, files, decl_lines,
+            line_addrs, [row[1] for row in lines], [row[2] for row in lines],
+            [c[0] for c in calls], [c[1] for c in calls],
+        ):
+            if array is None:
+                out.write(blob)
+            elif array:
+                out.write(struct.pack(f"<{len(array)}I", *array))
+
+    return output
+
+
+def load_index(elf_file=DEFAULT_ELF_FILE, rebuild=False):
+    """Return an ElfIndex for `elf_file`, (re)building the cache when stale"""
+    elf_file = Path(elf_file)
+    path = index_path(elf_file)
+    if not rebuild and path.exists():
+        index = ElfIndex(path)
+        stat = elf_file.stat()
+        if index.elf_size == stat.st_size and index.elf_mtime == stat.st_mtime_ns:
+            return index
+        index.close()
+    build_index(elf_file, path)
+    return ElfIndex(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symbol/line index for built ELF files")
+    parser.add_argument("--elf", default=str(DEFAULT_ELF_FILE), help="ELF file to index")
+    parser.add_argument("--rebuild", action="store_true", help="Force index rebuild")
+    subparsers = parser.add_subparsers(dest="command")
+
+    at = subparsers.add_parser("at", help="Function and source line at a PC")
+    at.add_argument("pc", help="Program counter (e.g. 0x1A3)")
+    size = subparsers.add_parser("size", help="Size of a function")
+    size.add_argument("function")
+    callers = subparsers.add_parser("callers", help="Functions calling a function")
+    callers.add_argument("function")
+    callees = subparsers.add_parser("callees", help="Functions called by a function")
+    callees.add_argument("function")
+    subparsers.add_parser("functions", help="List all functions")
+    subparsers.add_parser("build", help="Build the index only")
+
+    args = parser.parse_args()
+
+    if not Path(args.elf).exists():
+        print(f"❌ ELF file not found: {args.elf} - build first")
+        sys.exit(1)
+
+    with load_index(args.elf, args.rebuild) as index:
+        if args.command in (None, "build"):
+            print(f"✅ Index ready: {index.path} "
+                  f"({len(index.func_starts)} functions, {len(index.line_addrs)} line rows)")
+
+        elif args.command == "at":
+            info = index.lookup_pc(int(args.pc, 0))
+            where = f"{info['function']}+{info['offset']}" if info["function"] else "??"
+            line = f"{info['line'][0]}:{info['line'][1]}" if info["line"] else "no line info"
+            print(f"0x{info['pc']:04X}: {where} ({line})")
+
+        elif args.command == "size":
+            words = index.function_size(args.function)
+            if words is None:
+                print(f"❌ Unknown function: {args.function}")
+                sys.exit(1)
+            print(f"{args.function}: {words} words")
+
+        elif args.command in ("callers", "callees"):
+            names = getattr(index, args.command)(args.function)
+            if names is None:
+                print(f"❌ Unknown function: {args.function}")
+                sys.exit(1)
+            print(f"{args.function} {args.command}: {', '.join(names) or '(none)'}")
+
+        elif args.command == "functions":
+            for name, start, words in index.functions():
+                print(f"  0x{start:04X} {words:5d}  {name}")
+
+
+if __name__ == "__main__":
+    main()
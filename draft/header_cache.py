@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Pre-expanded common headers for XC8 compiles
+
+Every translation unit starts with the same includes - <xc.h> (thousands
+of lines of SFR declarations and macros for the device), <stdint.h>,
+device_config.h, pin_manager.h - and XC8 has no precompiled headers, so
+each compile searches for, reads and preprocesses them again.
+
+HeaderCache runs the preprocessor once per distinct leading include list
+and (compiler, device, defines, include directories), keeping the macro
+definitions (`-E -dD`), and stores the result under build/header_cache/.
+A source's pre-expanded unit is that expansion followed by
+`#line N "source.c"` and the rest of the source: XC8 then compiles one
+file with no search for the common headers, and the include guards in
+the expansion turn any later `#include <xc.h>` into a no-op. Expansions
+are reused as long as every file they came from is unchanged.
+
+`check` verifies a unit: the original source and its unit must
+preprocess to the same tokens. `bench` compiles each source both ways.
+
+No build uses the units yet: XC8 still lexes and parses the whole
+expansion, so only the header search is saved. They stay out of
+pic.py, compile_v2.py and SConstruct until `bench` shows a speedup with
+XC8.
+
+Example:
+  python header_cache.py check src/multi/*.c
+  python header_cache.py bench src/multi/*.c --repeat 5
+  PIC_CC=gcc python header_cache.py check --flags="-Idraft/host" src/multi/*.c
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+# Cache configuration
+CACHE_DIR = Path(__file__).resolve().parent.parent / "build" / "header_cache"
+TARGET_CHIP = "PIC16F876A"
+DEFAULT_FLAGS = [f"-mcpu={TARGET_CHIP}", "-std=c99", "-D_XTAL_FREQ=4000000UL"]
+CC_ENV = "PIC_CC"
+
+# Project headers shared by most units; toolchain <...> headers always are
+COMMON_HEADERS = {"device_config.h", "pin_manager.h"}
+
+INCLUDE_RE = re.compile(r'\s*#\s*include\s*([<"])([^>"]+)[>"]')
+LINE_MARKER_RE = re.compile(r'#\s*(?:line\s+)?\d+\s+"([^"]*)"')
+# Flags that change what the preprocessor produces
+PREPROCESSOR_FLAG_RE = re.compile(r"-(?:mcpu|D|U|I|std|m)")
+
+
+def split_prefix(text):
+    """Leading common includes of a source: (include lines, lines they span)
+
+    Comments and blank lines may separate them; the prefix stops at the
+    first include of a non-common header or any other code.
+    """
+    includes, end, in_comment = [], 0, False
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if in_comment:
+            in_comment = "*/" not in stripped
+            continue
+        if not stripped or stripped.startswith("//"):
+            continue
+        if stripped.startswith("/*"):
+            in_comment = "*/" not in stripped
+            continue
+        match = INCLUDE_RE.match(line)
+        if not match or (match.group(1) == '"' and match.group(2) not in COMMON_HEADERS):
+            break
+        close = ">" if match.group(1) == "<" else '"'
+        includes.append(f"#include {match.group(1)}{match.group(2)}{close}")
+        end = number
+    return includes, end
+
+
+def preprocessor_flags(flags):
+    return [flag for flag in flags if PREPROCESSOR_FLAG_RE.match(flag)]
+
+
+def file_digest(path):
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def strip_predefined(expansion):
+    """Drop the <built-in>/<command line> sections of an `-E -dD` output
+
+    Those macros are defined again by the compiler (and the same -D flags)
+    when the unit is compiled.
+    """
+    lines, keep = [], True
+    for line in expansion.splitlines():
+        marker = LINE_MARKER_RE.match(line)
+        if marker:
+            keep = not marker.group(1).startswith("<")
+        if keep:
+            lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def included_files(expansion):
+    """Real files an expansion was read from (from its line markers)"""
+    files = {marker.group(1) for marker in map(LINE_MARKER_RE.match, expansion.splitlines()) if marker}
+    return sorted(path for path in files if not path.startswith("<") and os.path.isfile(path))
+
+
+class HeaderCache:
+    """Pre-expanded units for one compiler and set of flags"""
+
+    def __init__(self, cc, flags, cache_dir=CACHE_DIR):
+        self.cc = str(cc)
+        self.flags = preprocessor_flags(flags)
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, includes, source_dir):
+        """Expansion key: what the preprocessor sees, before reading any header"""
+        compiler = Path(self.cc)
+        stamp = os.stat(compiler).st_mtime_ns if compiler.is_file() else self.cc
+        data = json.dumps([self.cc, str(stamp), self.flags, str(source_dir), includes])
+        return hashlib.sha1(data.encode()).hexdigest()[:16]
+
+    def expansion(self, includes, source_dir):
+        """Path of the expanded prefix, regenerated when a header changed"""
+        key = self._key(includes, source_dir)
+        expanded = self.cache_dir / f"{key}.i"
+        manifest = self.cache_dir / f"{key}.json"
+        try:
+            dependencies = json.loads(manifest.read_text())
+            if expanded.exists() and all(
+                os.path.isfile(path) and file_digest(path) == digest for path, digest in dependencies.items()
+            ):
+                self.hits += 1
+                return expanded
+        except (OSError, ValueError):
+            pass
+
+        self.misses += 1
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        prefix = self.cache_dir / f"{key}.c"
+        prefix.write_text("\n".join(includes) + "\n")
+        raw = self.cache_dir / f"{key}.raw.i"
+        command = [self.cc] + self.flags + [f"-I{source_dir}", "-E", "-dD", "-o", str(raw), str(prefix)]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Preprocessing {', '.join(includes)} failed: {result.stderr.strip()}")
+        text = raw.read_text(errors="replace")
+        raw.unlink()
+        expanded.write_text(strip_predefined(text))
+        manifest.write_text(json.dumps({path: file_digest(path) for path in included_files(text)}, indent=1))
+        return expanded
+
+    def unit_for(self, source):
+        """Pre-expanded unit for `source`, or None if it has no common prefix
+
+        Compile it with -I<directory of source>, since its remaining
+        quoted includes are no longer next to it.
+        """
+        source = Path(source).resolve()
+        text = source.read_text(errors="replace")
+        includes, end = split_prefix(text)
+        if not includes:
+            return None
+        expanded = self.expansion(includes, source.parent)
+        rest = "\n".join(text.splitlines()[end:])
+        unit = self.cache_dir / "units" / f"{source.stem}-{hashlib.sha1(str(source).encode()).hexdigest()[:8]}.c"
+        unit.parent.mkdir(parents=True, exist_ok=True)
+        content = f'{expanded.read_text()}#line {end + 1} "{source}"\n{rest}\n'
+        if not unit.exists() or unit.read_text() != content:
+            unit.write_text(content)
+        return unit
+
+
+def preprocessed_tokens(cc, flags, source, include_dir):
+    """Preprocessed code of a file without line markers or blank lines"""
+    result = subprocess.run(
+        [cc] + preprocessor_flags(flags) + [f"-I{include_dir}", "-E", str(source)],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Preprocessing {source} failed: {result.stderr.strip()}")
+    return [" ".join(line.split()) for line in result.stdout.splitlines()
+            if line.strip() and not LINE_MARKER_RE.match(line.strip())]
+
+
+def check(cache, source):
+    """True when the unit of `source` preprocesses exactly like the source"""
+    unit = cache.unit_for(source)
+    if unit is None:
+        return True
+    include_dir = Path(source).resolve().parent
+    return (preprocessed_tokens(cache.cc, cache.flags, source, include_dir)
+            == preprocessed_tokens(cache.cc, cache.flags, unit, include_dir))
+
+
+def compile_time(cc, flags, source, include_dir, output, repeat):
+    """Best wall-clock time of compiling `source` to `output`"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run([cc] + flags + [f"-I{include_dir}", "-c", "-o", str(output), str(source)],
+                                capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        if result.returncode != 0:
+            raise RuntimeError(f"Compiling {source} failed: {result.stderr.strip()}")
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def find_cc():
+    if os.environ.get(CC_ENV):
+        return os.environ[CC_ENV]
+    from xc8_wrapper import get_xc8_tool_path
+
+    path, _ = get_xc8_tool_path("cc", "3.00")
+    return str(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-expanded common headers for XC8 compiles")
+    parser.add_argument("command", choices=["check", "bench"], help="Verify units or time compiles")
+    parser.add_argument("sources", nargs="+", help="C sources")
+    parser.add_argument("--flags", default=" ".join(DEFAULT_FLAGS), help="Compiler flags")
+    parser.add_argument("--repeat", type=int, default=3, help="Compiles per file for bench, best is kept")
+    args = parser.parse_args()
+
+    cc = find_cc()
+    flags = args.flags.split()
+    cache = HeaderCache(cc, flags)
+    failed = False
+
+    for source in map(Path, args.sources):
+        try:
+            if args.command == "check":
+                ok = check(cache, source)
+                print(f"{'✅' if ok else '❌'} {source}: {'same' if ok else 'DIFFERENT'} preprocessed code")
+                failed |= not ok
+                continue
+
+            unit = cache.unit_for(source)
+            if unit is None:
+                print(f"⚠️ {source}: no common header prefix")
+                continue
+            output = cache.cache_dir / "bench.p1"
+            plain = compile_time(cc, flags, source, source.resolve().parent, output, args.repeat)
+            cached = compile_time(cc, flags, unit, source.resolve().parent, output, args.repeat)
+            print(f"⏱️ {source}: {plain * 1000:7.1f} ms -> {cached * 1000:7.1f} ms "
+                  f"(x{plain / cached:.2f})")
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            failed = True
+
+    print(f"Expansions: {cache.hits} reused, {cache.misses} generated")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+/**
+ * @file host_runtime.c
+ * @brief Virtual clock, Timer0 and interrupt model behind the host xc.h
+ * @details Linked into every host build by draft/host_harness.py.
+ */
+
+#include <setjmp.h>
+#include <stddef.h>
+#include "xc.h"
+
+#define T0IF_MASK 0x04
+#define T0IE_MASK 0x20
+#define GIE_MASK  0x80
+#define T0CS_MASK 0x20
+#define PSA_MASK  0x08
+
+#define POLL_CYCLES 3  // btfss + goto of a polling loop
+
+host_state_t host;
+
+static jmp_buf host_stop;
+static void *last_intcon_site;
+
+static uint32_t timer0_prescale(void)
+{
+    uint8_t option = HOST_REG(HOST_OPTION_REG);
+    return (option & PSA_MASK) ? 1u : 2u << (option & 0x07);
+}
+
+static int timer0_running(void)
+{
+    return !(HOST_REG(HOST_OPTION_REG) & T0CS_MASK);
+}
+
+/* Take a pending Timer0 interrupt. Also called on every INTCON access, so
+ * a flag raised while GIE was clear fires once firmware sets GIE again. */
+static void service_interrupt(void)
+{
+    uint8_t intcon = HOST_REG(HOST_INTCON);
+    if (host.isr && !host.in_isr && (intcon & GIE_MASK)
+            && (intcon & T0IE_MASK) && (intcon & T0IF_MASK)) {
+        HOST_REG(HOST_INTCON) &= ~GIE_MASK;
+        host.in_isr = 1;
+        host.interrupts++;
+        host.isr();
+        host.in_isr = 0;
+        HOST_REG(HOST_INTCON) |= GIE_MASK;  // retfie
+    }
+}
+
+static void timer0_overflow(void)
+{
+    HOST_REG(HOST_INTCON) |= T0IF_MASK;
+    host.overflows++;
+    service_interrupt();
+}
+
+/* Cycles until the next Timer0 overflow */
+static uint64_t timer0_remaining(void)
+{
+    uint32_t prescale = timer0_prescale();
+    return (uint64_t)(256 - HOST_REG(HOST_TMR0)) * prescale - host.prescale_count;
+}
+
+void host_advance(uint64_t cycles)
+{
+    int stop = 0;
+
+    if (host.in_isr) {
+        return;  // interrupt latency is not modeled
+    }
+    if (host.running && host.cycles + cycles >= host.cycle_limit) {
+        cycles = host.cycle_limit > host.cycles ? host.cycle_limit - host.cycles : 0;
+        stop = 1;
+    }
+
+    while (cycles > 0) {
+        if (!timer0_running()) {
+            host.cycles += cycles;
+            break;
+        }
+
+        uint64_t remaining = timer0_remaining();
+        if (cycles < remaining) {
+            uint32_t prescale = timer0_prescale();
+            uint64_t total = host.prescale_count + cycles;
+            HOST_REG(HOST_TMR0) += (uint8_t)(total / prescale);
+            host.prescale_count = (uint32_t)(total % prescale);
+            host.cycles += cycles;
+            break;
+        }
+
+        host.cycles += remaining;
+        cycles -= remaining;
+        HOST_REG(HOST_TMR0) = 0;
+        host.prescale_count = 0;
+        timer0_overflow();
+    }
+
+    if (stop) {
+        longjmp(host_stop, 1);
+    }
+}
+
+volatile uint8_t *host_intcon(void)
+{
+    void *site = __builtin_return_address(0);
+
+    service_interrupt();
+
+    /* Every access costs an instruction cycle, so idle loops that only
+     * touch INTCON (di/ei around a run-queue scan) still let time pass.
+     * A second consecutive access from the same site is a polling loop:
+     * skip straight to the event it waits for. */
+    if (!host.in_isr) {
+        if (site != last_intcon_site) {
+            host_advance(1);
+        } else if (timer0_running() && !(HOST_REG(HOST_INTCON) & T0IF_MASK)) {
+            host_advance(timer0_remaining());
+        } else {
+            host_advance(POLL_CYCLES);
+        }
+    }
+    last_intcon_site = site;
+    return &HOST_REG(HOST_INTCON);
+}
+
+/* Every TMR0 access costs an instruction cycle, so loops polling the
+ * counter (while (TMR0 < target)) let the timer move on. */
+volatile uint8_t *host_tmr0(void)
+{
+    if (!host.in_isr) {
+        host_advance(1);
+    }
+    return &HOST_REG(HOST_TMR0);
+}
+
+/* Refresh the input bits of the ports from the driven levels before each
+ * access: reads see the pins, and a whole-byte write only lasts on the
+ * output bits, as on the device. Every port is refreshed, since pin
+ * tables reach the ports through PIN_PORT_AT(address). */
+volatile uint8_t *host_port(uint8_t address)
+{
+    for (uint8_t i = 0; i < sizeof(host.inputs); i++) {
+        uint8_t tris = HOST_REG(HOST_TRISA + i);
+        volatile uint8_t *port = &HOST_REG(HOST_PORTA + i);
+
+        *port = (uint8_t)((*port & ~tris) | (host.inputs[i] & tris));
+    }
+    return &HOST_REG(address);
+}
+
+int host_run(void (*entry)(void), uint64_t max_cycles)
+{
+    host.cycle_limit = host.cycles + max_cycles;
+    host.running = 1;
+    last_intcon_site = NULL;
+
+    if (setjmp(host_stop) == 0) {
+        entry();
+        host.running = 0;
+        return 1;  // entry returned
+    }
+    host.running = 0;
+    return 0;  // stopped at the cycle limit
+}
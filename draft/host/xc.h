@@ -0,0 +1,150 @@
+/**
+ * @file xc.h
+ * @brief Host stand-in for the XC8 device header (PIC16F876A subset)
+ * @details Lets the firmware sources build with the host gcc (see
+ *          draft/host_harness.py). Special function registers live in the
+ *          `host` state block, which Python maps with ctypes, so tests can
+ *          drive input pins and inspect output latches directly. Input pin
+ *          levels are kept apart from the port byte, so whole-port writes
+ *          do not overwrite what the outside world drives.
+ *
+ *          Time is virtual: __delay_ms()/__delay_us(), NOP(), TMR0 and
+ *          INTCON accesses advance the instruction-cycle clock, and a repeated poll
+ *          of INTCON from the same call site (while (!INTCONbits.T0IF))
+ *          jumps the clock to the next Timer0 overflow instead of spinning.
+ */
+
+#ifndef HOST_XC_H
+#define HOST_XC_H
+
+#include <stdint.h>
+
+#define HOST_RAM_SIZE 512
+
+/** @brief Simulated device state shared with Python */
+typedef struct {
+    volatile uint8_t ram[HOST_RAM_SIZE]; /**< Data memory, SFRs at their datasheet addresses */
+    uint64_t cycles;                     /**< Virtual instruction-cycle clock */
+    uint64_t cycle_limit;                /**< host_run() stops once cycles reach this */
+    uint32_t overflows;                  /**< Timer0 overflows so far */
+    uint32_t interrupts;                 /**< Interrupt service routine calls so far */
+    uint32_t prescale_count;             /**< Cycles accumulated in the Timer0 prescaler */
+    uint8_t running;                     /**< Inside host_run() */
+    uint8_t in_isr;                      /**< Inside the interrupt service routine */
+    void (*isr)(void);                   /**< Firmware interrupt routine, set from Python */
+    uint8_t inputs[3];                   /**< Levels driven on PORTA-PORTC pins (TRIS bit = 1) */
+} host_state_t;
+
+extern host_state_t host;
+
+void host_advance(uint64_t cycles);
+volatile uint8_t *host_intcon(void);
+volatile uint8_t *host_port(uint8_t address);
+volatile uint8_t *host_tmr0(void);
+int host_run(void (*entry)(void), uint64_t max_cycles);
+
+/* Register addresses (bank-qualified, as in the datasheet) */
+#define HOST_TMR0       0x01
+#define HOST_STATUS     0x03
+#define HOST_FSR        0x04
+#define HOST_PORTA      0x05
+#define HOST_PORTB      0x06
+#define HOST_PORTC      0x07
+#define HOST_PCLATH     0x0A
+#define HOST_INTCON     0x0B
+#define HOST_ADCON0     0x1F
+#define HOST_OPTION_REG 0x81
+#define HOST_TRISA      0x85
+#define HOST_TRISB      0x86
+#define HOST_TRISC      0x87
+#define HOST_ADCON1     0x9F
+
+#define HOST_REG(addr) (host.ram[(addr)])
+
+typedef struct {
+    unsigned RA0 : 1, RA1 : 1, RA2 : 1, RA3 : 1, RA4 : 1, RA5 : 1, : 2;
+} PORTAbits_t;
+
+typedef struct {
+    unsigned RB0 : 1, RB1 : 1, RB2 : 1, RB3 : 1, RB4 : 1, RB5 : 1, RB6 : 1, RB7 : 1;
+} PORTBbits_t;
+
+typedef struct {
+    unsigned RC0 : 1, RC1 : 1, RC2 : 1, RC3 : 1, RC4 : 1, RC5 : 1, RC6 : 1, RC7 : 1;
+} PORTCbits_t;
+
+typedef struct {
+    unsigned TRISA0 : 1, TRISA1 : 1, TRISA2 : 1, TRISA3 : 1, TRISA4 : 1, TRISA5 : 1, : 2;
+} TRISAbits_t;
+
+typedef struct {
+    unsigned TRISB0 : 1, TRISB1 : 1, TRISB2 : 1, TRISB3 : 1,
+             TRISB4 : 1, TRISB5 : 1, TRISB6 : 1, TRISB7 : 1;
+} TRISBbits_t;
+
+typedef struct {
+    unsigned TRISC0 : 1, TRISC1 : 1, TRISC2 : 1, TRISC3 : 1,
+             TRISC4 : 1, TRISC5 : 1, TRISC6 : 1, TRISC7 : 1;
+} TRISCbits_t;
+
+typedef struct {
+    unsigned RBIF : 1, INTF : 1, T0IF : 1, RBIE : 1, INTE : 1, T0IE : 1, PEIE : 1, GIE : 1;
+} INTCONbits_t;
+
+typedef struct {
+    unsigned PS0 : 1, PS1 : 1, PS2 : 1, PSA : 1, T0SE : 1, T0CS : 1, INTEDG : 1, nRBPU : 1;
+} OPTION_REGbits_t;
+
+typedef struct {
+    unsigned C : 1, DC : 1, Z : 1, nPD : 1, nTO : 1, RP0 : 1, RP1 : 1, IRP : 1;
+} STATUSbits_t;
+
+/* Byte registers */
+#define TMR0       (*host_tmr0())
+#define STATUS     HOST_REG(HOST_STATUS)
+#define FSR        HOST_REG(HOST_FSR)
+#define PORTA      (*host_port(HOST_PORTA))
+#define PORTB      (*host_port(HOST_PORTB))
+#define PORTC      (*host_port(HOST_PORTC))
+#define PCLATH     HOST_REG(HOST_PCLATH)
+#define INTCON     (*host_intcon())
+#define ADCON0     HOST_REG(HOST_ADCON0)
+#define OPTION_REG HOST_REG(HOST_OPTION_REG)
+#define TRISA      HOST_REG(HOST_TRISA)
+#define TRISB      HOST_REG(HOST_TRISB)
+#define TRISC      HOST_REG(HOST_TRISC)
+#define ADCON1     HOST_REG(HOST_ADCON1)
+
+/* Register at a data address (pin lookup tables of transpile_passes.py) */
+#define PIN_PORT_AT(address) (*host_port(address))
+
+/* Bit-field views */
+#define PORTAbits      (*(volatile PORTAbits_t *)host_port(HOST_PORTA))
+#define PORTBbits      (*(volatile PORTBbits_t *)host_port(HOST_PORTB))
+#define PORTCbits      (*(volatile PORTCbits_t *)host_port(HOST_PORTC))
+#define TRISAbits      (*(volatile TRISAbits_t *)&HOST_REG(HOST_TRISA))
+#define TRISBbits      (*(volatile TRISBbits_t *)&HOST_REG(HOST_TRISB))
+#define TRISCbits      (*(volatile TRISCbits_t *)&HOST_REG(HOST_TRISC))
+#define INTCONbits     (*(volatile INTCONbits_t *)host_intcon())
+#define OPTION_REGbits (*(volatile OPTION_REGbits_t *)&HOST_REG(HOST_OPTION_REG))
+#define STATUSbits     (*(volatile STATUSbits_t *)&HOST_REG(HOST_STATUS))
+
+/* Legacy single-bit names (only those that are not also field names,
+ * which would break INTCONbits.T0IF) */
+#define TMR0IF INTCONbits.T0IF
+#define TMR0IE INTCONbits.T0IE
+
+/* Compiler built-ins */
+#define __interrupt(...)
+#define __at(address)
+#define NOP()    host_advance(1)
+#define CLRWDT() host_advance(1)
+#define SLEEP()  host_advance(1)
+#define ei()     (INTCONbits.GIE = 1)
+#define di()     (INTCONbits.GIE = 0)
+
+#define __delay_us(x) host_advance((uint64_t)(x) * (_XTAL_FREQ / 4000000UL))
+#define __delay_ms(x) host_advance((uint64_t)(x) * (_XTAL_FREQ / 4000UL))
+#define _delay(x)     host_advance((uint64_t)(x))
+
+#endif // HOST_XC_H
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Host-native build of the firmware for fast tests and profiling
+
+Compiles src/cpp-multi/generated_c/*.c or src/multi/*.c (plus the shared
+src/common/*.c) with the host gcc
+against the stand-in xc.h in draft/host/ into a shared library. Registers
+(PORTx, TRISx, TMR0, INTCON, OPTION_REG...) live in the library's `host`
+state block, mapped here with ctypes, and busy-waits run on a virtual
+clock - so thousands of Button_update/Led_*/Timer0_* scenarios run per
+second. tests/test_host_firmware.py runs them under pytest:
+
+    fw = HostFirmware("cpp-multi-api")
+    button = fw.new()
+    fw.lib.Button_init(button, 0)
+    fw.set_pin("PORTA", 2, 0)  # press PB0 (RA2, active low)
+    for _ in range(5):
+        fw.lib.Button_update(button)
+    assert fw.lib.Button_isPressed(button)
+
+The cpp-multi target is the optimized C that ships (transpile_passes.py
+inlines and specializes methods, so their self-pointer API is gone);
+cpp-multi-api transpiles the same classes with only the pin switch
+lowering pass, keeping every method callable.
+
+Running this script benchmarks the scenario throughput; correctness is
+checked by the tests.
+"""
+
+import sys
+import time
+import ctypes
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+from pic16 import SFR_ADDRESSES
+
+# Project configuration
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HOST_DIR = Path(__file__).resolve().parent / "host"
+BUILD_DIR = PROJECT_ROOT / "build" / "host"
+DEFAULT_F_CPU = 4000000
+
+# Host builds: target -> source globs (relative to the project root)
+TARGETS = {
+    "cpp-multi": ["src/cpp-multi/generated_c/*.c", "src/common/*.c"],
+    "cpp-multi-api": ["build/host/cpp-multi-api/*.c", "src/common/*.c"],
+    "multi": ["src/multi/*.c", "src/common/*.c"],
+}
+
+# Targets whose sources are generated first (command run from the project root)
+GENERATED_TARGETS = {
+    "cpp-multi-api": [
+        "src/cpp-multi/manual_transpile.py", "--passes", "switches", "--output", "build/host/cpp-multi-api",
+    ],
+}
+
+CC = "gcc"
+CFLAGS = [
+    "-std=gnu99", "-O1", "-g", "-shared", "-fPIC",
+    "-Wall", "-Wno-unknown-pragmas", "-Wno-main",
+]
+
+HOST_RAM_SIZE = 512
+HOST_PORTS = ("PORTA", "PORTB", "PORTC")
+
+
+class HostState(ctypes.Structure):
+    """Mirror of host_state_t in draft/host/xc.h"""
+
+    _fields_ = [
+        ("ram", ctypes.c_uint8 * HOST_RAM_SIZE),
+        ("cycles", ctypes.c_uint64),
+        ("cycle_limit", ctypes.c_uint64),
+        ("overflows", ctypes.c_uint32),
+        ("interrupts", ctypes.c_uint32),
+        ("prescale_count", ctypes.c_uint32),
+        ("running", ctypes.c_uint8),
+        ("in_isr", ctypes.c_uint8),
+        ("isr", ctypes.c_void_p),
+        ("inputs", ctypes.c_uint8 * len(HOST_PORTS)),
+    ]
+
+
+def target_sources(target):
+    if target not in TARGETS:
+        raise ValueError(f"Unknown host target {target!r} (available: {', '.join(TARGETS)})")
+    if target in GENERATED_TARGETS:
+        cmd = [sys.executable] + GENERATED_TARGETS[target]
+        result = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Generating {target} sources failed:\n{result.stderr}")
+    sources = []
+    for pattern in TARGETS[target]:
+        sources.extend(sorted(PROJECT_ROOT.glob(pattern)))
+    return sources + [HOST_DIR / "host_runtime.c"]
+
+
+def build_library(target, rebuild=False):
+    """Compile a target into build/host/, reusing it while sources are unchanged"""
+    sources = target_sources(target)
+    digest = hashlib.sha1(" ".join([CC] + CFLAGS).encode())
+    for path in sources + sorted(HOST_DIR.glob("*.h")):
+        digest.update(path.read_bytes())
+    for path in sorted({s.parent for s in sources}):
+        for header in sorted(path.glob("*.h")):
+            digest.update(header.read_bytes())
+
+    library = BUILD_DIR / f"{target}-{digest.hexdigest()[:12]}.so"
+    if library.exists() and not rebuild:
+        return library
+
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    include_dirs = [HOST_DIR] + sorted({s.parent for s in sources})
+    cmd = [CC] + CFLAGS + [f"-I{d}" for d in include_dirs] + [str(s) for s in sources]
+    cmd += ["-o", str(library)]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Host build of {target} failed:\n{result.stderr}")
+    return library
+
+
+class HostFirmware:
+    """Firmware compiled for the host, with its registers exposed to Python"""
+
+    def __init__(self, target="cpp-multi", rebuild=False, f_cpu=DEFAULT_F_CPU):
+        self.target = target
+        self.f_cpu = f_cpu
+        self.path = build_library(target, rebuild)
+        self.lib = ctypes.CDLL(str(self.path))
+        self.state = HostState.in_dll(self.lib, "host")
+        self.lib.host_advance.argtypes = [ctypes.c_uint64]
+        self.lib.host_run.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+        self.reset()
+
+    def reset(self):
+        """Power-on state: ports as inputs, pins pulled high, Timer0 stopped"""
+        ctypes.memset(ctypes.addressof(self.state), 0, ctypes.sizeof(self.state))
+        for name in ("TRISA", "TRISB", "TRISC", "OPTION_REG"):
+            self.set_register(name, 0xFF)
+        for name in HOST_PORTS:
+            self.set_register(name, 0xFF)
+        self.set_register("STATUS", 0x18)
+
+    # Registers and pins
+
+    def register(self, name):
+        return self.state.ram[SFR_ADDRESSES[name]]
+
+    def set_register(self, name, value):
+        """Write a register; for PORTx this also drives the input pins"""
+        self.state.ram[SFR_ADDRESSES[name]] = value & 0xFF
+        if name in HOST_PORTS:
+            self.state.inputs[HOST_PORTS.index(name)] = value & 0xFF
+
+    def pin(self, port, bit):
+        return (self.register(port) >> bit) & 1
+
+    def set_pin(self, port, bit, level):
+        value = self.register(port)
+        self.set_register(port, value | (1 << bit) if level else value & ~(1 << bit))
+
+    # Virtual clock
+
+    @property
+    def cycles(self):
+        return self.state.cycles
+
+    @property
+    def elapsed_ms(self):
+        return self.state.cycles * 4000.0 / self.f_cpu
+
+    def advance(self, cycles):
+        """Let `cycles` instruction cycles pass (Timer0 ticks, ISR may run)"""
+        self.lib.host_advance(cycles)
+
+    def set_isr(self, name):
+        """Route Timer0 interrupts to the firmware function `name`"""
+        self.state.isr = ctypes.cast(getattr(self.lib, name), ctypes.c_void_p).value
+
+    # Calling firmware
+
+    def new(self, size=64):
+        """Zeroed storage for a firmware object (Button, Led, Timer0...)"""
+        return ctypes.create_string_buffer(size)
+
+    def run(self, entry="main", cycles=None, ms=None):
+        """Call `entry` until it returns or the cycle budget runs out
+
+        Returns True if the function returned, False if it was stopped.
+        """
+        if cycles is None:
+            cycles = int((ms if ms is not None else 1000) * self.f_cpu / 4000)
+        function = getattr(self.lib, entry)
+        return bool(self.lib.host_run(ctypes.cast(function, ctypes.c_void_p), cycles))
+
+
+def benchmark(target, scenarios):
+    """Time button, LED and Timer0 scenarios and a run of main()"""
+    fw = HostFirmware(target)
+    lib = fw.lib
+    print(f"🔨 Host build: {fw.path.relative_to(PROJECT_ROOT)}")
+
+    if target == "cpp-multi-api":
+        started = time.perf_counter()
+        for i in range(scenarios):
+            fw.reset()
+            button = fw.new()
+            lib.Button_init(button, 0)
+            fw.set_pin("PORTA", 2, i & 1)
+            for _ in range(6):
+                lib.Button_update(button)
+            lib.Button_isPressed(button)
+        elapsed = time.perf_counter() - started
+        print(f"  Button debounce: {scenarios / elapsed:,.0f} scenarios/s")
+
+        started = time.perf_counter()
+        for i in range(scenarios):
+            fw.reset()
+            bank = fw.new()
+            lib.ButtonBank_init(bank)
+            fw.set_register("PORTA", 0xFF & ~(i & 0x16))
+            for _ in range(4):
+                lib.ButtonBank_update(bank)
+            lib.ButtonBank_getState(bank)
+        elapsed = time.perf_counter() - started
+        print(f"  ButtonBank debounce: {scenarios / elapsed:,.0f} scenarios/s")
+
+        started = time.perf_counter()
+        for i in range(scenarios):
+            fw.reset()
+            fw.set_register("TRISC", 0)
+            led = fw.new()
+            lib.Led_init(led, 4)
+            lib.Led_toggle(led)
+        elapsed = time.perf_counter() - started
+        print(f"  LED toggle: {scenarios / elapsed:,.0f} scenarios/s")
+
+        started = time.perf_counter()
+        for i in range(scenarios):
+            fw.reset()
+            fw.set_register("TRISA", 0)
+            fw.set_register("TRISC", 0)
+            group = fw.new()
+            lib.LedGroup_init(group)
+            lib.LedGroup_write(group, i & 0x1F)
+            lib.LedGroup_commit(group)
+        elapsed = time.perf_counter() - started
+        print(f"  LedGroup commit: {scenarios / elapsed:,.0f} scenarios/s")
+
+        fw.reset()
+        timer = fw.new()
+        lib.Timer0_init(timer)
+        lib.Timer0_initialize(timer)
+        start = fw.cycles
+        started = time.perf_counter()
+        lib.Timer0_delay(timer, 200)
+        elapsed = time.perf_counter() - started
+        print(f"  Timer0_delay(200): {(fw.cycles - start) * 4000.0 / fw.f_cpu:.3f} ms virtual "
+              f"in {elapsed * 1e6:.0f} µs")
+    elif target == "multi":
+        fw.reset()
+        lib.TIMER0_Initialize()
+        start = fw.cycles
+        lib.delay_50ms_timer0()
+        print(f"  delay_50ms_timer0(): {(fw.cycles - start) * 4000.0 / fw.f_cpu:.3f} ms virtual")
+
+    fw.reset()
+    if hasattr(lib, "isr"):
+        fw.set_isr("isr")
+    started = time.perf_counter()
+    fw.run("main", ms=10000)
+    elapsed = time.perf_counter() - started
+    print(f"  main(): {fw.elapsed_ms:,.0f} ms virtual in {elapsed * 1000:.1f} ms "
+          f"({fw.state.overflows} Timer0 overflows, {fw.state.interrupts} interrupts)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host-native firmware build and benchmark")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="cpp-multi-api", help="Sources to build")
+    parser.add_argument("--scenarios", type=int, default=10000, help="Scenarios per benchmark")
+    parser.add_argument("--rebuild", action="store_true", help="Force a rebuild")
+    args = parser.parse_args()
+
+    try:
+        if args.rebuild:
+            build_library(args.target, rebuild=True)
+        benchmark(args.target, args.scenarios)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print("✅ Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for the draft/ entry points
+
+Runs `python -X importtime -c "import MODULE"` in a fresh interpreter for
+compile.py and upload.py (best of --repeat runs), reports the cumulative
+import time and the slowest imports behind it, and with --check fails
+when a module exceeds its budget - so a heavy import creeping back to
+module level (xc8_wrapper, ipecmd_wrapper, logbook...) breaks the build.
+tests/test_import_time.py runs the same check under pytest.
+
+Example:
+  python import_time.py
+  python import_time.py --check --budget compile=80
+"""
+
+import sys
+import argparse
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+# Entry points checked by default and their budgets (cumulative import, ms)
+DRAFT_DIR = Path(__file__).resolve().parent
+DEFAULT_BUDGETS_MS = {
+    "compile": 200.0,
+    "upload": 200.0,
+}
+DEFAULT_REPEAT = 5
+DEFAULT_TOP = 5
+
+
+@dataclass
+class ImportEntry:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr):
+    """Entries of -X importtime output, in the order Python prints them"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append(ImportEntry(name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def measure(module, python=sys.executable, cwd=DRAFT_DIR):
+    """Import `module` in a new interpreter: (its entry, entries it pulled in)"""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+        raise RuntimeError(f"import {module}: {error}")
+
+    entries = parse_importtime(result.stderr)
+    # Children are printed before their parent, so the module's own
+    # imports are the entries since the previous top-level one
+    index = max(i for i, entry in enumerate(entries) if entry.name == module and entry.depth == 0)
+    start = index
+    while start > 0 and entries[start - 1].depth > 0:
+        start -= 1
+    return entries[index], entries[start:index]
+
+
+def best_of(module, repeat):
+    runs = [measure(module) for _ in range(repeat)]
+    return min(runs, key=lambda run: run[0].cumulative_us)
+
+
+def parse_budgets(values):
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for value in values or []:
+        module, _, ms = value.partition("=")
+        budgets[module] = float(ms)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget for the draft/ entry points")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: the budgeted ones)")
+    parser.add_argument("--budget", action="append", metavar="MODULE=MS", help="Override a budget")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per module, best is kept")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Slowest imports to list")
+    parser.add_argument("--check", action="store_true", help="Exit with an error when over budget")
+    args = parser.parse_args()
+
+    budgets = parse_budgets(args.budget)
+    over = []
+    failed = False
+    for module in args.modules or list(budgets):
+        try:
+            entry, children = best_of(module, args.repeat)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            failed = True
+            continue
+
+        total_ms = entry.cumulative_us / 1000
+        budget = budgets.get(module)
+        status = "✅" if budget is None or total_ms <= budget else "❌"
+        limit = f" (budget {budget:.0f} ms)" if budget is not None else ""
+        print(f"{status} {module}: {total_ms:.1f} ms{limit}")
+        direct = [child for child in children if child.depth == 1]
+        for child in sorted(direct, key=lambda c: c.cumulative_us, reverse=True)[:args.top]:
+            print(f"    {child.cumulative_us / 1000:7.1f} ms  {child.name}")
+        if status == "❌":
+            over.append(module)
+
+    if args.check and (over or failed):
+        print(f"⚠️ Over budget: {', '.join(over)}" if over else "⚠️ Some modules could not be imported")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,52 @@
 """
 Logging configuration with colorama and logbook
+
+colorama and logbook are imported, and the handler pushed, on the first
+message rather than at import time, so entry points that exit early
+(--version, --help) never pay for them.
+
+Records are not formatted on the calling thread: the handler only puts
+them on a queue, and a background writer formats and writes them in
+batches (one write and flush per batch and sink). Messages below the
+level are dropped by the Logger itself, before a record is even built.
+Code that then writes to stdout itself (print, a wrapper, a child
+process) calls flush() first, so its output follows the log lines
+before it.
+
+Sinks:
+  - colored console output on stdout (always)
+  - JSON lines, one object per record, when PIC_LOG_JSON names a file
+
+Level: PIC_LOG_LEVEL (DEBUG, INFO, WARNING...; default DEBUG), or call
+configure() before the first message.
 """
 
+import os
 import sys
+import json
+import queue
+import atexit
+import threading
 from typing import Dict
 
-from colorama import Fore, Style, init
-from logbook import Logger, LogRecord, StreamHandler
+# Environment configuration
+LEVEL_ENV = "PIC_LOG_LEVEL"
+JSON_ENV = "PIC_LOG_JSON"
+DEFAULT_LEVEL = "DEBUG"
+
+# Records written per batch at most
+BATCH_SIZE = 256
 
-init()  # Initialize colorama
+_STOP = object()
+_logger = None
+_writer = None
+_handler = None
 
 
 class ColoredFormatter:
     def __init__(self) -> None:
+        from colorama import Fore
+
         self.colors: Dict[str, str] = {
             "DEBUG": Fore.CYAN,
             "INFO": Fore.GREEN,
@@ -21,16 +55,174 @@ class ColoredFormatter:
             "CRITICAL": Fore.MAGENTA,
         }
 
-    def format(self, record: LogRecord) -> str:
+    def format(self, record) -> str:
+        from colorama import Style
+
         color = self.colors.get(record.level_name, "")
         return f"{record.time:%H:%M:%S} {color}[{record.level_name}]{Style.RESET_ALL} {record.message}"
 
 
-# Create logger
-log = Logger("XC8Wrapper")
+class ConsoleSink:
+    """Colored lines on a stream"""
+
+    def __init__(self, stream=None) -> None:
+        self.stream = stream or sys.stdout
+        self.formatter = ColoredFormatter()
+
+    def write(self, records) -> None:
+        lines = []
+        for record in records:
+            lines.append(self.formatter.format(record) + "\n")
+            if record.formatted_exception:
+                lines.append(record.formatted_exception + "\n")
+        self.stream.write("".join(lines))
+        self.stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLinesSink:
+    """One JSON object per record, for tools rather than people"""
+
+    def __init__(self, path) -> None:
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, records) -> None:
+        lines = []
+        for record in records:
+            entry = {
+                "time": record.time.isoformat(),
+                "level": record.level_name,
+                "channel": record.channel,
+                "message": record.message,
+            }
+            if record.extra:
+                entry["extra"] = dict(record.extra)
+            if record.formatted_exception:
+                entry["exception"] = record.formatted_exception
+            lines.append(json.dumps(entry, default=str) + "\n")
+        self.file.write("".join(lines))
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class LogWriter:
+    """Background thread writing queued records to the sinks in batches"""
+
+    def __init__(self, sinks, batch_size=BATCH_SIZE) -> None:
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, record) -> None:
+        self.queue.put(record)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [record for record in batch if record is not _STOP]
+            if records:
+                for sink in self.sinks:
+                    try:
+                        sink.write(records)
+                    except Exception as e:  # a broken sink must not stop the others
+                        sys.stderr.write(f"logger: {type(sink).__name__} failed: {e}\n")
+            for _ in batch:
+                self.queue.task_done()
+            if len(records) != len(batch):
+                return
+
+    def flush(self) -> None:
+        """Wait until every queued record is written"""
+        self.queue.join()
 
-# Setup handler with custom formatter
-handler = StreamHandler(sys.stdout)
-formatter = ColoredFormatter()
-handler.formatter = lambda record, handler: formatter.format(record)
-handler.push_application()
+    def close(self) -> None:
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+        for sink in self.sinks:
+            sink.close()
+
+
+def configure(level=None, json_path=None):
+    """Set up the logger: level, console and optional JSON-lines sink
+
+    Called with the environment defaults on the first message; call it
+    earlier to override them.
+    """
+    global _logger, _writer, _handler
+    from colorama import init
+    from logbook import Handler, Logger, lookup_level
+
+    init()  # Initialize colorama
+
+    if _handler is not None:
+        _handler.pop_application()
+    if _writer is not None:
+        _writer.close()
+
+    level = lookup_level((level or os.environ.get(LEVEL_ENV) or DEFAULT_LEVEL).upper())
+    json_path = json_path or os.environ.get(JSON_ENV)
+    sinks = [ConsoleSink()]
+    if json_path:
+        sinks.append(JsonLinesSink(json_path))
+    _writer = LogWriter(sinks)
+
+    class QueueHandler(Handler):
+        """Hands records to the writer thread, nothing is formatted here"""
+
+        def emit(self, record):
+            # Logbook closes the record (clears exc_info, drops the frame)
+            # when handle() returns: pull the lazy fields, traceback
+            # included, while they can still be computed
+            record.pull_information()
+            _ = record.formatted_exception
+            _writer.put(record)
+
+    _handler = QueueHandler(level=level)
+    _handler.push_application()
+
+    # The Logger's own level drops disabled messages before a record exists
+    _logger = Logger("XC8Wrapper", level=level)
+    return _logger
+
+
+def get_logger():
+    """The application logger, set up on first use"""
+    if _logger is None:
+        configure()
+    return _logger
+
+
+def flush():
+    """Write out everything logged so far (e.g. before printing directly)"""
+    if _writer is not None:
+        _writer.flush()
+
+
+@atexit.register
+def _shutdown():
+    if _writer is not None:
+        _writer.close()
+
+
+class _LazyLogger:
+    """Forwards to get_logger(), so `from logger import log` stays cheap"""
+
+    def __getattr__(self, name):
+        return getattr(get_logger(), name)
+
+
+# Create logger
+log = _LazyLogger()
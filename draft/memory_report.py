@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Memory usage report for PIC16F876A builds
+
+Reads the linker map (-Wl,-Map=...) and the XC8 memory summary
+(--memorysummary=build/memory_summary.xml) produced by compile_v2.py and
+SConstruct, and reports per-function flash usage, per-variable RAM usage,
+bank placement and psect usage. Two builds can be diffed to see which
+change ate the space.
+"""
+
+import sys
+import json
+import argparse
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Project configuration
+PROJECT_NAME = "pic_test_project"
+BUILD_DIR = Path("build")
+DEFAULT_MAP_FILE = BUILD_DIR / f"{PROJECT_NAME}.map"
+DEFAULT_SUMMARY_FILE = BUILD_DIR / "memory_summary.xml"
+
+# PIC16F876A memory limits
+FLASH_WORDS = 8192
+RAM_BYTES = 368
+
+# Linker space numbers used in the map file
+SPACE_PROGRAM = 0
+SPACE_DATA = 1
+
+# PIC16 data memory geometry
+BANK_SIZE = 0x80
+COMMON_RAM_START = 0x70
+PAGE_SIZE = 0x800
+
+# Map file section headers (matched on the stripped line)
+_SECTION_HEADERS = {
+    "Name": "psects",
+    "TOTAL": "totals",
+    "SEGMENTS": "segments",
+    "UNUSED ADDRESS RANGES": "unused",
+    "Symbol Table": "symbols",
+}
+
+
+@dataclass
+class Psect:
+    name: str
+    module: str
+    link: int
+    load: int
+    length: int
+    space: int
+
+    @property
+    def end(self):
+        return self.link + self.length
+
+
+@dataclass
+class Symbol:
+    name: str
+    psect: str
+    address: int
+    size: int = 0
+    space: int = SPACE_PROGRAM
+
+    @property
+    def bank(self):
+        """RAM bank (0-3) or 'common' for the shared 0x70-0x7F area"""
+        if (self.address % BANK_SIZE) >= COMMON_RAM_START:
+            return "common"
+        return self.address // BANK_SIZE
+
+    @property
+    def page(self):
+        """Program memory page (2K words per page)"""
+        return self.address // PAGE_SIZE
+
+
+@dataclass
+class MemoryRegion:
+    name: str
+    units: str = ""
+    length: int = 0
+    used: int = 0
+    free: int = 0
+
+
+@dataclass
+class MemoryReport:
+    psects: list = field(default_factory=list)
+    functions: list = field(default_factory=list)
+    variables: list = field(default_factory=list)
+    regions: dict = field(default_factory=dict)
+
+    @property
+    def flash_used(self):
+        region = self.regions.get("program")
+        if region is not None:
+            return region.used
+        return sum(p.length for p in self.psects if p.space == SPACE_PROGRAM)
+
+    @property
+    def ram_used(self):
+        region = self.regions.get("data")
+        if region is not None:
+            return region.used
+        return sum(p.length for p in self.psects if p.space == SPACE_DATA)
+
+    def psect_usage(self):
+        """Total length per psect name (a psect may span several modules)"""
+        usage = {}
+        for psect in self.psects:
+            usage[psect.name] = usage.get(psect.name, 0) + psect.length
+        return usage
+
+    def symbol_sizes(self):
+        """Flat {name: size} mapping used for diffs and the build history"""
+        sizes = {}
+        for sym in self.functions:
+            sizes[f"flash:{sym.name}"] = sym.size
+        for sym in self.variables:
+            sizes[f"ram:{sym.name}"] = sym.size
+        return sizes
+
+    def to_dict(self):
+        return {
+            "flash_used": self.flash_used,
+            "ram_used": self.ram_used,
+            "regions": {
+                name: vars(region) for name, region in self.regions.items()
+            },
+            "psects": self.psect_usage(),
+            "functions": [
+                {"name": s.name, "address": s.address, "size": s.size, "page": s.page}
+                for s in self.functions
+            ],
+            "variables": [
+                {"name": s.name, "address": s.address, "size": s.size, "bank": s.bank}
+                for s in self.variables
+            ],
+        }
+
+
+def _hex(token):
+    return int(token, 16)
+
+
+def parse_map_file(map_file):
+    """Stream an XC8 map file and return (psects, symbols)"""
+    psects = []
+    symbols = []
+    section = None
+    module = ""
+
+    with open(map_file, "r", encoding="utf-8", errors="replace") as f:
+        for raw_line in f:
+            line = raw_line.rstrip("\n")
+            stripped = line.strip()
+            if not stripped:
+                continue
+
+            first = stripped.split(None, 1)[0]
+            if stripped in _SECTION_HEADERS:
+                section = _SECTION_HEADERS[stripped]
+                continue
+            if first in _SECTION_HEADERS and section != "symbols":
+                section = _SECTION_HEADERS[first]
+                continue
+
+            if section == "psects":
+                tokens = stripped.split()
+                # Lines starting in column 0 name the object module
+                if not line[0].isspace():
+                    module = tokens.pop(0)
+                if len(tokens) < 6:
+                    continue
+                try:
+                    psects.append(
+                        Psect(
+                            name=tokens[0],
+                            module=module,
+                            link=_hex(tokens[1]),
+                            load=_hex(tokens[2]),
+                            length=_hex(tokens[3]),
+                            space=int(tokens[5]),
+                        )
+                    )
+                except ValueError:
+                    continue
+
+            elif section == "symbols":
+                tokens = stripped.split()
+                # Symbol table lines hold one or two "name psect address" triples
+                for i in range(0, len(tokens) - 2, 3):
+                    try:
+                        address = _hex(tokens[i + 2])
+                    except ValueError:
+                        break
+                    symbols.append(Symbol(tokens[i], tokens[i + 1], address))
+
+    return psects, symbols
+
+
+def parse_memory_summary(summary_file):
+    """Stream memory_summary.xml and return {region name: MemoryRegion}"""
+    regions = {}
+    current = None
+
+    for event, elem in ET.iterparse(str(summary_file), events=("start", "end")):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if event == "start" and tag == "memory":
+            current = MemoryRegion(name=elem.get("name", ""))
+        elif event == "end" and current is not None:
+            text = (elem.text or "").strip()
+            if tag == "units":
+                current.units = text
+            elif tag in ("length", "used", "free"):
+                try:
+                    setattr(current, tag, int(text, 0))
+                except ValueError:
+                    pass
+            elif tag == "memory":
+                regions[current.name] = current
+                current = None
+            elem.clear()
+
+    return regions
+
+
+def _assign_sizes(symbols, psects_by_name):
+    """Size each symbol from the next symbol (or psect end) in the same psect"""
+    by_psect = {}
+    for sym in symbols:
+        by_psect.setdefault(sym.psect, []).append(sym)
+
+    for psect_name, members in by_psect.items():
+        psect = psects_by_name.get(psect_name)
+        members.sort(key=lambda s: s.address)
+        for current, following in zip(members, members[1:] + [None]):
+            if following is not None:
+                current.size = following.address - current.address
+            elif psect is not None:
+                current.size = max(psect.end - current.address, 0)
+            if psect is not None:
+                current.space = psect.space
+
+
+def build_report(map_file=None, summary_file=None):
+    """Build a MemoryReport from a map file and/or a memory summary"""
+    report = MemoryReport()
+
+    if map_file is not None and Path(map_file).exists():
+        psects, symbols = parse_map_file(map_file)
+        report.psects = psects
+
+        # Psect extents keyed by name, merged across modules
+        psects_by_name = {}
+        for psect in psects:
+            known = psects_by_name.get(psect.name)
+            if known is None:
+                psects_by_name[psect.name] = Psect(**vars(psect))
+            else:
+                end = max(known.end, psect.end)
+                known.link = min(known.link, psect.link)
+                known.length = end - known.link
+
+        # XC8 emits __end_of_<func> markers, which give exact function sizes
+        end_markers = {
+            s.name[len("__end_of"):]: s.address
+            for s in symbols
+            if s.name.startswith("__end_of_")
+        }
+        c_symbols = [
+            s for s in symbols if s.name.startswith("_") and not s.name.startswith("__")
+        ]
+        _assign_sizes(c_symbols, psects_by_name)
+
+        for sym in c_symbols:
+            if sym.space == SPACE_PROGRAM:
+                if sym.name in end_markers:
+                    sym.size = end_markers[sym.name] - sym.address
+                report.functions.append(sym)
+            elif sym.space == SPACE_DATA:
+                report.variables.append(sym)
+
+        report.functions.sort(key=lambda s: s.size, reverse=True)
+        report.variables.sort(key=lambda s: s.size, reverse=True)
+
+    if summary_file is not None and Path(summary_file).exists():
+        report.regions = parse_memory_summary(summary_file)
+
+    return report
+
+
+def diff_reports(old, new):
+    """Return [(name, old size, new size, delta)] sorted by growth"""
+    old_sizes = old.symbol_sizes()
+    new_sizes = new.symbol_sizes()
+    rows = []
+    for name in set(old_sizes) | set(new_sizes):
+        before = old_sizes.get(name, 0)
+        after = new_sizes.get(name, 0)
+        if before != after:
+            rows.append((name, before, after, after - before))
+    rows.sort(key=lambda row: (-row[3], row[0]))
+    return rows
+
+
+def _percent(used, total):
+    return f"{100.0 * used / total:5.1f}%" if total else "  n/a"
+
+
+def print_report(report, top=15):
+    """Print a human readable memory report"""
+    flash_total = report.regions.get("program", MemoryRegion("program")).length or FLASH_WORDS
+    ram_total = report.regions.get("data", MemoryRegion("data")).length or RAM_BYTES
+
+    print("📊 Memory usage:")
+    print(f"  Flash: {report.flash_used:5d} / {flash_total} words ({_percent(report.flash_used, flash_total)})")
+    print(f"  RAM:   {report.ram_used:5d} / {ram_total} bytes ({_percent(report.ram_used, ram_total)})")
+    print()
+
+    if report.functions:
+        print(f"🔧 Functions (top {top} by flash):")
+        for sym in report.functions[:top]:
+            print(f"  {sym.name:32s} {sym.size:5d} words  @0x{sym.address:04X}  page {sym.page}")
+        print()
+
+    if report.variables:
+        print(f"💾 Variables (top {top} by RAM):")
+        for sym in report.variables[:top]:
+            print(f"  {sym.name:32s} {sym.size:5d} bytes  @0x{sym.address:03X}  bank {sym.bank}")
+        print()
+
+    usage = report.psect_usage()
+    if usage:
+        print("📦 Psects:")
+        for name, length in sorted(usage.items(), key=lambda item: -item[1])[:top]:
+            print(f"  {name:32s} {length:5d}")
+        print()
+
+
+def print_diff(old, new):
+    """Print totals and per-symbol differences between two builds"""
+    flash_delta = new.flash_used - old.flash_used
+    ram_delta = new.ram_used - old.ram_used
+    print("📊 Memory diff (old → new):")
+    print(f"  Flash: {old.flash_used} → {new.flash_used} words ({flash_delta:+d})")
+    print(f"  RAM:   {old.ram_used} → {new.ram_used} bytes ({ram_delta:+d})")
+    print()
+
+    rows = diff_reports(old, new)
+    if not rows:
+        print("  No per-symbol changes")
+        return
+
+    for name, before, after, delta in rows:
+        marker = "🔺" if delta > 0 else "🔻"
+        print(f"  {marker} {name:40s} {before:5d} → {after:5d} ({delta:+d})")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="PIC16F876A flash/RAM usage report from map and memory summary"
+    )
+    parser.add_argument(
+        "--map", default=str(DEFAULT_MAP_FILE), help="Linker map file"
+    )
+    parser.add_argument(
+        "--summary", default=str(DEFAULT_SUMMARY_FILE), help="memory_summary.xml file"
+    )
+    parser.add_argument(
+        "--diff-map", help="Map file of the baseline build to diff against"
+    )
+    parser.add_argument(
+        "--diff-summary", help="memory_summary.xml of the baseline build"
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Number of symbols to list"
+    )
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+
+    args = parser.parse_args()
+
+    if not Path(args.map).exists() and not Path(args.summary).exists():
+        print(f"❌ Neither {args.map} nor {args.summary} found - build first")
+        sys.exit(1)
+
+    report = build_report(args.map, args.summary)
+
+    if args.diff_map or args.diff_summary:
+        baseline = build_report(args.diff_map, args.diff_summary)
+        if args.json:
+            print(json.dumps({
+                "old": baseline.to_dict(),
+                "new": report.to_dict(),
+                "diff": diff_reports(baseline, report),
+            }, indent=2))
+        else:
+            print_diff(baseline, report)
+        return
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+pic - build front-end with an optional resident daemon
+
+    python pic.py build [--target multi|cpp-multi] [--chips PIC16F876A,PIC16F877A]
+    python pic.py status
+    python pic.py size [--target ...]
+    python pic.py daemon start|stop|run
+
+Every cold build.py/compile_v2.py/scons run re-discovers XC8, re-globs
+the sources and re-hashes every input. `pic` builds incrementally: each
+object records the digest of its source, the headers it includes
+(transitively) and the flags in build/pic_state.json, and is only
+recompiled when that digest changes; the cpp-multi transpile step is
+skipped the same way.
+
+`--chips` builds the same firmware for several devices in one run: the
+transpile step, dependency scanning and hashing are shared, each chip is
+compiled and linked in parallel into <build dir>/<chip>/, and a table
+gives the size and build time of each.
+
+When the daemon is running (`pic daemon start`), the client only sends
+the request over a Unix socket: the daemon keeps the file hashes (keyed
+by mtime and size, so unchanged files are only stat()ed), the include
+graph, the toolchain path and the imported transpiler in memory, so a
+no-op build is a few stat() calls. It exits after IDLE_TIMEOUT seconds
+without requests. Without a daemon the same build runs in-process.
+
+XC8 is found through xc8_wrapper (get_xc8_tool_path), or taken from the
+PIC_CC environment variable.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+from pathlib import Path
+
+# Project configuration
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BUILD_DIR = PROJECT_ROOT / "build"
+STATE_FILE = BUILD_DIR / "pic_state.json"
+SOCKET_PATH = BUILD_DIR / "pic.sock"
+TARGET_CHIP = "PIC16F876A"
+XC8_VERSION = "3.00"
+OPTIMIZATION_LEVEL = "2"
+IDLE_TIMEOUT = 15 * 60  # seconds
+CC_ENV = "PIC_CC"
+
+COMPILE_FLAGS = [f"-mcpu={TARGET_CHIP}", f"-O{OPTIMIZATION_LEVEL}", "-std=c99", "-Wall", "-D_XTAL_FREQ=4000000UL"]
+
+# Modules shared by every target (globs from the project root)
+COMMON_SOURCES = ["src/common/*.c"]
+
+# Build targets: sources (globs from the project root), output directory,
+# and whether the C++ sources are transpiled first
+TARGETS = {
+    "multi": {
+        "sources": ["src/multi/*.c"],
+        "build_dir": "build",
+        "transpile": False,
+    },
+    "cpp-multi": {
+        "sources": ["src/cpp-multi/generated_c/*.c"],
+        "build_dir": "build/cpp-multi",
+        "transpile": True,
+    },
+}
+DEFAULT_TARGET = "multi"
+PROJECT_NAME = "pic_test_project"
+
+# Inputs of the cpp-multi transpile step (pin_manager.h for the pin tables)
+TRANSPILE_DIR = PROJECT_ROOT / "src" / "cpp-multi"
+TRANSPILE_INPUTS = [
+    "src/cpp-multi/*.hpp",
+    "src/cpp-multi/*.cpp",
+    "src/cpp-multi/manual_transpile.py",
+    "src/cpp-multi/transpile_passes.py",
+    "src/common/*.h",
+]
+
+
+def chip_flags(chip):
+    """COMPILE_FLAGS for another device"""
+    return [f"-mcpu={chip}" if flag.startswith("-mcpu=") else flag for flag in COMPILE_FLAGS]
+
+
+def parse_chips(text):
+    """"PIC16F876A,PIC16F877A" -> ["PIC16F876A", "PIC16F877A"], duplicates dropped"""
+    chips = []
+    for chip in text.split(","):
+        chip = chip.strip().upper()
+        if chip and chip not in chips:
+            chips.append(chip)
+    return chips
+
+
+class BuildError(Exception):
+    """A build step failed"""
+
+
+class Builder:
+    """Incremental build state, kept warm by the daemon"""
+
+    def __init__(self):
+        self.hashes = {}  # path -> ((mtime_ns, size), digest)
+        self.includes = {}  # path -> (digest, [included paths])
+        self.globs = {}  # (directory, pattern) -> (directory mtime_ns, [paths])
+        self.toolchain = None
+        self.transpiler = None
+        self.state = self._load_state()
+        self.started = time.time()
+        self.requests = 0
+        self.last_builds = {}
+
+    # Inputs
+
+    def _load_state(self):
+        try:
+            return json.loads(STATE_FILE.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATE_FILE.write_text(json.dumps(self.state, indent=1))
+
+    def digest(self, path):
+        """Content hash of a file, recomputed only when its stat changes"""
+        import hashlib
+
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self.hashes.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        value = hashlib.sha1(Path(path).read_bytes()).hexdigest()
+        self.hashes[path] = (key, value)
+        return value
+
+    def glob(self, pattern):
+        """Files matching a glob, re-listed only when the directory changes"""
+        directory, _, name = pattern.rpartition("/")
+        folder = PROJECT_ROOT / directory
+        mtime = os.stat(folder).st_mtime_ns
+        cached = self.globs.get(pattern)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        paths = sorted(str(path) for path in folder.glob(name))
+        self.globs[pattern] = (mtime, paths)
+        return paths
+
+    def dependencies(self, source, include_dirs):
+        """The source and every local header it includes, transitively"""
+        import re
+
+        seen, pending = [], [source]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.append(path)
+            digest = self.digest(path)
+            cached = self.includes.get(path)
+            if cached is None or cached[0] != digest:
+                names = re.findall(r'^\s*#\s*include\s+"([^"]+)"', Path(path).read_text(errors="replace"), re.M)
+                found = []
+                for name in names:
+                    for folder in [os.path.dirname(path)] + include_dirs:
+                        candidate = os.path.join(folder, name)
+                        if os.path.exists(candidate):
+                            found.append(candidate)
+                            break
+                cached = (digest, found)
+                self.includes[path] = cached
+            pending.extend(cached[1])
+        return seen
+
+    def inputs_digest(self, paths, extra=()):
+        import hashlib
+
+        digest = hashlib.sha1("\0".join(extra).encode())
+        for path in sorted(paths):
+            digest.update(f"{path}:{self.digest(path)}\n".encode())
+        return digest.hexdigest()
+
+    # Steps
+
+    def cc(self):
+        """XC8 driver path, looked up once"""
+        if self.toolchain is None:
+            if os.environ.get(CC_ENV):
+                self.toolchain = (os.environ[CC_ENV], "from $" + CC_ENV)
+            else:
+                try:
+                    from xc8_wrapper import get_xc8_tool_path
+                except ImportError as e:
+                    raise BuildError(f"Cannot import xc8_wrapper ({e}), set {CC_ENV} to the XC8 driver")
+                path, version = get_xc8_tool_path("cc", XC8_VERSION)
+                self.toolchain = (str(path), str(version))
+        return self.toolchain[0]
+
+    def transpile(self, out):
+        """Regenerate src/cpp-multi/generated_c when the C++ side changed"""
+        import importlib
+        import contextlib
+
+        paths = []
+        for pattern in TRANSPILE_INPUTS:
+            paths += self.glob(pattern)
+        digest = self.inputs_digest(paths)
+        if self.state.get("transpile") == digest:
+            return False
+
+        # Imported once and kept; reloaded when the scripts themselves change
+        if str(TRANSPILE_DIR) not in sys.path:
+            sys.path.insert(0, str(TRANSPILE_DIR))
+        if self.transpiler is None:
+            self.transpiler = importlib.import_module("manual_transpile")
+        else:
+            importlib.reload(sys.modules["transpile_passes"])
+            self.transpiler = importlib.reload(self.transpiler)
+        with contextlib.redirect_stdout(out):
+            self.transpiler.create_manual_transpiled_c()
+        self.state["transpile"] = digest
+        return True
+
+    def run_cc(self, args):
+        """Run the XC8 driver with `args`, output captured"""
+        import subprocess
+
+        try:
+            return subprocess.run([self.cc()] + args, capture_output=True, text=True)
+        except OSError as e:
+            raise BuildError(f"Cannot run {self.cc()} ({e}), check ${CC_ENV} or the XC8 installation")
+
+    @staticmethod
+    def write_diagnostics(result, diagnostics, out):
+        """Write the new diagnostics of a compiler run, one line each
+
+        A failed run also gets the output lines that are not diagnostics
+        (e.g. the linker's undefined references before `collect2: error`).
+        """
+        from xc8_diagnostics import Diagnostic, parse_line
+
+        output = result.stdout + result.stderr
+        records = [record for record in diagnostics.feed_text(output) if isinstance(record, Diagnostic)]
+        for record in records:
+            out.write(f"{record}\n")
+        if result.returncode != 0:
+            for line in output.splitlines():
+                if line.strip() and parse_line(line) is None:
+                    out.write(f"{line}\n")
+
+    def scan(self, sources, include_dirs):
+        """Digest of each source and the headers it includes: {source: digest}"""
+        return {source: self.inputs_digest(self.dependencies(source, include_dirs)) for source in sources}
+
+    def compile(self, scanned, include_dirs, obj_dir, chip, out, diagnostics):
+        """Compile the scanned sources whose inputs changed: (objects, number compiled)"""
+        import hashlib
+
+        flags = chip_flags(chip) + [f"-I{folder}" for folder in include_dirs]
+
+        obj_dir.mkdir(parents=True, exist_ok=True)
+        objects_state = self.state.setdefault("objects", {})
+        objects, compiled = [], 0
+        for source, inputs in scanned.items():
+            obj = str(obj_dir / (Path(source).stem + ".p1"))
+            objects.append(obj)
+            digest = hashlib.sha1("\0".join(flags + [inputs]).encode()).hexdigest()
+            if objects_state.get(obj) == digest and os.path.exists(obj):
+                continue
+            out.write(f"📄 Compiling {os.path.relpath(source, PROJECT_ROOT)}\n")
+            result = self.run_cc(flags + ["-c", "-o", obj, source])
+            self.write_diagnostics(result, diagnostics, out)
+            if result.returncode != 0:
+                objects_state.pop(obj, None)
+                raise BuildError(f"Compilation of {Path(source).name} failed")
+            objects_state[obj] = digest
+            compiled += 1
+        return objects, compiled
+
+    def build_chip(self, chip, build_dir, common, units, out):
+        """Compile and link one device from scanned sources
+
+        `common` and `units` are (scan, include directories) pairs. The
+        src/common modules are compiled once per set of flags into
+        build/common/<flags digest>/ and linked by every target.
+        Returns {"compiled", "linked", "time", "diagnostics"}.
+        """
+        import hashlib
+        from xc8_diagnostics import DiagnosticParser
+
+        started = time.perf_counter()
+        diagnostics = DiagnosticParser()
+        flags = chip_flags(chip)
+        common_scan, common_dirs = common
+        common_key = hashlib.sha1(" ".join(flags + common_dirs).encode()).hexdigest()[:10]
+        common_objects, common_compiled = self.compile(
+            common_scan, common_dirs, BUILD_DIR / "common" / common_key, chip, out, diagnostics
+        )
+        objects, compiled = self.compile(*units, build_dir, chip, out, diagnostics)
+        objects += common_objects
+        compiled += common_compiled
+
+        elf = build_dir / f"{PROJECT_NAME}.elf"
+        link_flags = flags + [f"-Wl,-Map={build_dir / PROJECT_NAME}.map",
+                              f"--memorysummary={build_dir / 'memory_summary.xml'}"]
+        link_digest = self.inputs_digest(objects, link_flags)
+        links_state = self.state.setdefault("links", {})
+        linked = False
+        if compiled or links_state.get(str(elf)) != link_digest or not elf.exists():
+            out.write(f"🔗 Linking {elf.name}\n")
+            result = self.run_cc(link_flags + ["-o", str(elf)] + objects)
+            self.write_diagnostics(result, diagnostics, out)
+            if result.returncode != 0:
+                links_state.pop(str(elf), None)
+                raise BuildError("Linking failed")
+            links_state[str(elf)] = link_digest
+            linked = True
+        return {"compiled": compiled, "linked": linked, "time": time.perf_counter() - started,
+                "diagnostics": diagnostics}
+
+    def build_chips(self, chips, build_dir, common, units, out):
+        """build_chip() for every chip in parallel, into <build_dir>/<chip>/
+
+        Each chip's output is written in order once they are all done,
+        followed by a table of size and time per chip.
+        """
+        import io
+        from concurrent.futures import ThreadPoolExecutor
+
+        outputs = {chip: io.StringIO() for chip in chips}
+        with ThreadPoolExecutor(max_workers=min(len(chips), os.cpu_count() or 1)) as pool:
+            futures = {
+                chip: pool.submit(self.build_chip, chip, build_dir / chip, common, units, outputs[chip])
+                for chip in chips
+            }
+        results, failed = {}, []
+        for chip in chips:
+            out.write(f"── {chip} ──\n{outputs[chip].getvalue()}")
+            try:
+                results[chip] = futures[chip].result()
+            except BuildError as e:
+                failed.append(chip)
+                out.write(f"❌ {chip}: {e}\n")
+        self.write_chip_table(chips, results, build_dir, out)
+        if failed:
+            raise BuildError(f"{len(failed)} of {len(chips)} chip(s) failed: {', '.join(failed)}")
+        return results
+
+    @staticmethod
+    def write_chip_table(chips, results, build_dir, out):
+        from memory_report import build_report
+
+        def usage(used, region):
+            if region is not None and region.length:
+                return f"{used} / {region.length} ({100.0 * used / region.length:.1f}%)"
+            return str(used)
+
+        rows = []
+        for chip in chips:
+            result = results.get(chip)
+            if result is None:
+                rows.append((chip, "failed", "", "", "", ""))
+                continue
+            chip_dir = build_dir / chip
+            report = build_report(chip_dir / f"{PROJECT_NAME}.map", chip_dir / "memory_summary.xml")
+            has_size = report.regions or report.psects
+            rows.append((
+                chip,
+                f"{result['compiled']} compiled" + (", linked" if result["linked"] else ""),
+                f"{result['time'] * 1000:.0f} ms",
+                usage(report.flash_used, report.regions.get("program")) if has_size else "n/a",
+                usage(report.ram_used, report.regions.get("data")) if has_size else "n/a",
+                result["diagnostics"].summary(),
+            ))
+        header = ("Chip", "Objects", "Time", "Flash (words)", "RAM (bytes)", "Diagnostics")
+        widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+        out.write("\n📊 Per-chip results:\n")
+        for row in [header] + rows:
+            out.write("  " + "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() + "\n")
+
+    def build(self, target, out, chips=None):
+        """Transpile, compile the changed objects and link if needed
+
+        With `chips`, transpiling, dependency scanning and hashing are
+        done once and each chip is compiled and linked in parallel into
+        <build dir>/<chip>/ (see build_chips).
+        """
+        config = TARGETS[target]
+        started = time.perf_counter()
+        build_dir = PROJECT_ROOT / config["build_dir"]
+        build_dir.mkdir(parents=True, exist_ok=True)
+
+        if config["transpile"] and self.transpile(out):
+            out.write("🔄 Transpiled src/cpp-multi\n")
+
+        common_sources = []
+        for pattern in COMMON_SOURCES:
+            common_sources += self.glob(pattern)
+        common_dirs = sorted({os.path.dirname(source) for source in common_sources})
+        sources = []
+        for pattern in config["sources"]:
+            sources += self.glob(pattern)
+        include_dirs = sorted({os.path.dirname(source) for source in sources}) + common_dirs
+        common = (self.scan(common_sources, common_dirs), common_dirs)
+        units = (self.scan(sources, include_dirs), include_dirs)
+        self.cc()  # looked up before any build thread needs it
+
+        try:
+            if chips:
+                results = self.build_chips(chips, build_dir, common, units, out)
+            else:
+                results = {TARGET_CHIP: self.build_chip(TARGET_CHIP, build_dir, common, units, out)}
+        except BuildError:
+            self._save_state()
+            raise
+
+        compiled = sum(result["compiled"] for result in results.values())
+        linked = any(result["linked"] for result in results.values())
+        if compiled or linked or config["transpile"]:
+            self._save_state()
+        elapsed = time.perf_counter() - started
+        self.last_builds[target] = {"time": time.time(), "compiled": compiled, "linked": linked}
+        if compiled or linked:
+            out.write(f"✅ {target}: {compiled} object(s) compiled, linked in {elapsed * 1000:.0f} ms\n")
+            diagnostics = results[TARGET_CHIP]["diagnostics"] if not chips else None
+            if diagnostics is not None and diagnostics.diagnostics:
+                out.write(f"🧾 Diagnostics: {diagnostics.summary()}\n")
+        else:
+            out.write(f"✅ {target}: up to date ({elapsed * 1000:.1f} ms)\n")
+
+    def size(self, target, out):
+        import contextlib
+        from memory_report import build_report, print_report
+
+        build_dir = PROJECT_ROOT / TARGETS[target]["build_dir"]
+        map_file = build_dir / f"{PROJECT_NAME}.map"
+        if not map_file.exists():
+            raise BuildError(f"No map file for {target}, build it first")
+        with contextlib.redirect_stdout(out):
+            print_report(build_report(map_file, build_dir / "memory_summary.xml"))
+
+    def status(self, out):
+        out.write(f"Uptime: {time.time() - self.started:.0f} s, {self.requests} request(s)\n")
+        out.write(f"Files hashed: {len(self.hashes)}, include graph: {len(self.includes)} file(s)\n")
+        out.write(f"XC8: {self.toolchain[0] + ' (' + self.toolchain[1] + ')' if self.toolchain else 'not looked up yet'}\n")
+        for target, build in sorted(self.last_builds.items()):
+            when = time.strftime("%H:%M:%S", time.localtime(build["time"]))
+            out.write(f"{target}: built at {when}, {build['compiled']} compiled, "
+                      f"{'linked' if build['linked'] else 'no link'}\n")
+
+    def handle(self, request):
+        """Run one request: {"command": ..., "target": ...} -> (ok, output)"""
+        import io
+
+        self.requests += 1
+        out = io.StringIO()
+        try:
+            command = request.get("command")
+            target = request.get("target") or DEFAULT_TARGET
+            if target not in TARGETS:
+                raise BuildError(f"Unknown target {target!r} (available: {', '.join(TARGETS)})")
+            if command == "build":
+                self.build(target, out, request.get("chips"))
+            elif command == "size":
+                self.size(target, out)
+            elif command == "status":
+                self.status(out)
+            else:
+                raise BuildError(f"Unknown command {command!r}")
+            return True, out.getvalue()
+        except BuildError as e:
+            return False, out.getvalue() + f"❌ {e}\n"
+
+
+# Daemon
+
+
+def serve(idle_timeout=IDLE_TIMEOUT):
+    """Answer requests on SOCKET_PATH until idle for `idle_timeout` seconds"""
+    import threading
+    import socketserver
+
+    builder = Builder()
+    lock = threading.Lock()
+    last_request = [time.monotonic()]
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = json.loads(self.rfile.readline())
+            last_request[0] = time.monotonic()
+            if request.get("command") == "stop":
+                reply = {"ok": True, "output": "Daemon stopped\n"}
+                threading.Thread(target=self.server.shutdown).start()
+            else:
+                with lock:
+                    try:
+                        ok, output = builder.handle(request)
+                    except Exception:  # report it to the client, keep serving
+                        import traceback
+
+                        ok, output = False, traceback.format_exc()
+                reply = {"ok": ok, "output": output}
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+            last_request[0] = time.monotonic()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if SOCKET_PATH.exists():
+        SOCKET_PATH.unlink()
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with Server(str(SOCKET_PATH), Handler) as server:
+        def watch_idle():
+            while time.monotonic() - last_request[0] < idle_timeout:
+                time.sleep(min(idle_timeout, 5))
+            server.shutdown()
+
+        threading.Thread(target=watch_idle, daemon=True).start()
+        try:
+            server.serve_forever()
+        finally:
+            SOCKET_PATH.unlink(missing_ok=True)
+
+
+def request_daemon(request):
+    """Send a request to the daemon; None when no daemon is running"""
+    if not SOCKET_PATH.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(SOCKET_PATH))
+            with client.makefile("rwb") as stream:
+                stream.write((json.dumps(request) + "\n").encode())
+                stream.flush()
+                line = stream.readline()
+    except OSError:
+        return None  # stale socket, or the daemon is shutting down
+    return json.loads(line) if line else None
+
+
+def start_daemon():
+    import subprocess
+
+    if request_daemon({"command": "status"}) is not None:
+        print("✅ Daemon already running")
+        return
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    with open(BUILD_DIR / "pic_daemon.log", "a") as log_file:
+        subprocess.Popen([sys.executable, str(Path(__file__).resolve()), "daemon", "run"],
+                         stdout=log_file, stderr=log_file, stdin=subprocess.DEVNULL,
+                         cwd=PROJECT_ROOT, start_new_session=True)
+    for _ in range(100):
+        if request_daemon({"command": "status"}) is not None:
+            print(f"✅ Daemon started on {SOCKET_PATH}")
+            return
+        time.sleep(0.05)
+    print("❌ Daemon did not start, see build/pic_daemon.log")
+    sys.exit(1)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="pic", description="PIC build front-end")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, text in (("build", "Build a target incrementally"), ("size", "Memory usage of a build")):
+        command = subparsers.add_parser(name, help=text)
+        command.add_argument("--target", choices=sorted(TARGETS), default=DEFAULT_TARGET)
+        command.add_argument("--no-daemon", action="store_true", help="Run in this process")
+    subparsers.choices["build"].add_argument(
+        "--chips", type=parse_chips, help=f"Comma-separated devices to build in parallel (default: {TARGET_CHIP} only)"
+    )
+    status = subparsers.add_parser("status", help="Daemon state")
+    status.add_argument("--no-daemon", action="store_true", help=argparse.SUPPRESS)
+    daemon = subparsers.add_parser("daemon", help="Manage the resident daemon")
+    daemon.add_argument("action", choices=["start", "stop", "run"])
+    daemon.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="Seconds before exiting")
+    args = parser.parse_args()
+
+    if args.command == "daemon":
+        if args.action == "run":
+            serve(args.idle_timeout)
+        elif args.action == "start":
+            start_daemon()
+        else:
+            reply = request_daemon({"command": "stop"})
+            print("✅ Daemon stopped" if reply else "⚠️ No daemon running")
+        return
+
+    request = {
+        "command": args.command,
+        "target": getattr(args, "target", None),
+        "chips": getattr(args, "chips", None),
+    }
+    reply = None if args.no_daemon else request_daemon(request)
+    if reply is None:
+        if args.command == "status":
+            print("⚠️ No daemon running (start it with `pic daemon start`)")
+            return
+        ok, output = Builder().handle(request)
+        reply = {"ok": ok, "output": output}
+    sys.stdout.write(reply["output"])
+    if not reply["ok"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
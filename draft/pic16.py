@@ -0,0 +1,126 @@
+"""
+PIC16 midrange (PIC16F876A) instruction set and register definitions
+
+Shared by the cycle-count estimator and other analysis tools.
+"""
+
+# Special function registers (bank-qualified addresses)
+SFR_ADDRESSES = {
+    "INDF": 0x00,
+    "TMR0": 0x01,
+    "PCL": 0x02,
+    "STATUS": 0x03,
+    "FSR": 0x04,
+    "PORTA": 0x05,
+    "PORTB": 0x06,
+    "PORTC": 0x07,
+    "PCLATH": 0x0A,
+    "INTCON": 0x0B,
+    "PIR1": 0x0C,
+    "PIR2": 0x0D,
+    "TMR1L": 0x0E,
+    "TMR1H": 0x0F,
+    "T1CON": 0x10,
+    "TMR2": 0x11,
+    "T2CON": 0x12,
+    "ADRESH": 0x1E,
+    "ADCON0": 0x1F,
+    "OPTION_REG": 0x81,
+    "TRISA": 0x85,
+    "TRISB": 0x86,
+    "TRISC": 0x87,
+    "PIE1": 0x8C,
+    "PIE2": 0x8D,
+    "PCON": 0x8E,
+    "PR2": 0x92,
+    "ADRESL": 0x9E,
+    "ADCON1": 0x9F,
+}
+
+# Register bit positions used by the project
+SFR_BITS = {
+    # STATUS
+    "C": 0, "DC": 1, "Z": 2, "PD": 3, "TO": 4, "RP0": 5, "RP1": 6, "IRP": 7,
+    # INTCON
+    "RBIF": 0, "INTF": 1, "T0IF": 2, "TMR0IF": 2, "RBIE": 3, "INTE": 4,
+    "T0IE": 5, "TMR0IE": 5, "PEIE": 6, "GIE": 7,
+    # OPTION_REG
+    "PS0": 0, "PS1": 1, "PS2": 2, "PSA": 3, "T0SE": 4, "T0CS": 5,
+    "INTEDG": 6, "RBPU": 7,
+}
+
+# Register file destinations
+DESTINATIONS = {"W": 0, "F": 1}
+
+# Instruction kinds
+NORMAL = "normal"
+SKIP = "skip"
+GOTO = "goto"
+CALL = "call"
+RETURN = "return"
+
+# Mnemonic -> (instruction words, base cycles, kind)
+# Skip instructions take one extra cycle when the skip is taken.
+INSTRUCTIONS = {
+    "ADDWF": (1, 1, NORMAL),
+    "ANDWF": (1, 1, NORMAL),
+    "CLRF": (1, 1, NORMAL),
+    "CLRW": (1, 1, NORMAL),
+    "COMF": (1, 1, NORMAL),
+    "DECF": (1, 1, NORMAL),
+    "DECFSZ": (1, 1, SKIP),
+    "INCF": (1, 1, NORMAL),
+    "INCFSZ": (1, 1, SKIP),
+    "IORWF": (1, 1, NORMAL),
+    "MOVF": (1, 1, NORMAL),
+    "MOVWF": (1, 1, NORMAL),
+    "NOP": (1, 1, NORMAL),
+    "RLF": (1, 1, NORMAL),
+    "RRF": (1, 1, NORMAL),
+    "SUBWF": (1, 1, NORMAL),
+    "SWAPF": (1, 1, NORMAL),
+    "XORWF": (1, 1, NORMAL),
+    "BCF": (1, 1, NORMAL),
+    "BSF": (1, 1, NORMAL),
+    "BTFSC": (1, 1, SKIP),
+    "BTFSS": (1, 1, SKIP),
+    "ADDLW": (1, 1, NORMAL),
+    "ANDLW": (1, 1, NORMAL),
+    "CALL": (1, 2, CALL),
+    "CLRWDT": (1, 1, NORMAL),
+    "GOTO": (1, 2, GOTO),
+    "IORLW": (1, 1, NORMAL),
+    "MOVLW": (1, 1, NORMAL),
+    "RETFIE": (1, 2, RETURN),
+    "RETLW": (1, 2, RETURN),
+    "RETURN": (1, 2, RETURN),
+    "SLEEP": (1, 1, NORMAL),
+    "SUBLW": (1, 1, NORMAL),
+    "XORLW": (1, 1, NORMAL),
+    # pic-as pseudo instructions (expanded for an 8K-word, 4-bank device)
+    "BANKSEL": (2, 2, NORMAL),  # bcf/bsf STATUS,RP0 + bcf/bsf STATUS,RP1
+    "PAGESEL": (2, 2, NORMAL),  # bcf/bsf PCLATH,3 + bcf/bsf PCLATH,4
+    "FCALL": (3, 4, CALL),  # PAGESEL + CALL
+    "LJMP": (3, 4, GOTO),  # PAGESEL + GOTO
+}
+
+# Instructions that write their result to the file register when d=F
+FILE_DESTINATION = {
+    "ADDWF", "ANDWF", "COMF", "DECF", "DECFSZ", "INCF", "INCFSZ",
+    "IORWF", "MOVF", "RLF", "RRF", "SUBWF", "SWAPF", "XORWF",
+}
+
+# Timer0
+TMR0_WRITE_INHIBIT = 2  # TMR0 increment is inhibited for 2 cycles after a write
+
+
+def timer0_prescale(option_reg):
+    """Timer0 clock divider for an OPTION_REG value"""
+    if option_reg & 0x08:  # PSA: prescaler assigned to the WDT
+        return 1
+    return 2 << (option_reg & 0x07)
+
+
+def instruction_cycle_time(f_cpu):
+    """Instruction cycle time in seconds (Fosc/4)"""
+    return 4.0 / f_cpu
@@ -0,0 +1,810 @@
+#!/usr/bin/env python3
+"""
+Cycle-accurate PIC16F876A instruction-set simulator
+
+Loads a built Intel HEX file and runs it on the host, so firmware changes
+can be benchmarked without hardware. Modeled:
+  - the 35 midrange instructions with their exact cycle counts
+  - banked data memory (4 banks, mirrored SFRs and common RAM)
+  - the 8-level hardware stack
+  - PORTA/PORTB/PORTC with TRIS and external pin levels
+  - Timer0 with its prescaler, T0IF and the Timer0 interrupt, including
+    its entry latency
+
+Every program word is predecoded once into a closure returning
+(cycles << 16 | next pc), which keeps the dispatch loop small enough to
+simulate seconds of 4 MHz firmware quickly.
+
+Examples:
+  python pic_sim.py --map build/pic_test_project.map run --seconds 1 --profile
+  python pic_sim.py --elf build/pic_test_project.elf bench
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from pic16 import SFR_ADDRESSES, TMR0_WRITE_INHIBIT, timer0_prescale
+
+# Project configuration
+PROJECT_NAME = "pic_test_project"
+BUILD_DIR = Path("build")
+DEFAULT_HEX_FILE = BUILD_DIR / f"{PROJECT_NAME}.hex"
+DEFAULT_F_CPU = 4000000
+DEFAULT_BENCH_FUNCTIONS = ["Timer0_delay50ms", "Timer0_delay", "Button_update"]
+
+# Device geometry
+PROGRAM_WORDS = 8192
+DATA_SIZE = 512
+STACK_DEPTH = 8
+RESET_VECTOR = 0x0000
+INTERRUPT_VECTOR = 0x0004
+# Cycles from the end of the running instruction to the first ISR
+# instruction: 3 Tcy for a synchronous interrupt such as Timer0
+# (PIC16F87XA datasheet, interrupt latency), Timer0 keeps counting
+INTERRUPT_LATENCY = 3
+CONFIG_WORD_ADDRESS = 0x2007
+
+# Register indexes (canonical data memory addresses)
+INDF = SFR_ADDRESSES["INDF"]
+TMR0 = SFR_ADDRESSES["TMR0"]
+PCL = SFR_ADDRESSES["PCL"]
+STATUS = SFR_ADDRESSES["STATUS"]
+FSR = SFR_ADDRESSES["FSR"]
+PORTA = SFR_ADDRESSES["PORTA"]
+PORTB = SFR_ADDRESSES["PORTB"]
+PORTC = SFR_ADDRESSES["PORTC"]
+PCLATH = SFR_ADDRESSES["PCLATH"]
+INTCON = SFR_ADDRESSES["INTCON"]
+OPTION_REG = SFR_ADDRESSES["OPTION_REG"]
+TRISA = SFR_ADDRESSES["TRISA"]
+TRISB = SFR_ADDRESSES["TRISB"]
+TRISC = SFR_ADDRESSES["TRISC"]
+
+PORTS = {PORTA: TRISA, PORTB: TRISB, PORTC: TRISC}
+
+# STATUS bits
+C_FLAG, DC_FLAG, Z_FLAG = 0x01, 0x02, 0x04
+# INTCON bits
+T0IF_BIT, T0IE_BIT, GIE_BIT = 0x04, 0x20, 0x80
+
+NEVER = float("inf")
+
+
+def _build_alias_table():
+    """Map every banked address to the canonical storage index"""
+    alias = list(range(DATA_SIZE))
+    for bank in range(4):
+        base = bank << 7
+        # Core registers are mirrored in every bank
+        for reg in (INDF, PCL, STATUS, FSR, PCLATH, INTCON):
+            alias[base | reg] = reg
+        # Common RAM 0x70-0x7F is shared by all banks
+        for offset in range(0x70, 0x80):
+            alias[base | offset] = offset
+    # Bank 2/3 mirror TMR0, PORTB, OPTION_REG and TRISB of bank 0/1
+    alias[0x100 | TMR0] = TMR0
+    alias[0x100 | PORTB] = PORTB
+    alias[0x180 | 0x01] = OPTION_REG
+    alias[0x180 | 0x06] = TRISB
+    return alias
+
+
+def load_hex(hex_file):
+    """Load an Intel HEX file into a list of 14-bit program words"""
+    program = [0x3FFF] * PROGRAM_WORDS
+    upper = 0
+    with open(hex_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith(":"):
+                continue
+            record = bytes.fromhex(line[1:])
+            count, address, kind = record[0], (record[1] << 8) | record[2], record[3]
+            data = record[4:4 + count]
+            if kind == 0x01:
+                break
+            if kind == 0x04:
+                upper = (data[0] << 8 | data[1]) << 16
+                continue
+            if kind != 0x00:
+                continue
+            byte_address = upper | address
+            for i in range(0, len(data) - 1, 2):
+                word_address = (byte_address + i) >> 1
+                if word_address < PROGRAM_WORDS:
+                    program[word_address] = (data[i] | (data[i + 1] << 8)) & 0x3FFF
+    return program
+
+
+class PIC16Simulator:
+    """PIC16F876A core with Timer0 and I/O ports"""
+
+    def __init__(self, program, f_cpu=DEFAULT_F_CPU):
+        self.program = list(program)
+        self.f_cpu = f_cpu
+        self.alias = _build_alias_table()
+        self.mem = [0] * DATA_SIZE
+        self.pins = {PORTA: 0xFF, PORTB: 0xFF, PORTC: 0xFF}  # external levels (pull-ups)
+        self.latches = {PORTA: 0, PORTB: 0, PORTC: 0}
+        self.stack = []
+        self.max_stack_depth = 0
+        self.stack_overflows = 0
+        self.w = 0
+        self.pc = RESET_VECTOR
+        self.cycles = 0
+        self.instructions = 0
+        self.halted = False
+        self.trace_ports = False
+
+        self._event = [0]  # next cycle at which _service_events must run
+        self._tmr0_next = NEVER
+        self._tmr0_dirty = True
+        self._tmr0_written = False
+        self._prescale = 1
+        self._hits = []
+        self._hooks = {}
+        self._write_hooks = [None] * DATA_SIZE
+        for reg in (TMR0, OPTION_REG, INTCON):
+            self._write_hooks[reg] = self._timer_changed
+        for port, tris in PORTS.items():
+            self._write_hooks[port] = self._port_written
+            self._write_hooks[tris] = self._port_written
+
+        self.reset()
+        self.code = [self._compile(pc, word) for pc, word in enumerate(self.program)]
+
+    # ------------------------------------------------------------------
+    # State
+
+    def reset(self):
+        """Power-on reset values for the modeled registers"""
+        self.mem[:] = [0] * DATA_SIZE  # in place: predecoded closures hold this list
+        self.mem[STATUS] = 0x18
+        self.mem[OPTION_REG] = 0xFF
+        for tris in PORTS.values():
+            self.mem[tris] = 0xFF
+        for port in PORTS:
+            self.latches[port] = 0
+            self._update_port(port)
+        self.stack = []
+        self.w = 0
+        self.pc = RESET_VECTOR
+        self.cycles = 0
+        self._tmr0_next = NEVER
+        self._tmr0_dirty = True
+        self._event[0] = 0
+
+    def set_pin(self, port, bit, level):
+        """Drive an external pin level (e.g. a button on RA2)"""
+        port = SFR_ADDRESSES.get(port, port)
+        if level:
+            self.pins[port] |= 1 << bit
+        else:
+            self.pins[port] &= ~(1 << bit)
+        self._update_port(port)
+
+    def read_register(self, name):
+        return self.mem[self.alias[SFR_ADDRESSES.get(name, name)]]
+
+    def _update_port(self, port):
+        tris = self.mem[PORTS[port]]
+        self.mem[port] = (self.latches[port] & ~tris | self.pins[port] & tris) & 0xFF
+
+    def _port_written(self, index, value):
+        if index in PORTS:
+            self.latches[index] = value
+            self._update_port(index)
+            if self.trace_ports:
+                self._hits.append(("port", index))
+                self._event[0] = 0
+        else:
+            for port, tris in PORTS.items():
+                if tris == index:
+                    self._update_port(port)
+
+    def _timer_changed(self, index, value):
+        if index == TMR0:
+            self._tmr0_written = True
+        self._tmr0_dirty = True
+        self._event[0] = 0
+
+    # ------------------------------------------------------------------
+    # Events: Timer0, interrupts, hooks
+
+    def _service_events(self):
+        cycles = self.cycles
+        mem = self.mem
+
+        if self._tmr0_dirty:
+            self._tmr0_dirty = False
+            option = mem[OPTION_REG]
+            self._prescale = timer0_prescale(option)
+            if option & 0x20:  # T0CS: external clock, not driven in simulation
+                self._tmr0_next = NEVER
+            elif self._tmr0_written or self._tmr0_next == NEVER:
+                self._tmr0_written = False
+                self._tmr0_next = cycles + TMR0_WRITE_INHIBIT + self._prescale
+
+        self._advance_timer0(cycles)
+
+        intcon = mem[INTCON]
+        if intcon & GIE_BIT and intcon & T0IE_BIT and intcon & T0IF_BIT:
+            mem[INTCON] = intcon & ~GIE_BIT
+            self._push(self.pc)
+            self.pc = INTERRUPT_VECTOR
+            self.cycles = cycles = cycles + INTERRUPT_LATENCY
+            self._advance_timer0(cycles)
+
+        if self._hits:
+            hits, self._hits = self._hits, []
+            for hit in hits:
+                for callback in self._hooks.get(hit, ()):
+                    callback(self)
+
+        self._event[0] = 0 if self.halted else self._tmr0_next
+
+    def _advance_timer0(self, cycles):
+        """Count the Timer0 increments due by `cycles`, setting T0IF on overflow"""
+        mem = self.mem
+        while self._tmr0_next <= cycles:
+            value = (mem[TMR0] + 1) & 0xFF
+            mem[TMR0] = value
+            if value == 0:
+                mem[INTCON] |= T0IF_BIT
+            self._tmr0_next += self._prescale
+
+    def on_execute(self, address, callback):
+        """Call callback(sim) right after the instruction at `address` executes"""
+        key = ("pc", address)
+        if key not in self._hooks:
+            original = self.code[address]
+            event = self._event
+
+            def hooked():
+                self._hits.append(key)
+                event[0] = 0
+                return original()
+
+            self.code[address] = hooked
+        self._hooks.setdefault(key, []).append(callback)
+
+    def on_port_write(self, port, callback):
+        """Call callback(sim) whenever firmware writes PORTx"""
+        self.trace_ports = True
+        self._hooks.setdefault(("port", SFR_ADDRESSES.get(port, port)), []).append(callback)
+
+    def _push(self, address):
+        if len(self.stack) == STACK_DEPTH:
+            self.stack.pop(0)  # circular hardware stack
+            self.stack_overflows += 1
+        self.stack.append(address)
+        if len(self.stack) > self.max_stack_depth:
+            self.max_stack_depth = len(self.stack)
+
+    # ------------------------------------------------------------------
+    # Execution
+
+    def run(self, max_cycles, profile=None, func_of=None):
+        """Run until `max_cycles` more cycles elapsed (or SLEEP)
+
+        With `profile` (a list) and `func_of` (pc -> index), the cycles of
+        each instruction are attributed to profile[func_of[pc]].
+        """
+        code = self.code
+        event = self._event
+        limit = self.cycles + max_cycles
+        pc = self.pc
+        cycles = self.cycles
+        executed = 0
+
+        while cycles < limit:
+            if profile is None:
+                while cycles < limit:
+                    r = code[pc]()
+                    pc = r & 0x1FFF
+                    cycles += r >> 16
+                    executed += 1
+                    if cycles >= event[0]:
+                        break
+            else:
+                while cycles < limit:
+                    r = code[pc]()
+                    profile[func_of[pc]] += r >> 16
+                    pc = r & 0x1FFF
+                    cycles += r >> 16
+                    executed += 1
+                    if cycles >= event[0]:
+                        break
+            self.pc = pc
+            self.cycles = cycles
+            self._service_events()
+            pc = self.pc
+            cycles = self.cycles  # interrupt entry adds its latency
+            if self.halted:
+                break
+
+        self.pc = pc
+        self.cycles = cycles
+        self.instructions += executed
+        return cycles
+
+    def _compile(self, pc, word):
+        """Predecode one program word into a closure"""
+        mem = self.mem
+        alias = self.alias
+        hooks = self._write_hooks
+        sim = self
+        next1 = (1 << 16) | ((pc + 1) & 0x1FFF)
+        skip2 = (2 << 16) | ((pc + 2) & 0x1FFF)
+        f = word & 0x7F
+        dest_f = bool(word & 0x80)
+
+        if f == INDF:
+            def address():
+                return alias[((mem[STATUS] & 0x80) << 1) | mem[FSR]]
+        else:
+            def address():
+                return alias[((mem[STATUS] & 0x60) << 2) | f]
+
+        def read(index):
+            if index == PCL:
+                return (pc + 1) & 0xFF
+            if index == INDF:
+                return 0
+            return mem[index]
+
+        def write(index, value):
+            if index == INDF:
+                return
+            mem[index] = value
+            hook = hooks[index]
+            if hook is not None:
+                hook(index, value)
+
+        def jump_pcl(value):
+            mem[PCL] = value
+            return (2 << 16) | (((mem[PCLATH] & 0x1F) << 8) | value) & 0x1FFF
+
+        def set_z(value):
+            if value:
+                mem[STATUS] &= ~Z_FLAG
+            else:
+                mem[STATUS] |= Z_FLAG
+
+        def set_add_flags(a, b, result):
+            status = mem[STATUS] & ~(C_FLAG | DC_FLAG | Z_FLAG)
+            if result > 0xFF:
+                status |= C_FLAG
+            if (a & 0xF) + (b & 0xF) > 0xF:
+                status |= DC_FLAG
+            if result & 0xFF == 0:
+                status |= Z_FLAG
+            mem[STATUS] = status
+
+        def set_sub_flags(a, b):
+            # a - b, C and DC are "no borrow"
+            status = mem[STATUS] & ~(C_FLAG | DC_FLAG | Z_FLAG)
+            if a >= b:
+                status |= C_FLAG
+            if (a & 0xF) >= (b & 0xF):
+                status |= DC_FLAG
+            if (a - b) & 0xFF == 0:
+                status |= Z_FLAG
+            mem[STATUS] = status
+
+        def store(index, value):
+            """Write an ALU result to W or F, returning the instruction result"""
+            if dest_f:
+                write(index, value)
+                if index == PCL:
+                    return jump_pcl(value)
+            else:
+                sim.w = value
+            return next1
+
+        top = word >> 12
+        # ---- Byte-oriented file register operations -----------------
+        if top == 0:
+            op = (word >> 8) & 0x0F
+            if word & 0x3F80 == 0x0080:  # MOVWF
+                def movwf():
+                    index = address()
+                    write(index, sim.w)
+                    if index == PCL:
+                        return jump_pcl(sim.w)
+                    return next1
+                return movwf
+            if word == 0x0008:  # RETURN
+                def ret():
+                    return (2 << 16) | (sim.stack.pop() if sim.stack else 0)
+                return ret
+            if word == 0x0009:  # RETFIE
+                def retfie():
+                    mem[INTCON] |= GIE_BIT
+                    sim._event[0] = 0
+                    return (2 << 16) | (sim.stack.pop() if sim.stack else 0)
+                return retfie
+            if word == 0x0063:  # SLEEP
+                def sleep():
+                    sim.halted = True
+                    sim._event[0] = 0
+                    return next1
+                return sleep
+            if word & 0x3F9F == 0x0000 or word == 0x0064:  # NOP, CLRWDT
+                return lambda: next1
+            if op == 0x1:
+                if dest_f:  # CLRF
+                    def clrf():
+                        write(address(), 0)
+                        mem[STATUS] |= Z_FLAG
+                        return next1
+                    return clrf
+
+                def clrw():  # CLRW
+                    sim.w = 0
+                    mem[STATUS] |= Z_FLAG
+                    return next1
+                return clrw
+
+            def subwf():
+                index = address()
+                a = read(index)
+                set_sub_flags(a, sim.w)
+                return store(index, (a - sim.w) & 0xFF)
+
+            def decf():
+                index = address()
+                value = (read(index) - 1) & 0xFF
+                set_z(value)
+                return store(index, value)
+
+            def logic(fn):
+                def op_logic():
+                    index = address()
+                    value = fn(read(index), sim.w) & 0xFF
+                    set_z(value)
+                    return store(index, value)
+                return op_logic
+
+            def addwf():
+                index = address()
+                a = read(index)
+                result = a + sim.w
+                set_add_flags(a, sim.w, result)
+                return store(index, result & 0xFF)
+
+            def movf():
+                index = address()
+                value = read(index)
+                set_z(value)
+                return store(index, value)
+
+            def comf():
+                index = address()
+                value = ~read(index) & 0xFF
+                set_z(value)
+                return store(index, value)
+
+            def incf():
+                index = address()
+                value = (read(index) + 1) & 0xFF
+                set_z(value)
+                return store(index, value)
+
+            def decfsz():
+                index = address()
+                value = (read(index) - 1) & 0xFF
+                store(index, value)
+                return skip2 if value == 0 else next1
+
+            def incfsz():
+                index = address()
+                value = (read(index) + 1) & 0xFF
+                store(index, value)
+                return skip2 if value == 0 else next1
+
+            def rrf():
+                index = address()
+                a = read(index)
+                value = (a >> 1) | ((mem[STATUS] & C_FLAG) << 7)
+                mem[STATUS] = (mem[STATUS] & ~C_FLAG) | (a & 1)
+                return store(index, value)
+
+            def rlf():
+                index = address()
+                a = read(index)
+                value = ((a << 1) | (mem[STATUS] & C_FLAG)) & 0xFF
+                mem[STATUS] = (mem[STATUS] & ~C_FLAG) | (a >> 7)
+                return store(index, value)
+
+            def swapf():
+                index = address()
+                a = read(index)
+                return store(index, ((a << 4) | (a >> 4)) & 0xFF)
+
+            return {
+                0x2: subwf,
+                0x3: decf,
+                0x4: logic(lambda a, b: a | b),
+                0x5: logic(lambda a, b: a & b),
+                0x6: logic(lambda a, b: a ^ b),
+                0x7: addwf,
+                0x8: movf,
+                0x9: comf,
+                0xA: incf,
+                0xB: decfsz,
+                0xC: rrf,
+                0xD: rlf,
+                0xE: swapf,
+                0xF: incfsz,
+            }[op]
+
+        # ---- Bit-oriented file register operations ------------------
+        if top == 1:
+            mask = 1 << ((word >> 7) & 0x7)
+            op = (word >> 10) & 0x3
+
+            if op == 0:  # BCF
+                def bcf():
+                    index = address()
+                    value = read(index) & ~mask
+                    write(index, value)
+                    return jump_pcl(value) if index == PCL else next1
+                return bcf
+            if op == 1:  # BSF
+                def bsf():
+                    index = address()
+                    value = read(index) | mask
+                    write(index, value)
+                    return jump_pcl(value) if index == PCL else next1
+                return bsf
+            if op == 2:  # BTFSC
+                return lambda: next1 if read(address()) & mask else skip2
+            return lambda: skip2 if read(address()) & mask else next1  # BTFSS
+
+        # ---- CALL / GOTO ---------------------------------------------
+        if top == 2:
+            k = word & 0x7FF
+            if word & 0x0800 == 0:  # CALL
+                def call():
+                    sim._push((pc + 1) & 0x1FFF)
+                    return (2 << 16) | ((mem[PCLATH] & 0x18) << 8) | k
+                return call
+
+            def goto():
+                return (2 << 16) | ((mem[PCLATH] & 0x18) << 8) | k
+            return goto
+
+        # ---- Literal operations --------------------------------------
+        k = word & 0xFF
+        op = (word >> 8) & 0x3F
+
+        if op & 0x3C == 0x30:  # MOVLW
+            def movlw():
+                sim.w = k
+                return next1
+            return movlw
+        if op & 0x3C == 0x34:  # RETLW
+            def retlw():
+                sim.w = k
+                return (2 << 16) | (sim.stack.pop() if sim.stack else 0)
+            return retlw
+        if op == 0x38:  # IORLW
+            def iorlw():
+                sim.w |= k
+                set_z(sim.w)
+                return next1
+            return iorlw
+        if op == 0x39:  # ANDLW
+            def andlw():
+                sim.w &= k
+                set_z(sim.w)
+                return next1
+            return andlw
+        if op == 0x3A:  # XORLW
+            def xorlw():
+                sim.w ^= k
+                set_z(sim.w)
+                return next1
+            return xorlw
+        if op & 0x3E == 0x3C:  # SUBLW
+            def sublw():
+                set_sub_flags(k, sim.w)
+                sim.w = (k - sim.w) & 0xFF
+                return next1
+            return sublw
+
+        def addlw():  # ADDLW
+            result = sim.w + k
+            set_add_flags(sim.w, k, result)
+            sim.w = result & 0xFF
+            return next1
+        return addlw
+
+    def elapsed_seconds(self):
+        return self.cycles * 4.0 / self.f_cpu
+
+
+# ----------------------------------------------------------------------
+# Symbols and reports
+
+
+def load_symbols(elf_file=None, map_file=None):
+    """Return [(name, start pc, size in words)] from the ELF index or the map"""
+    if elf_file:
+        from elf_index import load_index
+
+        with load_index(elf_file) as index:
+            return list(index.functions())
+    if map_file:
+        from memory_report import build_report
+
+        report = build_report(map_file)
+        return [(s.name, s.address, s.size) for s in report.functions]
+    return []
+
+
+def function_table(symbols):
+    """Build (names, func_of) where func_of[pc] indexes names ('?' for unknown)"""
+    names = ["?"]
+    func_of = [0] * PROGRAM_WORDS
+    for name, start, size in sorted(symbols, key=lambda s: s[1]):
+        names.append(name)
+        for pc in range(start, min(start + max(size, 1), PROGRAM_WORDS)):
+            func_of[pc] = len(names) - 1
+    return names, func_of
+
+
+def find_symbol(symbols, name):
+    for sym_name, start, size in symbols:
+        if sym_name in (name, f"_{name}"):
+            return start, size
+    return None
+
+
+def time_function(sim, program, start, size, results):
+    """Record the cycles of each call to the function at [start, start+size)"""
+    entries = []
+    # Hooks fire after an instruction, so the entry time excludes the first one
+    first = program[start]
+    first_cycles = 2 if first >> 12 == 2 or first in (0x0008, 0x0009) or first & 0x3C00 == 0x3400 else 1
+
+    def entered(s):
+        entries.append((s.cycles - first_cycles, len(s.stack)))
+
+    def returned(s):
+        if entries and len(s.stack) < entries[-1][1]:
+            begin, _ = entries.pop()
+            results.append(s.cycles - begin)
+
+    sim.on_execute(start, entered)
+    for pc in range(start, start + size):
+        word = program[pc]
+        if word in (0x0008, 0x0009) or word & 0x3C00 == 0x3400:  # RETURN/RETFIE/RETLW
+            sim.on_execute(pc, returned)
+
+
+def print_profile(names, profile, total_cycles, f_cpu, top=20):
+    print(f"📊 Cycles per function ({total_cycles:,} cycles, "
+          f"{total_cycles * 4.0 / f_cpu * 1000:,.1f} ms simulated):")
+    ranked = sorted(range(len(names)), key=lambda i: profile[i], reverse=True)
+    for i in ranked[:top]:
+        if profile[i]:
+            print(f"  {names[i]:32s} {profile[i]:12,d}  {100.0 * profile[i] / max(total_cycles, 1):5.1f}%")
+
+
+def cmd_run(args):
+    program = load_hex(args.hex)
+    sim = PIC16Simulator(program, args.f_cpu)
+    symbols = load_symbols(args.elf, args.map)
+    cycles = args.cycles or int(args.seconds * args.f_cpu / 4)
+
+    started = time.perf_counter()
+    if args.profile and symbols:
+        names, func_of = function_table(symbols)
+        profile = [0] * len(names)
+        sim.run(cycles, profile, func_of)
+    else:
+        sim.run(cycles)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Simulated {sim.cycles:,} cycles ({sim.elapsed_seconds() * 1000:,.1f} ms at "
+          f"{args.f_cpu / 1e6:g} MHz) in {elapsed:.2f}s "
+          f"({sim.instructions / max(elapsed, 1e-9) / 1e6:.2f} M instr/s)")
+    print(f"  PC=0x{sim.pc:04X} W=0x{sim.w:02X} max stack depth {sim.max_stack_depth}/{STACK_DEPTH}"
+          + (f" ⚠️  {sim.stack_overflows} stack overflows" if sim.stack_overflows else ""))
+    print(f"  PORTA=0x{sim.mem[PORTA]:02X} PORTB=0x{sim.mem[PORTB]:02X} PORTC=0x{sim.mem[PORTC]:02X}")
+    if args.profile:
+        if not symbols:
+            print("⚠️  No symbols (--elf or --map) - cannot profile per function")
+        else:
+            print()
+            print_profile(names, profile, sim.cycles, args.f_cpu)
+    return 0
+
+
+def cmd_bench(args):
+    """Benchmark suite: loop() period, hot function timings, simulator speed"""
+    program = load_hex(args.hex)
+    sim = PIC16Simulator(program, args.f_cpu)
+    symbols = load_symbols(args.elf, args.map)
+    if not symbols:
+        print("❌ Benchmarks need symbols (--elf or --map)")
+        return 1
+
+    tcy_us = 4e6 / args.f_cpu
+    loop_entries = []
+    loop_symbol = find_symbol(symbols, args.loop)
+    if loop_symbol:
+        sim.on_execute(loop_symbol[0], lambda s: loop_entries.append(s.cycles))
+
+    timings = {}
+    for name in args.function:
+        found = find_symbol(symbols, name)
+        if found:
+            timings[name] = []
+            time_function(sim, program, found[0], found[1], timings[name])
+
+    started = time.perf_counter()
+    sim.run(int(args.seconds * args.f_cpu / 4))
+    elapsed = time.perf_counter() - started
+
+    print(f"🏁 Benchmarks ({args.seconds:g}s of firmware at {args.f_cpu / 1e6:g} MHz)")
+    if len(loop_entries) >= 2:
+        periods = [b - a for a, b in zip(loop_entries, loop_entries[1:])]
+        print(f"  {args.loop}() period: min {min(periods) * tcy_us / 1000:,.3f} ms, "
+              f"max {max(periods) * tcy_us / 1000:,.3f} ms over {len(periods)} iterations")
+    else:
+        print(f"  {args.loop}() period: fewer than 2 iterations observed")
+
+    for name, durations in timings.items():
+        if durations:
+            print(f"  {name}: {len(durations)} calls, min {min(durations):,} / "
+                  f"avg {sum(durations) / len(durations):,.0f} / max {max(durations):,} cycles")
+        else:
+            print(f"  {name}: not called")
+    for name in args.function:
+        if name not in timings:
+            print(f"  {name}: symbol not found")
+
+    print(f"  simulator: {sim.instructions / max(elapsed, 1e-9) / 1e6:.2f} M instr/s, "
+          f"{sim.elapsed_seconds() / max(elapsed, 1e-9):.2f}x real time")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PIC16F876A instruction-set simulator")
+    parser.add_argument("--hex", default=str(DEFAULT_HEX_FILE), help="Intel HEX file to load")
+    parser.add_argument("--elf", help="ELF file for symbols (uses elf_index.py)")
+    parser.add_argument("--map", help="Linker map file for symbols (alternative to --elf)")
+    parser.add_argument("--f-cpu", type=int, default=DEFAULT_F_CPU, help="Oscillator frequency")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run the firmware for N cycles")
+    run.add_argument("--cycles", type=int, help="Instruction cycles to simulate")
+    run.add_argument("--seconds", type=float, default=1.0, help="Firmware time to simulate")
+    run.add_argument("--profile", action="store_true", help="Report cycles per function")
+
+    bench = subparsers.add_parser("bench", help="Run the firmware benchmark suite")
+    bench.add_argument("--seconds", type=float, default=3.0, help="Firmware time to simulate")
+    bench.add_argument("--loop", default="loop", help="Function whose period is measured")
+    bench.add_argument(
+        "--function", action="append",
+        help=f"Function to time per call (repeatable, default: {', '.join(DEFAULT_BENCH_FUNCTIONS)})",
+    )
+
+    args = parser.parse_args()
+    if args.command == "bench" and not args.function:
+        args.function = DEFAULT_BENCH_FUNCTIONS
+
+    if not Path(args.hex).exists():
+        print(f"❌ HEX file not found: {args.hex} - build first")
+        sys.exit(1)
+
+    sys.exit(cmd_run(args) if args.command == "run" else cmd_bench(args))
+
+
+if __name__ == "__main__":
+    main()
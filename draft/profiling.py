@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Stage-level profiling for the build scripts (--profile)
+
+build.py, transpile.py, manual_transpile.py, compile_v2.py and upload.py
+wrap their pipeline stages in `profiler.stage(name)`. Without --profile
+that is a no-op; with it, each stage writes to build/profile/<timestamp>/:
+
+  cprofile:     <script>.<stage>.pstats     (python -m pstats, snakeviz...)
+                <script>.<stage>.collapsed  (flamegraph.pl, speedscope;
+                                             microseconds of own time)
+  tracemalloc:  <script>.<stage>.allocations.txt (top allocation sites)
+                <script>.<stage>.collapsed  (bytes still allocated at the
+                                             end of the stage, per stack)
+
+Stages do not nest. Scripts that run another one (build.py runs
+manual_transpile.py) pass --profile-dir so both write to the same
+directory.
+
+Example:
+  python draft/compile_v2.py --profile
+  python src/cpp-multi/build.py --profile tracemalloc
+  python draft/profiling.py build/profile/20261019-101500/compile_v2.link.pstats
+"""
+
+import sys
+import time
+import contextlib
+from pathlib import Path
+
+# Profiling configuration
+PROFILERS = ["cprofile", "tracemalloc"]
+DEFAULT_PROFILER = "cprofile"
+PROFILE_ROOT = Path(__file__).resolve().parent.parent / "build" / "profile"
+TRACEMALLOC_FRAMES = 32
+TOP_ALLOCATIONS = 25
+
+
+def add_arguments(parser):
+    """Add --profile [cprofile|tracemalloc] and --profile-dir to an argparse parser"""
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=DEFAULT_PROFILER,
+        choices=PROFILERS,
+        help=f"Profile each stage into build/profile/<timestamp>/ (default: {DEFAULT_PROFILER})",
+    )
+    parser.add_argument("--profile-dir", help="Directory for the profiles (default: a new timestamped one)")
+
+
+def new_profile_dir():
+    """build/profile/<timestamp>/, suffixed when two runs start the same second"""
+    path = base = PROFILE_ROOT / time.strftime("%Y%m%d-%H%M%S")
+    count = 1
+    while path.exists():
+        count += 1
+        path = base.with_name(f"{base.name}-{count}")
+    return path
+
+
+def func_name(func):
+    """pstats function key -> frame name for collapsed stacks"""
+    filename, line, name = func
+    if filename == "~":  # built-in
+        return name.strip("<>")
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def collapse_pstats(stats):
+    """Collapsed stacks ("a;b;c <microseconds>") from cProfile statistics
+
+    cProfile only records caller -> callee edges, so a function's time is
+    split between the stacks that reach it in proportion to the time each
+    caller spent in it (what flameprof and gprof2dot do as well).
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    lines = {}
+
+    def visit(func, stack, fraction):
+        own_time = stats[func][2]
+        stack = stack + [func_name(func)]
+        own_us = int(own_time * fraction * 1e6)
+        if own_us:
+            key = ";".join(stack)
+            lines[key] = lines.get(key, 0) + own_us
+        for callee, edge_time in callees.get(func, []):
+            callee_total = stats[callee][3]
+            # Skip recursion, and paths too thin to show up in a flame graph
+            if callee_total and func_name(callee) not in stack and fraction * edge_time >= 1e-6:
+                visit(callee, stack, fraction * edge_time / callee_total)
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            visit(func, [], 1.0)
+    return [f"{stack} {value}" for stack, value in sorted(lines.items())]
+
+
+def collapse_snapshot(snapshot):
+    """Collapsed stacks weighted by the bytes allocated from them"""
+    lines = []
+    for stat in snapshot.statistics("traceback"):
+        frames = [f"{Path(frame.filename).name}:{frame.lineno}" for frame in reversed(stat.traceback)]
+        lines.append(f"{';'.join(frames)} {stat.size}")
+    return lines
+
+
+class StageProfiler:
+    """Profiles named stages of a script; a no-op when `mode` is None"""
+
+    def __init__(self, mode, script, output_dir=None):
+        self.mode = mode
+        self.script = script
+        self.output_dir = Path(output_dir) if output_dir else new_profile_dir()
+        self.written = []
+        self._active = False
+
+    @classmethod
+    def from_args(cls, args, script):
+        return cls(args.profile, script, args.profile_dir)
+
+    def forward_args(self):
+        """Arguments for a child script, profiling into the same directory"""
+        if not self.mode:
+            return []
+        return ["--profile", self.mode, "--profile-dir", str(self.output_dir)]
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if not self.mode or self._active:
+            yield
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / f"{self.script}.{name.replace(':', '-').replace('/', '-')}"
+        self._active = True
+        try:
+            if self.mode == "cprofile":
+                with self._cprofile(base):
+                    yield
+            else:
+                with self._tracemalloc(base):
+                    yield
+        finally:
+            self._active = False
+
+    @contextlib.contextmanager
+    def _cprofile(self, base):
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{base}.pstats")
+            stats = pstats.Stats(profiler).stats
+            Path(f"{base}.collapsed").write_text("\n".join(collapse_pstats(stats)) + "\n")
+            self.written += [Path(f"{base}.pstats"), Path(f"{base}.collapsed")]
+
+    @contextlib.contextmanager
+    def _tracemalloc(self, base):
+        import tracemalloc
+
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            lines = [f"Current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB", ""]
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                frame = stat.traceback[0]
+                lines.append(f"{stat.size / 1024:9.1f} KiB {stat.count:7} blocks  {frame.filename}:{frame.lineno}")
+            Path(f"{base}.allocations.txt").write_text("\n".join(lines) + "\n")
+            Path(f"{base}.collapsed").write_text("\n".join(collapse_snapshot(snapshot)) + "\n")
+            self.written += [Path(f"{base}.allocations.txt"), Path(f"{base}.collapsed")]
+
+    def print_summary(self):
+        if self.written:
+            print(f"⏱️ {len(self.written)} profile file(s) written to {self.output_dir}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the slowest functions of a .pstats profile")
+    parser.add_argument("pstats_file", help="File written by --profile cprofile")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key (default: cumulative)")
+    parser.add_argument("--top", type=int, default=20, help="Functions to list")
+    args = parser.parse_args()
+
+    import pstats
+
+    pstats.Stats(args.pstats_file, stream=sys.stdout).sort_stats(args.sort).print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Persistent programmer session for PIC uploads
+
+Every ipecmd.jar run (ipecmd.sh, upload.py -> program_pic) starts a JVM
+and re-enumerates the programmer, for each --test-programmer, erase,
+program and verify step. A session instead keeps one MPLAB mdb process
+(the interactive command-line debugger shipped with MPLAB X) attached to
+the tool and sends it one command per operation.
+
+The session can be used directly from Python, or held by a small server
+that queues requests from a local Unix socket so several uploads reuse
+it:
+
+    python programmer_session.py serve --tool PK3 &
+    python upload.py --session build/programmer.sock
+    python programmer_session.py run --backend fake test program build/main.hex reset
+
+The fake backend understands the same commands as mdb without hardware
+(Intel HEX is parsed into a memory image), for tests and dry runs. Each
+operation is timed.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import socket
+import argparse
+import threading
+import subprocess
+import socketserver
+from dataclasses import dataclass
+from pathlib import Path
+
+# Default session configuration (same defaults as upload.py)
+DEFAULT_PART = "16F876A"
+DEFAULT_TOOL = "PK3"
+DEFAULT_POWER = "4.875"
+DEFAULT_MDB_PATH = "/opt/microchip/mplabx/v6.20/mplab_platform/bin/mdb.sh"
+DEFAULT_SOCKET = Path("build/programmer.sock")
+
+# upload.py tool names -> mdb hwtool names
+MDB_TOOLS = {
+    "PK3": "PICkit3",
+    "PK4": "PICkit4",
+    "PK5": "PICkit5",
+    "ICD3": "ICD3",
+    "ICD4": "ICD4",
+    "ICD5": "ICD5",
+    "SNAP": "Snap",
+}
+
+# mdb prints this prompt when it is ready for the next command
+MDB_PROMPT = ">"
+MDB_TIMEOUT = 120.0  # seconds, programming a full device included
+
+# Output lines that make an mdb command fail
+MDB_ERRORS = ("error", "failed", "not found", "unable", "invalid")
+
+
+class ProgrammerError(Exception):
+    """A programmer command failed or the session is unusable"""
+
+
+@dataclass
+class OperationTiming:
+    operation: str
+    seconds: float
+    ok: bool
+
+
+# Backends: send one mdb command line, return its output
+
+
+class MdbBackend:
+    """A single mdb process, fed commands on stdin"""
+
+    def __init__(self, mdb_path=DEFAULT_MDB_PATH, timeout=MDB_TIMEOUT):
+        self.mdb_path = mdb_path
+        self.timeout = timeout
+        self.process = None
+        self.output = queue.Queue()
+
+    def start(self):
+        try:
+            self.process = subprocess.Popen(
+                [self.mdb_path],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as e:
+            raise ProgrammerError(f"Cannot start mdb ({self.mdb_path}): {e}")
+        threading.Thread(target=self._read, daemon=True).start()
+        self._wait_prompt()  # JVM startup, paid once per session
+
+    def _read(self):
+        while True:
+            char = self.process.stdout.read(1)
+            if not char:
+                self.output.put(None)
+                return
+            self.output.put(char)
+
+    def _wait_prompt(self):
+        text = ""
+        deadline = time.monotonic() + self.timeout
+        while not (text.rstrip(" ").endswith("\n" + MDB_PROMPT) or text.strip() == MDB_PROMPT):
+            try:
+                char = self.output.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise ProgrammerError(f"mdb did not answer within {self.timeout:.0f} s")
+            if char is None:
+                raise ProgrammerError(f"mdb exited:\n{text}")
+            text += char
+        return text.rstrip(" ")[: -len(MDB_PROMPT)].strip()
+
+    def command(self, line):
+        self.process.stdin.write(line + "\n")
+        self.process.stdin.flush()
+        return self._wait_prompt()
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.stdin.write("quit\n")
+            self.process.stdin.flush()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class FakeBackend:
+    """Stand-in for mdb: same commands, memory image instead of hardware"""
+
+    def __init__(self, startup_delay=0.0, command_delay=0.0):
+        self.startup_delay = startup_delay
+        self.command_delay = command_delay
+        self.device = None
+        self.tool = None
+        self.settings = {}
+        self.memory = {}  # byte address -> value
+        self.resets = 0
+        self.log = []
+
+    def start(self):
+        time.sleep(self.startup_delay)
+
+    def command(self, line):
+        time.sleep(self.command_delay)
+        self.log.append(line)
+        name, _, argument = line.partition(" ")
+        name = name.lower()
+        if name == "device":
+            self.device = argument
+            return ""
+        if name == "set":
+            key, _, value = argument.partition(" ")
+            self.settings[key] = value
+            return ""
+        if name == "hwtool":
+            if self.device is None:
+                return "Error: no device selected"
+            self.tool = argument.split()[0]
+            return f"Now connected to {self.tool}"
+        if name == "program":
+            if self.tool is None:
+                return "Error: no hardware tool selected"
+            path = Path(argument.strip('"'))
+            if not path.exists():
+                return f"Error: {path} not found"
+            try:
+                memory = read_hex(path)
+            except ValueError:
+                memory = {}
+            if not memory:
+                return f"Error: {path} has no Intel HEX data records"
+            self.memory = memory
+            return "Programming target...\nProgram succeeded."
+        if name == "reset":
+            self.resets += 1
+            return ""
+        return f"Error: unknown command {name}"
+
+    def stop(self):
+        self.tool = None
+
+
+def read_hex(path):
+    """Data records of an Intel HEX file: {byte address: value}
+
+    Lines not starting with ":" are skipped, so a file that is not HEX
+    at all gives an empty image; a malformed record raises ValueError.
+    """
+    memory = {}
+    base = 0
+    for line in Path(path).read_text().splitlines():
+        if not line.startswith(":"):
+            continue
+        record = bytes.fromhex(line[1:])
+        count, address, kind = record[0], int.from_bytes(record[1:3], "big"), record[3]
+        data = record[4:4 + count]
+        if kind == 0:
+            for offset, value in enumerate(data):
+                memory[base + address + offset] = value
+        elif kind == 4:
+            base = int.from_bytes(data, "big") << 16
+        elif kind == 1:
+            break
+    return memory
+
+
+class ProgrammerSession:
+    """Programmer operations on a backend that stays attached"""
+
+    def __init__(self, backend, part=DEFAULT_PART, tool=DEFAULT_TOOL, power=DEFAULT_POWER):
+        if tool not in MDB_TOOLS:
+            raise ProgrammerError(f"Unknown tool {tool!r} (available: {', '.join(MDB_TOOLS)})")
+        self.backend = backend
+        self.part = part
+        self.tool = tool
+        self.power = power
+        self.started = False
+        self.connected = False
+        self.timings = []
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self, operation, lines):
+        """Send the commands of one operation, timing it"""
+        with self.lock:
+            start = time.perf_counter()
+            ok = False
+            try:
+                output = []
+                for line in lines:
+                    text = self.backend.command(line)
+                    output.append(text)
+                    failed = [l for l in text.splitlines() if any(e in l.lower() for e in MDB_ERRORS)]
+                    if failed:
+                        raise ProgrammerError(f"{operation}: {failed[0].strip()}")
+                ok = True
+                return "\n".join(t for t in output if t)
+            finally:
+                self.timings.append(OperationTiming(operation, time.perf_counter() - start, ok))
+
+    def start(self):
+        """Start the backend process (JVM startup happens here, once)"""
+        if not self.started:
+            start = time.perf_counter()
+            self.backend.start()
+            self.started = True
+            self.timings.append(OperationTiming("start", time.perf_counter() - start, True))
+
+    def connect(self):
+        """Select the device and attach the programmer (enumerated once)"""
+        self.start()
+        if self.connected:
+            return ""
+        lines = [f"device PIC{self.part}"]
+        if self.power:
+            lines += ["set poweroptions.powerenable true", f"set voltagevalue {self.power}"]
+        lines.append(f"hwtool {MDB_TOOLS[self.tool]} -p")
+        output = self._run("connect", lines)
+        self.connected = True
+        return output
+
+    def test_programmer(self):
+        """Check the programmer answers (attaches it on first use)"""
+        return self.connect()
+
+    def program(self, hex_file):
+        """Erase, program and verify the device from a HEX file"""
+        if not Path(hex_file).exists():
+            raise ProgrammerError(f"{hex_file} not found")
+        self.connect()
+        return self._run("program", [f'program "{Path(hex_file).resolve()}"'])
+
+    def reset(self):
+        """Reset the target so the new firmware runs"""
+        self.connect()
+        return self._run("reset", ["reset"])
+
+    def settings(self):
+        """Part, tool and power the session was started with"""
+        return {"part": self.part, "tool": self.tool, "power": self.power}
+
+    def close(self):
+        if self.started:
+            self.backend.stop()
+        self.started = self.connected = False
+
+    def print_timings(self):
+        print("⏱️ Programmer operations:")
+        for timing in self.timings:
+            status = "✅" if timing.ok else "❌"
+            print(f"  {status} {timing.operation:<10} {timing.seconds * 1000:9.1f} ms")
+
+
+# Session server: one request per line (JSON), answered in order
+
+
+OPERATIONS = {
+    "test": lambda session, request: session.test_programmer(),
+    "program": lambda session, request: session.program(request["file"]),
+    "reset": lambda session, request: session.reset(),
+    "settings": lambda session, request: session.settings(),
+}
+
+
+class _SessionHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request = json.loads(line)
+            session = self.server.session
+            start = time.perf_counter()
+            try:
+                if request.get("op") not in OPERATIONS:
+                    raise ProgrammerError(f"Unknown operation {request.get('op')!r}")
+                output = OPERATIONS[request["op"]](session, request)
+                reply = {"ok": True, "output": output}
+            except (ProgrammerError, KeyError) as e:
+                reply = {"ok": False, "error": str(e)}
+            reply["seconds"] = time.perf_counter() - start
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+
+
+class SessionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves a session on a Unix socket; the session lock queues requests"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, session):
+        self.socket_path = Path(socket_path)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.session = session
+        super().__init__(str(self.socket_path), _SessionHandler)
+
+    def server_close(self):
+        super().server_close()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+class SessionClient:
+    """Talks to a SessionServer, with the same operations as the session"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.socket.connect(str(socket_path))
+        except OSError as e:
+            raise ProgrammerError(f"No programmer session at {socket_path}: {e}")
+        self.stream = self.socket.makefile("rwb")
+        self.timings = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _request(self, operation, **arguments):
+        self.stream.write((json.dumps({"op": operation, **arguments}) + "\n").encode())
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ProgrammerError("Programmer session closed the connection")
+        reply = json.loads(line)
+        self.timings.append(OperationTiming(operation, reply["seconds"], reply["ok"]))
+        if not reply["ok"]:
+            raise ProgrammerError(reply["error"])
+        return reply["output"]
+
+    def test_programmer(self):
+        return self._request("test")
+
+    def program(self, hex_file):
+        return self._request("program", file=str(Path(hex_file).resolve()))
+
+    def reset(self):
+        return self._request("reset")
+
+    def settings(self):
+        return self._request("settings")
+
+    def close(self):
+        self.stream.close()
+        self.socket.close()
+
+    print_timings = ProgrammerSession.print_timings
+
+
+def make_session(args):
+    if args.backend == "fake":
+        backend = FakeBackend()
+    else:
+        backend = MdbBackend(args.mdb_path)
+    return ProgrammerSession(backend, args.part, args.tool, args.power)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent PIC programmer session")
+    parser.add_argument("--part", default=DEFAULT_PART, help=f"Target PIC part (default: {DEFAULT_PART})")
+    parser.add_argument("--tool", default=DEFAULT_TOOL, choices=sorted(MDB_TOOLS), help="Programming tool")
+    parser.add_argument("--power", default=DEFAULT_POWER, help="VDD from the tool, empty for none")
+    parser.add_argument("--backend", choices=["mdb", "fake"], default="mdb", help="Programmer backend")
+    parser.add_argument("--mdb-path", default=os.environ.get("MDB_PATH", DEFAULT_MDB_PATH), help="mdb.sh/mdb.bat")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Hold a session and serve it on a Unix socket")
+    serve.add_argument("--socket", type=Path, default=DEFAULT_SOCKET, help="Socket path")
+
+    run = subparsers.add_parser("run", help="Run operations in one session: test, program FILE, reset")
+    run.add_argument("operations", nargs="+", help="Operations, in order")
+    args = parser.parse_args()
+
+    session = make_session(args)
+    try:
+        if args.command == "serve":
+            # Stopped with kill: exit through the cleanup below
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+            session.connect()
+            with SessionServer(args.socket, session) as server:
+                print(f"🔌 Programmer session on {args.socket} (Ctrl+C to stop)")
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+        else:
+            operations = iter(args.operations)
+            for operation in operations:
+                if operation == "test":
+                    session.test_programmer()
+                elif operation == "program":
+                    session.program(next(operations))
+                elif operation == "reset":
+                    session.reset()
+                else:
+                    raise ProgrammerError(f"Unknown operation {operation!r}")
+            session.print_timings()
+    except (ProgrammerError, StopIteration) as e:
+        print(f"❌ {'program needs a HEX file' if isinstance(e, StopIteration) else e}")
+        session.print_timings()
+        sys.exit(1)
+    finally:
+        session.close()
+
+    print("✅ Done")
+
+
+if __name__ == "__main__":
+    main()
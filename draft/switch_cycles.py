@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Cycles saved by lowering pin switches to lookup tables
+
+transpile_passes.lower_pin_switches turns the `switch (self->ledId)`
+compare chains of Led/Button into port address/bit mask tables. This
+script measures what that buys on the device:
+
+  1. transpiles the cpp-multi classes twice with manual_transpile.py,
+     the full out-of-line API with no pass ("switch") and with only the
+     switches pass ("table", what the cpp-multi-api host build uses)
+  2. compiles each with XC8, main.c replaced by a driver calling every
+     lowered function (XC8 drops functions that are never called)
+  3. reads the worst-case cycles of those functions from the assembly
+     listing with cycle_count.py and prints them side by side
+
+XC8 is found through xc8_wrapper, or taken from the PIC_CC environment
+variable.
+
+Example:
+  python switch_cycles.py
+  python switch_cycles.py --flags="-mcpu=PIC16F877A -O2 -std=c99"
+"""
+
+import sys
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+
+from cycle_count import Estimator, parse_source
+from header_cache import find_cc
+
+# Project configuration
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CPP_MULTI_DIR = PROJECT_ROOT / "src" / "cpp-multi"
+COMMON_DIR = PROJECT_ROOT / "src" / "common"
+OUTPUT_DIR = PROJECT_ROOT / "build" / "switch_cycles"
+DEFAULT_FLAGS = ["-mcpu=PIC16F876A", "-O2", "-std=c99", "-D_XTAL_FREQ=4000000UL"]
+
+# Variant -> manual_transpile.py arguments
+VARIANTS = {
+    "switch": ["--no-optimize"],
+    "table": ["--passes", "switches"],
+}
+
+sys.path.insert(0, str(CPP_MULTI_DIR))
+from transpile_passes import find_functions, lower_pin_switches  # noqa: E402
+
+
+def transpile(variant):
+    """Sources of a variant in OUTPUT_DIR/<variant>/src"""
+    source_dir = OUTPUT_DIR / variant / "src"
+    if source_dir.exists():
+        shutil.rmtree(source_dir)
+    command = [sys.executable, str(CPP_MULTI_DIR / "manual_transpile.py"), "--output", str(source_dir)]
+    result = subprocess.run(command + VARIANTS[variant], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Transpiling the {variant} variant failed:\n{result.stdout}{result.stderr}")
+    return source_dir
+
+
+def lowered_functions(source_dir):
+    """(function, enum, cases) the switches pass lowers in these sources"""
+    files = {path.name: path.read_text() for path in sorted(source_dir.glob("*.[ch]"))}
+    headers = {path.name: path.read_text() for path in COMMON_DIR.glob("*.h")}
+    return lower_pin_switches(files, headers)
+
+
+def write_driver(source_dir, functions):
+    """Replace main.c with a loop calling each function on a static instance
+
+    Returns the functions the driver calls; only `self`-only methods can
+    be called without knowing what their other arguments mean.
+    """
+    definitions = {}
+    for path in source_dir.glob("*.c"):
+        for function in find_functions(path.read_text()):
+            definitions[function.name] = function
+
+    instances, calls, called = [], [], []
+    for name in functions:
+        function = definitions.get(name)
+        cls = name.split("_", 1)[0]
+        if function is None or function.param_names != ["self"]:
+            print(f"⚠️ {name}: not a self-only method, skipped")
+            continue
+        instance = f"bench{cls}"
+        if f"static {cls} {instance};" not in instances:
+            instances.append(f"static {cls} {instance};")
+        if function.head.strip() == "void":
+            calls.append(f"        {name}(&{instance});")
+        else:
+            calls.append(f"        sink = (unsigned char){name}(&{instance});")
+        called.append(name)
+
+    includes = "\n".join(f'#include "{path.name}"' for path in sorted(source_dir.glob("*.h")))
+    (source_dir / "main.c").write_text(
+        "// Benchmark driver written by draft/switch_cycles.py\n"
+        "#include <xc.h>\n"
+        f"{includes}\n\n"
+        + "\n".join(instances)
+        + "\nvolatile unsigned char sink;\n\n"
+        "void main(void) {\n"
+        "    for (;;) {\n"
+        + "\n".join(calls)
+        + "\n    }\n}\n"
+    )
+    return called
+
+
+def build(cc, flags, variant, source_dir):
+    """Compile and link a variant, returning its assembly listing"""
+    build_dir = source_dir.parent
+    elf = build_dir / "bench.elf"
+    command = [cc] + flags + [f"-I{source_dir}", f"-I{COMMON_DIR}", "-fasmfile", "-Wa,-a", "-o", str(elf)]
+    command += [str(path) for path in sorted(source_dir.glob("*.c")) + sorted(COMMON_DIR.glob("*.c"))]
+    result = subprocess.run(command, capture_output=True, text=True, cwd=build_dir)
+    if result.returncode != 0:
+        raise RuntimeError(f"Building the {variant} variant failed:\n{result.stdout}{result.stderr}")
+    listings = sorted(build_dir.glob("*.lst")) or sorted(build_dir.glob("*.s"))
+    if not listings:
+        raise RuntimeError(f"No assembly listing (.lst/.s) written in {build_dir}")
+    return listings[0]
+
+
+def wcet(estimator, name):
+    """Worst-case cycles of a function, or None when unbounded/missing"""
+    try:
+        return estimator.timing(name).wcet
+    except KeyError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cycles saved by the pin switch lookup tables")
+    parser.add_argument("--flags", default=" ".join(DEFAULT_FLAGS), help="XC8 compile flags")
+    args = parser.parse_args()
+
+    try:
+        cc = find_cc()
+        estimators, cases = {}, {}
+        for variant in VARIANTS:
+            print(f"🔄 Transpiling the {variant} variant")
+            source_dir = transpile(variant)
+            if variant == "switch":
+                lowered = lowered_functions(source_dir)
+                if not lowered:
+                    print("❌ No pin switch to lower")
+                    sys.exit(1)
+                cases = {function: (enum, count) for function, enum, count in lowered}
+            called = write_driver(source_dir, list(cases))
+            print(f"🔨 Building the {variant} variant")
+            estimators[variant] = Estimator(parse_source(build(cc, args.flags.split(), variant, source_dir)))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print()
+    print(f"⏱️ Worst-case cycles ({args.flags})")
+    print(f"  {'Function':28s} {'Cases':>12s} {'switch':>7s} {'table':>7s} {'saved':>7s}")
+    for name in called:
+        enum, count = cases[name]
+        before, after = wcet(estimators["switch"], name), wcet(estimators["table"], name)
+        if before is None or after is None:
+            print(f"  {name:28s} {f'{count} {enum}':>12s} {before or 'n/a':>7} {after or 'n/a':>7} {'n/a':>7s}")
+            continue
+        print(f"  {name:28s} {f'{count} {enum}':>12s} {before:7d} {after:7d} {before - after:+7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,8 @@ This script calls ipecmd-wrapper
 
 from pathlib import Path
 import typer
-from logger import log
-
-# Import ipecmd_wrapper directly to avoid subprocess
-from ipecmd_wrapper.core import program_pic
+from logger import flush as flush_log, log
+from profiling import PROFILERS, StageProfiler
 
 # Version information
 __version__ = "0.1.0"
@@ -58,12 +56,45 @@ DEFAULT_TEST_PROGRAMMER = False
 DEFAULT_ERASE = False
 DEFAULT_VERIFY = ""
 DEFAULT_IPECMD_PATH = ""
+DEFAULT_SESSION = ""
+DEFAULT_PROFILE = ""
 
 
 # Create the Typer app
 app = typer.Typer(help="Upload script for PIC microcontrollers")
 
 
+def upload_with_session(socket_path: str, file: str, test_programmer: bool, requested: dict):
+    """Upload through a running programmer_session.py server
+
+    The session already holds the JVM and the attached programmer, so no
+    startup or enumeration is paid here. Programming erases and verifies
+    the device. The part, tool and power are the session's: `requested`
+    settings that differ from them are reported, not applied.
+    """
+    from programmer_session import ProgrammerError, SessionClient
+
+    log.debug(f"Programming {file} through the session at {socket_path}")
+    try:
+        with SessionClient(socket_path) as client:
+            settings = client.settings()
+            for name, value in requested.items():
+                if str(value) != str(settings.get(name)):
+                    log.warning(
+                        f"⚠ --{name} {value} ignored: the session uses {name} {settings.get(name)} "
+                        f"(restart programmer_session.py to change it)"
+                    )
+            if test_programmer:
+                client.test_programmer()
+            client.program(file)
+            for timing in client.timings:
+                log.info(f"  {timing.operation}: {timing.seconds * 1000:.0f} ms")
+        log.info("✓ Upload successful")
+    except ProgrammerError as e:
+        log.error(f"✗ Upload failed: {e}")
+        raise typer.Exit(1)
+
+
 def version_callback(value: bool):
     """Show version information"""
     if value:
@@ -112,6 +143,16 @@ def main(
         "--verify",
         help="Verify Device memory regions (P=Program, E=EEPROM, I=ID, C=Configuration, B=Boot, A=Auxiliary)",
     ),
+    session: str = typer.Option(
+        DEFAULT_SESSION,
+        "--session",
+        help="Socket of a running programmer_session.py server (reuses its programmer connection)",
+    ),
+    profile: str = typer.Option(
+        DEFAULT_PROFILE,
+        "--profile",
+        help=f"Profile the upload stages ({' or '.join(PROFILERS)}) into build/profile/<timestamp>/",
+    ),
     version: bool = typer.Option(
         False,
         "--version",
@@ -123,6 +164,17 @@ def main(
     """Upload HEX file to PIC microcontroller using ipecmd-wrapper"""
     log.info("=== UPLOAD HEX FILE TO PIC ===")
 
+    if profile and profile not in PROFILERS:
+        raise typer.BadParameter(f"expected one of: {', '.join(PROFILERS)}", param_hint="--profile")
+    profiler = StageProfiler(profile or None, "upload")
+
+    if session:
+        with profiler.stage("session"):
+            upload_with_session(session, file, test_programmer, {"part": part, "tool": tool, "power": power})
+        flush_log()
+        profiler.print_summary()
+        return
+
     # Create Args object for ipecmd_wrapper.core.program_pic
     args = Args(
         part=part,
@@ -140,8 +192,14 @@ def main(
     log.debug(f"Programming PIC {part} with {tool} using {file}")
 
     try:
-        # Call ipecmd_wrapper directly instead of subprocess
-        program_pic(args)
+        with profiler.stage("program"):
+            # Imported here: --version/--help do not need ipecmd-wrapper
+            from ipecmd_wrapper.core import program_pic
+
+            # Call ipecmd_wrapper directly instead of subprocess; it prints
+            # to stdout itself, so the queued log lines go out first
+            flush_log()
+            program_pic(args)
         log.info("✓ Upload successful")
     except SystemExit as e:
         if e.code != 0:
@@ -152,6 +210,9 @@ def main(
     except Exception as e:
         log.error(f"✗ Error running upload: {e}")
         raise typer.Exit(1)
+    finally:
+        flush_log()
+        profiler.print_summary()
 
 
 if __name__ == "__main__":
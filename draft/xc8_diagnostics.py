@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for xc8-cc diagnostics
+
+Turns the compiler's output, one line at a time, into records as they
+arrive instead of a text blob at the end of the run:
+
+  Diagnostic   file, line, column, severity, code, message - from the Clang
+               front end (main.c:12:5: warning: ... [-Wunused-variable])
+               and the XC8 back end (main.c:45:: warning: (520) ...,
+               :: advisory: (1510) ...), and the ones of the driver
+               itself (xc8-cc: error: no input files, error: (1347) ...)
+  MemoryUsage  one line of the "Memory Summary" printed by the link step
+
+Identical diagnostics (a warning in a header included by every unit) are
+reported once and counted. Only the records are kept, so a long build
+log is never held in memory.
+
+Example:
+  python xc8_diagnostics.py build.log
+  xc8-cc ... 2>&1 | python xc8_diagnostics.py --json
+"""
+
+import re
+import sys
+import json
+import argparse
+import subprocess
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+# Severities, most severe first
+SEVERITIES = ["fatal error", "error", "warning", "advisory", "remark", "note"]
+ERROR_SEVERITIES = {"fatal error", "error"}
+
+SEVERITY_ICONS = {
+    "fatal error": "❌",
+    "error": "❌",
+    "warning": "⚠️",
+    "advisory": "ℹ️",
+    "remark": "ℹ️",
+    "note": "  ↳",
+}
+
+_SEVERITY = "|".join(SEVERITIES)
+# main.c:12:5: warning: unused variable 'x' [-Wunused-variable]
+CLANG_RE = re.compile(
+    rf"^(?P<file>(?:[A-Za-z]:)?[^:]+):(?P<line>\d+):(?:(?P<column>\d+):)? "
+    rf"(?P<severity>{_SEVERITY}): (?P<message>.*?)(?: \[(?P<flag>-W[^\]]+)\])?$"
+)
+# main.c:45:: warning: (520) function "_foo" is never called
+# :: advisory: (1510) non-reentrant function "_bar" appears in multiple call graphs
+XC8_RE = re.compile(
+    rf"^(?P<file>(?:[A-Za-z]:)?[^:]*):(?P<line>\d*):(?P<column>\d*):? ?"
+    rf"(?P<severity>{_SEVERITY}): \((?P<code>\d+)\) (?P<message>.*)$"
+)
+# xc8-cc: error: no input files
+# error: (1347) can't find 0x12 words (0x12 withtotal) for psect "text" in class "CODE"
+TOOL_RE = re.compile(
+    rf"^(?:(?P<tool>(?:[A-Za-z]:)?[^:\s]+): )?(?P<severity>{_SEVERITY}): "
+    rf"(?:\((?P<code>\d+)\) )?(?P<message>.*)$"
+)
+# (908) exit status = 1
+STATUS_RE = re.compile(r"^\((?P<code>\d+)\) (?P<message>exit status = \d+)$")
+# Message codes XC8 keeps in front of Clang-style messages
+CODE_RE = re.compile(r"^\((?P<code>\d+)\) (?P<message>.*)$")
+# Program space        used   1A4h (   420) of  2000h words   (  5.1%)
+MEMORY_RE = re.compile(
+    r"^\s*(?P<space>Program space|Data space|EEPROM space|Configuration bits|ID Location space)"
+    r"\s+used\s+[0-9A-Fa-f]+h\s+\(\s*(?P<used>\d+)\)\s+of\s+(?P<total>[0-9A-Fa-f]+)h\s+(?P<unit>\w+)"
+)
+
+
+@dataclass
+class Diagnostic:
+    severity: str
+    message: str
+    file: str = ""
+    line: Optional[int] = None
+    column: Optional[int] = None
+    code: str = ""
+    count: int = 1
+
+    @property
+    def key(self):
+        return (self.file, self.line, self.column, self.severity, self.code, self.message)
+
+    @property
+    def is_error(self):
+        return self.severity in ERROR_SEVERITIES
+
+    def __str__(self):
+        location = self.file
+        if self.line is not None:
+            location += f":{self.line}" + (f":{self.column}" if self.column is not None else "")
+        code = f" ({self.code})" if self.code else ""
+        return f"{SEVERITY_ICONS.get(self.severity, '')} {location + ': ' if location else ''}{self.severity}{code}: {self.message}"
+
+
+@dataclass
+class MemoryUsage:
+    space: str
+    used: int
+    total: int
+    unit: str
+
+    @property
+    def percent(self):
+        return 100.0 * self.used / self.total if self.total else 0.0
+
+    def __str__(self):
+        return f"📊 {self.space}: {self.used} / {self.total} {self.unit} ({self.percent:.1f}%)"
+
+
+def _int(value):
+    return int(value) if value else None
+
+
+def parse_line(line):
+    """Record for one output line, or None"""
+    line = line.rstrip("\r\n")
+    match = XC8_RE.match(line)
+    if match:
+        return Diagnostic(
+            severity=match["severity"],
+            message=match["message"],
+            file=match["file"],
+            line=_int(match["line"]),
+            column=_int(match["column"]),
+            code=match["code"],
+        )
+    match = CLANG_RE.match(line)
+    if match:
+        message, code = match["message"], match["flag"] or ""
+        numbered = CODE_RE.match(message)
+        if numbered:
+            message, code = numbered["message"], numbered["code"]
+        return Diagnostic(
+            severity=match["severity"],
+            message=message,
+            file=match["file"],
+            line=int(match["line"]),
+            column=_int(match["column"]),
+            code=code,
+        )
+    match = TOOL_RE.match(line)
+    if match:
+        return Diagnostic(
+            severity=match["severity"],
+            message=match["message"],
+            file=match["tool"] or "",
+            code=match["code"] or "",
+        )
+    match = STATUS_RE.match(line.strip())
+    if match:
+        return Diagnostic(severity="error", message=match["message"], code=match["code"])
+    match = MEMORY_RE.match(line)
+    if match:
+        return MemoryUsage(match["space"], int(match["used"]), int(match["total"], 16), match["unit"])
+    return None
+
+
+class DiagnosticParser:
+    """Incremental parser: feed() lines, get new records back
+
+    Duplicates are not returned again, their `count` goes up instead.
+    """
+
+    def __init__(self):
+        self.diagnostics = {}  # key -> Diagnostic, in arrival order
+        self.memory = {}  # space -> MemoryUsage, last one wins
+
+    def feed(self, line):
+        """New record for `line`, or None (no record, or a duplicate)"""
+        record = parse_line(line)
+        if isinstance(record, MemoryUsage):
+            self.memory[record.space] = record
+            return record
+        if record is None:
+            return None
+        known = self.diagnostics.get(record.key)
+        if known is not None:
+            known.count += 1
+            return None
+        self.diagnostics[record.key] = record
+        return record
+
+    def feed_text(self, text):
+        """New records for a block of output"""
+        return [record for record in map(self.feed, text.splitlines()) if record is not None]
+
+    def counts(self):
+        counts = {}
+        for diagnostic in self.diagnostics.values():
+            counts[diagnostic.severity] = counts.get(diagnostic.severity, 0) + 1
+        return counts
+
+    @property
+    def errors(self):
+        return [d for d in self.diagnostics.values() if d.is_error]
+
+    def summary(self):
+        counts = self.counts()
+        parts = [f"{counts[severity]} {severity}(s)" for severity in SEVERITIES if severity in counts]
+        duplicates = sum(d.count - 1 for d in self.diagnostics.values())
+        if duplicates:
+            parts.append(f"{duplicates} duplicate(s) hidden")
+        return ", ".join(parts) if parts else "no diagnostics"
+
+
+def stream_command(args, parser=None, on_record=None, on_line=None, cwd=None):
+    """Run a command, parsing its merged stdout/stderr as it is produced
+
+    `on_record(record)` is called for each new record, `on_line(line)` for
+    every raw line. Returns the exit code; the records are in `parser`.
+    """
+    parser = parser if parser is not None else DiagnosticParser()
+    process = subprocess.Popen(
+        [str(arg) for arg in args],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        bufsize=1,
+    )
+    with process.stdout:
+        for line in process.stdout:
+            if on_line:
+                on_line(line.rstrip("\n"))
+            record = parser.feed(line)
+            if record is not None and on_record:
+                on_record(record)
+    return process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Structured xc8-cc diagnostics from a build log")
+    parser.add_argument("log", nargs="?", help="Log file (default: stdin)")
+    parser.add_argument("--json", action="store_true", help="One JSON object per record")
+    args = parser.parse_args()
+
+    diagnostics = DiagnosticParser()
+    stream = open(args.log, errors="replace") if args.log else sys.stdin
+    with stream:
+        for line in stream:
+            record = diagnostics.feed(line)
+            if record is None:
+                continue
+            if args.json:
+                print(json.dumps({"type": type(record).__name__, **asdict(record)}), flush=True)
+            else:
+                print(record, flush=True)
+    if not args.json:
+        print(f"Summary: {diagnostics.summary()}")
+    if diagnostics.errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@
  * @brief Main features:
  * - LED blinking on PORTC RC2 every 500ms
  * - Uses Timer0 with prescaler 1:256 for timing
+ * - DELAY_500MS is generated cycle-exact by draft/delay_gen.py
  * - External 4MHz crystal oscillator
  * - Port configuration with detailed documentation
  * 
@@ -41,15 +42,6 @@
 ; Configuration bits - EXTERNAL 4MHz CRYSTAL
     CONFIG FOSC=HS, WDTE=OFF, PWRTE=OFF, BOREN=ON, LVP=OFF, CPD=OFF, WRT=OFF, CP=OFF
 
-/**
- * @brief Variable definitions in bank 0
- * @details RAM variables used by the application
- * @note Located in unbanked RAM for easy access
- */
-; Variable definitions
-PSECT udata_bank0
-OVERFLOW_COUNT: DS 1        ; Counter for Timer0 overflows
-
 /**
  * @brief LED pin definitions
  * @details Define bit positions for each LED on their respective ports
@@ -174,42 +166,42 @@ MAIN_LOOP:
 
 /**
  * @brief 500ms delay function using Timer0
- * @details Uses Timer0 with prescaler 1:256 for timing
- * @note External crystal 4MHz, prescaler 1:256
- * @note Timer0 overflow every ~65ms, so need ~8 overflows
- * @param OVERFLOW_COUNT: Number of Timer0 overflows to wait
- * @return None
- * @warning Timing depends on oscillator frequency
+ * @details Counts Timer0 overflows from a TMR0 preload, then pads the
+ *          remainder with a counted loop: exactly 500000 cycles at 4MHz,
+ *          CALL and RETURN included
+ * @note Generated by draft/delay_gen.py - rerun the command below after
+ *       changing the crystal instead of editing the constants
+ * @warning Expects the 1:256 prescaler set in MAIN and bank 0 selected
  */
+; >>> delay_gen DELAY_500MS
+; DELAY_500MS: 500ms at 4000000 Hz = 500000 cycles, CALL and RETURN included
+; Generated by: python delay_gen.py 500ms --mode timer0 --prescaler 256 --name DELAY_500MS --update ../src/asm-simple/main.s
+; Requires Timer0 on the internal clock, prescaler 1:256 (PSA = 0, PS2:PS0 = 111), bank 0 selected
+; Verified on pic_sim: 500000 cycles (500.000000 ms)
+PSECT udata_bank0
+DELAY_500MS_N: DS 1
+DELAY_500MS_PAD_D1: DS 1
+PSECT code
 DELAY_500MS:
-    MOVLW   8               ; 8 overflows for ~500ms
-    MOVWF   OVERFLOW_COUNT
-    
-/**
- * @brief Timer0 overflow counting loop
- * @details Wait for specified number of Timer0 overflows
- * @note Each overflow = ~65.536ms with 4MHz crystal and 1:256 prescaler
- * @param TMR0: Timer0 register (cleared each iteration)
- * @param TMR0IF: Timer0 interrupt flag (bit 2 of INTCON)
- */
-TIMER_LOOP:
-    CLRF    TMR0            ; Clear Timer0
-    BCF     INTCON, 2       ; Clear TMR0IF flag
-
-/**
- * @brief Wait for Timer0 overflow
- * @details Polls TMR0IF flag until Timer0 overflows
- * @note Blocking wait - CPU does nothing else
- * @warning This is a polling loop, not interrupt-driven
- */
-WAIT_OVERFLOW:
-    BTFSS   INTCON, 2       ; Check TMR0IF flag
-    GOTO    WAIT_OVERFLOW
-    
-    DECFSZ  OVERFLOW_COUNT, F
-    GOTO    TIMER_LOOP
-    
+    MOVLW   8
+    MOVWF   DELAY_500MS_N
+DELAY_500MS_T0:
+    MOVLW   12
+    MOVWF   TMR0            ; Restarts the prescaler
+    BCF     INTCON, 2       ; Clear TMR0IF
+DELAY_500MS_WAIT:
+    BTFSS   INTCON, 2
+    GOTO    DELAY_500MS_WAIT
+    DECFSZ  DELAY_500MS_N, F
+    GOTO    DELAY_500MS_T0
+    MOVLW   67
+    MOVWF   DELAY_500MS_PAD_D1
+DELAY_500MS_PAD_LOOP:
+    DECFSZ  DELAY_500MS_PAD_D1, F
+    GOTO    DELAY_500MS_PAD_LOOP
+    NOP
     RETURN
+; <<< delay_gen DELAY_500MS
 
 /**
  * @brief Example function - Turn on all LEDs
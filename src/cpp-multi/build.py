@@ -6,12 +6,21 @@ Integrates C++ transpilation with platform-pic8bit build system
 
 import os
 import sys
-import subprocess
+import time
+import argparse
 from pathlib import Path
 
+# draft/profiling.py (--profile)
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "draft"))
 
-def build_cpp_multi():
+from profiling import StageProfiler, add_arguments as add_profile_arguments
+from build_history import write_timings
+from xc8_diagnostics import stream_command
+
+
+def build_cpp_multi(profiler=None):
     """Build the cpp-multi project with transpilation"""
+    profiler = profiler or StageProfiler(None, "build")
 
     print("*** Building cpp-multi project")
     print("=" * 40)
@@ -28,30 +37,33 @@ def build_cpp_multi():
     print("Step 1: Transpiling C++ to C")
     print("-" * 30)
 
+    stage_timings = {}
+    started = time.perf_counter()
     try:
         transpile_script = cpp_multi_dir / "manual_transpile.py"
-        result = subprocess.run(
-            [sys.executable, str(transpile_script)],
+        # The transpiler runs in its own process: it profiles its own stages.
+        # Its output is printed line by line as it runs, not kept
+        returncode = stream_command(
+            [sys.executable, str(transpile_script)] + profiler.forward_args(),
+            on_line=print,
             cwd=cpp_multi_dir,
-            capture_output=True,
-            text=True,
         )
 
-        if result.returncode == 0:
+        if returncode == 0:
             print("[OK] Transpilation successful")
-            print(result.stdout)
         else:
             print("[ERROR] Transpilation failed")
-            print(result.stderr)
             return False
 
     except Exception as e:
         print(f"[ERROR] Error during transpilation: {e}")
         return False
+    stage_timings["transpile"] = time.perf_counter() - started
 
     # Step 2: Check generated C files
     print("\nStep 2: Verifying generated C files")
     print("-" * 35)
+    started = time.perf_counter()
 
     generated_dir = cpp_multi_dir / "generated_c"
     required_files = [
@@ -59,25 +71,32 @@ def build_cpp_multi():
         "led.c",
         "button.c",
         "timer0.c",
+        "scheduler.c",
         "led.h",
         "button.h",
         "timer0.h",
-        "device_config.h",
-        "pin_manager.h",
+        "scheduler.h",
     ]
+    # Shared with src/multi, compiled from src/common
+    common_dir = project_root / "src" / "common"
+    common_files = ["device_config.h", "pin_manager.h", "pin_manager.c"]
+    required_paths = [generated_dir / file for file in required_files] + [common_dir / file for file in common_files]
 
     missing_files = []
-    for file in required_files:
-        file_path = generated_dir / file
-        if file_path.exists():
-            print(f"[OK] {file} ({file_path.stat().st_size} bytes)")
-        else:
-            print(f"[ERROR] {file} - missing")
-            missing_files.append(file)
+    with profiler.stage("verify"):
+        for file_path in required_paths:
+            file = file_path.relative_to(project_root)
+            if file_path.exists():
+                print(f"[OK] {file} ({file_path.stat().st_size} bytes)")
+            else:
+                print(f"[ERROR] {file} - missing")
+                missing_files.append(str(file))
 
     if missing_files:
         print(f"\n[ERROR] Missing files: {missing_files}")
         return False
+    stage_timings["verify"] = time.perf_counter() - started
+    write_timings(stage_timings, project_root / "build" / "timings.json")
 
     # Step 3: Integration notes
     print("\nStep 3: Platform Integration")
@@ -89,7 +108,7 @@ def build_cpp_multi():
     print()
     print("Next steps:")
     print("  1. Copy generated_c/*.c and *.h to your build directory")
-    print("  2. Configure your build system to compile the C files")
+    print(f"  2. Compile them with src/common/*.c, adding -I{common_dir}")
     print("  3. Link with XC8 for PIC16F876A target")
     print()
 
@@ -135,8 +154,14 @@ def build_cpp_multi():
 
 def main():
     """Main build function"""
+    parser = argparse.ArgumentParser(description="Build the cpp-multi project")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler.from_args(args, "build")
+
     try:
-        success = build_cpp_multi()
+        success = build_cpp_multi(profiler)
+        profiler.print_summary()
         if success:
             print("\n*** BUILD SUCCESSFUL!")
             print(
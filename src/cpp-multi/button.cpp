@@ -90,3 +90,45 @@ bool Button::readHardwareState() const {
             return false;
     }
 }
+
+ButtonBank::ButtonBank()
+    : state(0), count0(0xFF), count1(0xFF), pressed(0), released(0) {
+    // Constructor - all buttons released, counters at their reset value
+}
+
+void ButtonBank::update() {
+    // Single port read; pull-ups make a pressed button read as 0
+    unsigned char sample = (unsigned char)(~BUTTON_BANK_PORT) & BUTTON_BANK_MASK;
+
+    // Bits whose sample differs from the debounced state count down,
+    // the others reset their counter to 3
+    unsigned char changed = sample ^ state;
+    count0 = ~(count0 & changed);
+    count1 = count0 ^ (count1 & changed);
+
+    // Counter rolled over: accept the new level
+    changed &= count0 & count1;
+    state ^= changed;
+    pressed |= state & changed;
+    released |= ~state & changed;
+}
+
+unsigned char ButtonBank::isPressed(unsigned char mask) const {
+    return state & mask;
+}
+
+unsigned char ButtonBank::wasJustPressed(unsigned char mask) {
+    unsigned char edges = pressed & mask;
+    pressed &= ~mask;
+    return edges;
+}
+
+unsigned char ButtonBank::wasJustReleased(unsigned char mask) {
+    unsigned char edges = released & mask;
+    released &= ~mask;
+    return edges;
+}
+
+unsigned char ButtonBank::getState() const {
+    return state;
+}
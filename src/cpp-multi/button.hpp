@@ -98,4 +98,75 @@ private:
     bool readHardwareState() const;
 };
 
+/**
+ * @brief Port read by ButtonBank (PB0-PB2 are on PORTA)
+ */
+#define BUTTON_BANK_PORT PORTA
+
+/**
+ * @brief Button bit masks within BUTTON_BANK_PORT
+ */
+#define BUTTON_PB0_MASK  0x04   ///< RA2
+#define BUTTON_PB1_MASK  0x02   ///< RA1
+#define BUTTON_PB2_MASK  0x10   ///< RA4
+#define BUTTON_BANK_MASK (BUTTON_PB0_MASK | BUTTON_PB1_MASK | BUTTON_PB2_MASK)
+
+/**
+ * @brief Debounced bank of up to 8 buttons on one port
+ * @details One port read per update() debounces every input in parallel
+ *          with 2-bit vertical counters: a change is accepted after 4
+ *          consecutive identical samples. The debouncer itself uses 3 bytes
+ *          of RAM (state + two counter bytes) whatever the number of
+ *          buttons, plus one byte per edge latch. Buttons are active low
+ *          (pull-ups); every query takes a mask of BUTTON_*_MASK bits.
+ */
+class ButtonBank {
+private:
+    unsigned char state;        ///< Debounced state, 1 = pressed
+    unsigned char count0;       ///< Vertical counter, bit 0
+    unsigned char count1;       ///< Vertical counter, bit 1
+    unsigned char pressed;      ///< Press edges not yet consumed
+    unsigned char released;     ///< Release edges not yet consumed
+
+public:
+    /**
+     * @brief ButtonBank constructor
+     * @details All buttons start released
+     */
+    ButtonBank();
+
+    /**
+     * @brief Sample the port and advance the debounce counters
+     * @details Call at a fixed rate (e.g. every 5ms from a scheduler task)
+     */
+    void update();
+
+    /**
+     * @brief Check which of the given buttons are pressed
+     * @param mask Buttons to check
+     * @return Subset of mask that is pressed (0 if none)
+     */
+    unsigned char isPressed(unsigned char mask) const;
+
+    /**
+     * @brief Consume press edges (released to pressed)
+     * @param mask Buttons to check
+     * @return Subset of mask pressed since the last call
+     */
+    unsigned char wasJustPressed(unsigned char mask);
+
+    /**
+     * @brief Consume release edges (pressed to released)
+     * @param mask Buttons to check
+     * @return Subset of mask released since the last call
+     */
+    unsigned char wasJustReleased(unsigned char mask);
+
+    /**
+     * @brief Get the debounced state of every button
+     * @return Bit mask of pressed buttons
+     */
+    unsigned char getState() const;
+};
+
 #endif // BUTTON_HPP
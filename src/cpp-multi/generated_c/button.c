@@ -1,112 +1,47 @@
 /*
- * XC8 C++ to C Transpilation
- * Generated using semantic AST analysis
- * Architecture demonstrates proper Clang LibTooling approach
+ * XC8 C++ to C Transpilation - Button
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Button
  */
 
 #include <stdint.h>
 #include <stdbool.h>
-#include <stddef.h>
+#include <xc.h>
+#include "pin_manager.h"
+#include "button.h"
 
-// === Class Button transformed to C ===
+// === Class ButtonBank transformed to C ===
 
-typedef struct Button {
-    int buttonId;
-    int currentState;
-    int previousState;
-    unsigned int debounceCounter;
-} Button;
-
-// Constructor for Button
-void Button_init(Button* self) {
-    // Initialize Button instance
-    self->debounceCounter = 0;
+// Constructor for ButtonBank
+void ButtonBank_init(void) {
+    buttons.state = 0;
+    buttons.count0 = 0xFF;
+    buttons.count1 = 0xFF;
+    buttons.pressed = 0;
+    buttons.released = 0;
 }
 
 // Method: update
-void Button_update(Button* self) {
-    // Method implementation needed
-}
-
-// Method: isPressed
-bool Button_isPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustPressed
-bool Button_wasJustPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustReleased
-bool Button_wasJustReleased(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: getId
-int Button_getId(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: getState
-int Button_getState(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: readHardwareState
-bool Button_readHardwareState(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
+void ButtonBank_update(void) {
+    // Single port read; pull-ups make a pressed button read as 0
+    unsigned char sample = (unsigned char)(~BUTTON_BANK_PORT) & BUTTON_BANK_MASK;
 
-// Method: update
-void Button_update(Button* self) {
-    // Method implementation needed
-}
+    // Bits whose sample differs from the debounced state count down,
+    // the others reset their counter to 3
+    unsigned char changed = sample ^ buttons.state;
+    buttons.count0 = ~(buttons.count0 & changed);
+    buttons.count1 = buttons.count0 ^ (buttons.count1 & changed);
 
-// Method: isPressed
-bool Button_isPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
+    // Counter rolled over: accept the new level
+    changed &= buttons.count0 & buttons.count1;
+    buttons.state ^= changed;
+    buttons.pressed |= buttons.state & changed;
+    buttons.released |= ~buttons.state & changed;
 }
 
 // Method: wasJustPressed
-bool Button_wasJustPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustReleased
-bool Button_wasJustReleased(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: getId
-int Button_getId(Button* self) {
-    // Method implementation needed
-    return (int)0;
+unsigned char ButtonBank_wasJustPressed(unsigned char mask) {
+    unsigned char edges = buttons.pressed & mask;
+    buttons.pressed &= ~mask;
+    return edges;
 }
-
-// Method: getState
-int Button_getState(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: readHardwareState
-bool Button_readHardwareState(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Destructor for Button
-void Button_cleanup(Button* self) {
-    // Cleanup Button instance
-}
-
@@ -1,102 +1,58 @@
-#include <xc.h>
-/**
- * @file button.hpp
- * @brief Button C++ class for PIC16F876A
- * @author Sébastien Celles
- * @date 2025
- * @version 1.0
- *
- * @details C++ class for managing push buttons on PIC16F876A.
- *          This file will be transpiled to C using xc8plusplus.
+/*
+ * XC8 C++ to C Transpilation - Button Header
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Button
  */
 
 #ifndef BUTTON_H
 #define BUTTON_H
 
-/**
- * @brief Button identifier enumeration
- */
-enum class ButtonId {
+#include <stdint.h>
+#include <stdbool.h>
+
+// Button identifier enumeration (transpiled from C++ enum class)
+typedef enum {
     PB_0 = 0,
     PB_1 = 1,
     PB_2 = 2
-};
+} ButtonId_t;
 
-/**
- * @brief Button state enumeration
- */
-enum class ButtonState {
-    RELEASED = 0,
-    PRESSED = 1
-};
+// Button state enumeration (transpiled from C++ enum class)
+typedef enum {
+    BUTTON_RELEASED = 0,
+    BUTTON_PRESSED = 1
+} ButtonState_t;
 
-/**
- * @brief Button C++ class for push button management
- * @details Provides object-oriented interface for button operations
- *          with debouncing and state management
- */
-class Button {
-private:
-    ButtonId buttonId;
-    ButtonState currentState;
-    ButtonState previousState;
-    unsigned int debounceCounter;
-    static const unsigned int DEBOUNCE_THRESHOLD = 5;
-    
-public:
-    /**
-     * @brief Button constructor
-     * @param id Button identifier (PB0 to PB2)
-     */
-    Button(ButtonId id);
-    
-    /**
-     * @brief Button destructor
-     */
-    ~Button();
-    
-    /**
-     * @brief Update button state (call regularly in main loop)
-     * @details Reads hardware state and applies debouncing
-     */
-    void update();
-    
-    /**
-     * @brief Check if button is currently pressed
-     * @return true if pressed, false if released
-     */
-    bool isPressed() const;
-    
-    /**
-     * @brief Check if button was just pressed (edge detection)
-     * @return true if button transitioned from released to pressed
-     */
-    bool wasJustPressed();
-    
-    /**
-     * @brief Check if button was just released (edge detection)
-     * @return true if button transitioned from pressed to released
-     */
-    bool wasJustReleased();
-    
-    /**
-     * @brief Get button identifier
-     * @return Button identifier
-     */
-    ButtonId getId() const;
-    
-    /**
-     * @brief Get current button state
-     * @return Current button state (PRESSED or RELEASED)
-     */
-    ButtonState getState() const;
-    
-private:
-    /**
-     * @brief Read raw hardware button state
-     * @return Raw button state from hardware
-     */
-    bool readHardwareState() const;
-};
+// Button debounce threshold
+#define BUTTON_DEBOUNCE_THRESHOLD 5
+
+// Port read by ButtonBank (PB0-PB2 are on PORTA)
+#define BUTTON_BANK_PORT PORTA
+
+// Button bit masks within BUTTON_BANK_PORT
+#define BUTTON_PB0_MASK  0x04   // RA2
+#define BUTTON_PB1_MASK  0x02   // RA1
+#define BUTTON_PB2_MASK  0x10   // RA4
+#define BUTTON_BANK_MASK (BUTTON_PB0_MASK | BUTTON_PB1_MASK | BUTTON_PB2_MASK)
+
+// ButtonBank struct (transpiled from C++ class): 2-bit vertical counters
+// debounce up to 8 buttons from a single port read
+typedef struct ButtonBank {
+    unsigned char state;        // Debounced state, 1 = pressed
+    unsigned char count0;       // Vertical counter, bit 0
+    unsigned char count1;       // Vertical counter, bit 1
+    unsigned char pressed;      // Press edges not yet consumed
+    unsigned char released;     // Release edges not yet consumed
+} ButtonBank;
+
+// Single instance (defined in main.c), accessed directly by the methods
+extern ButtonBank buttons;
+
+void ButtonBank_init(void);
+void ButtonBank_update(void);
+static inline unsigned char ButtonBank_isPressed(unsigned char mask) {
+    return buttons.state & mask;
+}
+unsigned char ButtonBank_wasJustPressed(unsigned char mask);
 
 #endif // BUTTON_H
@@ -1,208 +1,41 @@
 /*
- * XC8 C++ to C Transpilation
- * Generated using semantic AST analysis
- * Architecture demonstrates proper Clang LibTooling approach
+ * XC8 C++ to C Transpilation - LED
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Led
  */
 
 #include <stdint.h>
 #include <stdbool.h>
-#include <stddef.h>
-
-// === Class Button transformed to C ===
-
-typedef struct Button {
-    int buttonId;
-    int currentState;
-    int previousState;
-    unsigned int debounceCounter;
-} Button;
-
-// Constructor for Button
-void Button_init(Button* self) {
-    // Initialize Button instance
-    self->debounceCounter = 0;
-}
-
-// Method: update
-void Button_update(Button* self) {
-    // Method implementation needed
-}
-
-// Method: isPressed
-bool Button_isPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustPressed
-bool Button_wasJustPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustReleased
-bool Button_wasJustReleased(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: getId
-int Button_getId(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: getState
-int Button_getState(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: readHardwareState
-bool Button_readHardwareState(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: update
-void Button_update(Button* self) {
-    // Method implementation needed
-}
-
-// Method: isPressed
-bool Button_isPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustPressed
-bool Button_wasJustPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustReleased
-bool Button_wasJustReleased(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: getId
-int Button_getId(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: getState
-int Button_getState(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: readHardwareState
-bool Button_readHardwareState(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Destructor for Button
-void Button_cleanup(Button* self) {
-    // Cleanup Button instance
-}
-
-// === Class Led transformed to C ===
-
-typedef struct Led {
-    int ledId;
-    bool state;
-} Led;
-
-// Constructor for Led
-void Led_init(Led* self) {
-    // Initialize Led instance
-    self->state = false;
-}
-
-// Method: turnOn
-void Led_turnOn(Led* self) {
-    self->state = true;
-    // TODO: Set GPIO pin high
-}
-
-// Method: turnOff
-void Led_turnOff(Led* self) {
-    self->state = false;
-    // TODO: Set GPIO pin low
-}
-
-// Method: toggle
-void Led_toggle(Led* self) {
-    self->state = !self->state;
-    // TODO: Toggle GPIO pin
-}
-
-// Method: setState
-void Led_setState(Led* self) {
-    // Method implementation needed
-}
-
-// Method: isOn
-bool Led_isOn(Led* self) {
-    return self->state;
-}
-
-// Method: getId
-int Led_getId(Led* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: blink
-void Led_blink(Led* self) {
-    // Method implementation needed
+#include <xc.h>
+#include "device_config.h"
+#include "pin_manager.h"
+#include "led.h"
+
+// === Class LedGroup transformed to C ===
+
+// Constructor for LedGroup
+void LedGroup_init(void) {
+    leds.state = 0;
+    leds.shadowA = PORTA & ~LED_GROUP_PORTA_MASK;
+    leds.shadowC = PORTC & ~LED_GROUP_PORTC_MASK;
+    // Ports read once, one write per port, every LED off
+    PORTA = leds.shadowA;
+    PORTC = leds.shadowC;
+}
+
+// Method: commit
+void LedGroup_commit(void) {
+    unsigned char portA = (leds.shadowA & ~LED_GROUP_PORTA_MASK) | LED_GROUP_PORTA_BITS(leds.state);
+    unsigned char portC = (leds.shadowC & ~LED_GROUP_PORTC_MASK) | LED_GROUP_PORTC_BITS(leds.state);
+
+    // Whole-byte writes from the shadows: never read back the port pins,
+    // and only the LED bits of the port image change
+    if (portA != leds.shadowA) {
+        leds.shadowA = portA;
+        PORTA = leds.shadowA;
+    }
+    if (portC != leds.shadowC) {
+        leds.shadowC = portC;
+        PORTC = leds.shadowC;
+    }
 }
-
-// Method: turnOn
-void Led_turnOn(Led* self) {
-    self->state = true;
-    // TODO: Set GPIO pin high
-}
-
-// Method: turnOff
-void Led_turnOff(Led* self) {
-    self->state = false;
-    // TODO: Set GPIO pin low
-}
-
-// Method: toggle
-void Led_toggle(Led* self) {
-    self->state = !self->state;
-    // TODO: Toggle GPIO pin
-}
-
-// Method: setState
-void Led_setState(Led* self) {
-    // Method implementation needed
-}
-
-// Method: isOn
-bool Led_isOn(Led* self) {
-    return self->state;
-}
-
-// Method: getId
-int Led_getId(Led* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: blink
-void Led_blink(Led* self) {
-    // Method implementation needed
-}
-
-// Destructor for Led
-void Led_cleanup(Led* self) {
-    // Cleanup Led instance
-}
-
@@ -1,89 +1,63 @@
-#include <xc.h>
-/**
- * @file led.hpp
- * @brief LED C++ class for PIC16F876A
- * @author Sébastien Celles
- * @date 2025
- * @version 1.0
- *
- * @details C++ class for managing individual LEDs on PIC16F876A.
- *          This file will be transpiled to C using xc8plusplus.
+/*
+ * XC8 C++ to C Transpilation - LED Header
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Led
  */
 
 #ifndef LED_H
 #define LED_H
 
-/**
- * @brief LED identifier enumeration
- */
-enum class LedId {
+#include <stdint.h>
+#include <stdbool.h>
+
+// LED identifier enumeration (transpiled from C++ enum class)
+typedef enum {
     LED_0 = 0,
     LED_1 = 1,
     LED_2 = 2,
     LED_3 = 3,
     LED_4 = 4
-};
+} LedId_t;
 
-/**
- * @brief LED C++ class for individual LED control
- * @details Provides object-oriented interface for LED operations
- */
-class Led {
-private:
-    LedId ledId;
-    bool state;
-    
-public:
-    /**
-     * @brief LED constructor
-     * @param id LED identifier (LED0 to LED4)
-     */
-    Led(LedId id);
-    
-    /**
-     * @brief LED destructor
-     */
-    ~Led();
-    
-    /**
-     * @brief Turn LED on
-     */
-    void turnOn();
-    
-    /**
-     * @brief Turn LED off
-     */
-    void turnOff();
-    
-    /**
-     * @brief Toggle LED state
-     */
-    void toggle();
-    
-    /**
-     * @brief Set LED state
-     * @param newState true for on, false for off
-     */
-    void setState(bool newState);
-    
-    /**
-     * @brief Get current LED state
-     * @return true if LED is on, false if off
-     */
-    bool isOn() const;
-    
-    /**
-     * @brief Get LED identifier
-     * @return LED identifier
-     */
-    LedId getId() const;
-    
-    /**
-     * @brief Blink LED
-     * @param count Number of blinks
-     * @param delayMs Delay between blinks in milliseconds
-     */
-    void blink(unsigned int count, unsigned int delayMs);
-};
+// LED bit masks for LedGroup (bit n = LED n)
+#define LED_MASK_0   0x01
+#define LED_MASK_1   0x02
+#define LED_MASK_2   0x04
+#define LED_MASK_3   0x08
+#define LED_MASK_4   0x10
+#define LED_MASK_ALL 0x1F
+
+// Port bits driven by a LED mask: LED0 = RA3, LED1 = RA5, LED2-LED4 = RC0-RC2
+#define LED_GROUP_PORTA_BITS(mask) ((unsigned char)((((mask) & LED_MASK_0) << 3) | (((mask) & LED_MASK_1) << 4)))
+#define LED_GROUP_PORTC_BITS(mask) ((unsigned char)(((mask) & LED_MASK_ALL) >> 2))
+#define LED_GROUP_PORTA_MASK       LED_GROUP_PORTA_BITS(LED_MASK_ALL)
+#define LED_GROUP_PORTC_MASK       LED_GROUP_PORTC_BITS(LED_MASK_ALL)
+
+// LedGroup struct (transpiled from C++ class): LED mask plus one shadow
+// byte per port (the whole port image, only its LED bits change),
+// committed with a single write per port
+typedef struct LedGroup {
+    unsigned char state;        // Requested LEDs, bit n = LED n
+    unsigned char shadowA;      // Last value written to PORTA (whole port)
+    unsigned char shadowC;      // Last value written to PORTC (whole port)
+} LedGroup;
+
+// Single instance (defined in main.c), accessed directly by the methods
+extern LedGroup leds;
+
+void LedGroup_init(void);
+static inline void LedGroup_set(unsigned char mask) {
+    leds.state |= mask;
+}
+static inline void LedGroup_clear(unsigned char mask) {
+    leds.state &= ~mask;
+}
+static inline void LedGroup_toggle(unsigned char mask) {
+    leds.state ^= mask;
+}
+static inline void LedGroup_write(unsigned char mask) {
+    leds.state = mask;
+}
+void LedGroup_commit(void);
 
 #endif // LED_H
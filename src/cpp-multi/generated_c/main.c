@@ -1,218 +1,167 @@
 /*
- * XC8 C++ to C Transpilation
- * Generated using semantic AST analysis
- * Architecture demonstrates proper Clang LibTooling approach
+ * XC8 C++ to C Transpilation - Main
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ main function
  */
 
 #include <stdint.h>
 #include <stdbool.h>
-#include <stddef.h>
-
-// === Class Button transformed to C ===
-
-typedef struct Button {
-    int buttonId;
-    int currentState;
-    int previousState;
-    unsigned int debounceCounter;
-} Button;
-
-// Constructor for Button
-void Button_init(Button* self) {
-    // Initialize Button instance
-    self->debounceCounter = 0;
-}
-
-// Method: update
-void Button_update(Button* self) {
-    // Method implementation needed
-}
-
-// Method: isPressed
-bool Button_isPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustPressed
-bool Button_wasJustPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustReleased
-bool Button_wasJustReleased(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: getId
-int Button_getId(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: getState
-int Button_getState(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: readHardwareState
-bool Button_readHardwareState(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Destructor for Button
-void Button_cleanup(Button* self) {
-    // Cleanup Button instance
-}
-
-// === Class Led transformed to C ===
-
-typedef struct Led {
-    int ledId;
-    bool state;
-} Led;
-
-// Constructor for Led
-void Led_init(Led* self) {
-    // Initialize Led instance
-    self->state = false;
-}
-
-// Method: turnOn
-void Led_turnOn(Led* self) {
-    self->state = true;
-    // TODO: Set GPIO pin high
-}
-
-// Method: turnOff
-void Led_turnOff(Led* self) {
-    self->state = false;
-    // TODO: Set GPIO pin low
-}
-
-// Method: toggle
-void Led_toggle(Led* self) {
-    self->state = !self->state;
-    // TODO: Toggle GPIO pin
-}
-
-// Method: setState
-void Led_setState(Led* self) {
-    // Method implementation needed
-}
-
-// Method: isOn
-bool Led_isOn(Led* self) {
-    return self->state;
-}
-
-// Method: getId
-int Led_getId(Led* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: blink
-void Led_blink(Led* self) {
-    // Method implementation needed
-}
+#include <xc.h>
+#include "device_config.h"
+#include "pin_manager.h"
+#include "timer0.h"
+#include "led.h"
+#include "button.h"
+#include "scheduler.h"
+
+// Task periods and start offsets in ticks (1 tick = 1ms)
+#define BUTTON_TASK_PERIOD    5
+#define INPUT_TASK_PERIOD     10
+#define EFFECT_TASK_PERIOD    50
+#define SEQUENCE_TASK_PERIOD  100
+
+// LED sequence: 5 sweep steps followed by a 5-step (500ms) pause
+#define SEQUENCE_LEDS   5
+#define SEQUENCE_STEPS  10
+
+// Effects, in EFFECT_TASK_PERIOD steps
+#define BLINK_STEPS     6   // LED4 blinks 3 times
+#define FLASH_ON_STEP   4   // All LEDs on after 200ms...
+#define FLASH_OFF_STEP  8   // ...and off again 200ms later
+
+// Global instances (transpiled from C++ globals, constructed in setup)
+Timer0 timer;
+Scheduler scheduler;
+LedGroup leds;
+ButtonBank buttons;
+
+// LEDs lit at each sequence step (the pause steps light none)
+const unsigned char sequencePattern[SEQUENCE_STEPS] = {
+    LED_MASK_0, LED_MASK_1, LED_MASK_2, LED_MASK_3, LED_MASK_4,
+    0, 0, 0, 0, 0
+};
+
+unsigned char sequenceStep = 0;     // 0-4: LED lit by the sweep, 5-9: pause
+unsigned char blinkSteps = 0;       // Remaining LED4 blink half-periods
+unsigned char flashStep = 0;        // Flash effect progress, 0 = idle
+
+// Task: debounce every button at a fixed rate (one PORTA read)
+void buttonTask(void) {
+    ButtonBank_update();
+}
+
+// Task: react to button edges and mirror buttons on LEDs during the pause
+void inputTask(void) {
+    if (ButtonBank_wasJustPressed(BUTTON_PB0_MASK)) {
+        // Button 0 was just pressed - blink LED4 3 times
+        blinkSteps = BLINK_STEPS;
+    }
 
-// Destructor for Led
-void Led_cleanup(Led* self) {
-    // Cleanup Led instance
-}
+    if (ButtonBank_wasJustPressed(BUTTON_PB1_MASK)) {
+        // Button 1 was just pressed - toggle LED0
+        LedGroup_toggle(LED_MASK_0);
+    }
 
-// === Class Timer0 transformed to C ===
+    if (ButtonBank_wasJustPressed(BUTTON_PB2_MASK)) {
+        // Button 2 was just pressed - flash all LEDs
+        flashStep = 1;
+    }
 
-typedef struct Timer0 {
-    bool initialized;
-} Timer0;
+    if (sequenceStep < SEQUENCE_LEDS || blinkSteps != 0 || flashStep != 0) {
+        return;
+    }
 
-// Constructor for Timer0
-void Timer0_init(Timer0* self) {
-    // Initialize Timer0 instance
-    self->initialized = false;
+    unsigned char mirror = 0;
+    if (ButtonBank_isPressed(BUTTON_PB0_MASK)) {
+        mirror |= LED_MASK_0 | LED_MASK_1;
+    }
+    if (ButtonBank_isPressed(BUTTON_PB1_MASK)) {
+        mirror |= LED_MASK_2 | LED_MASK_3;
+    }
+    if (ButtonBank_isPressed(BUTTON_PB2_MASK)) {
+        mirror |= LED_MASK_4;
+    }
+    LedGroup_write(mirror);
 }
 
-// Method: initialize
-void Timer0_initialize(Timer0* self) {
-    // Method implementation needed
-}
+// Task: run the blink and flash effects one step at a time
+void effectTask(void) {
+    if (blinkSteps != 0) {
+        LedGroup_toggle(LED_MASK_4);
+        blinkSteps--;
+    }
 
-// Method: isInitialized
-bool Timer0_isInitialized(Timer0* self) {
-    // Method implementation needed
-    return (bool)0;
+    if (flashStep != 0) {
+        if (flashStep == FLASH_ON_STEP) {
+            LedGroup_write(LED_MASK_ALL);
+        } else if (flashStep == FLASH_OFF_STEP) {
+            LedGroup_write(0);
+            flashStep = 0;
+            return;
+        }
+        flashStep++;
+    }
 }
 
-// Method: delay50ms
-void Timer0_delay50ms(Timer0* self) {
-    // Method implementation needed
-}
+// Task: advance the LED sweep by one step (paused while an effect runs)
+void sequenceTask(void) {
+    if (blinkSteps != 0 || flashStep != 0) {
+        return;
+    }
 
-// Method: delay
-void Timer0_delay(Timer0* self) {
-    // Method implementation needed
-}
+    LedGroup_clear(sequencePattern[sequenceStep]);
 
-// Method: start
-void Timer0_start(Timer0* self) {
-    // Method implementation needed
-}
+    sequenceStep++;
+    if (sequenceStep == SEQUENCE_STEPS) {
+        sequenceStep = 0;
+        LedGroup_write(0);
+    }
 
-// Method: stop
-void Timer0_stop(Timer0* self) {
-    // Method implementation needed
+    LedGroup_set(sequencePattern[sequenceStep]);
 }
 
-// Method: reset
-void Timer0_reset(Timer0* self) {
-    // Method implementation needed
+// Interrupt service routine: Timer0 overflow reloads and releases due tasks
+void __interrupt() isr(void) {
+    if (INTCONbits.T0IE && INTCONbits.T0IF) {
+        Timer0_handleInterrupt();
+        Scheduler_tick();
+    }
 }
 
-// Method: getValue
-int Timer0_getValue(Timer0* self) {
-    // Method implementation needed
-    return (int)0;
-}
+// Function: setup
+void setup(void) {
+    // Construct global instances
+    Timer0_init();
+    Scheduler_init();
+    LedGroup_init();
+    ButtonBank_init();
 
-// Destructor for Timer0
-void Timer0_cleanup(Timer0* self) {
-    // Cleanup Timer0 instance
-}
+    // System initialization
+    PIN_MANAGER_Initialize();
 
+    // Start the sequence with LED0 lit
+    LedGroup_write(sequencePattern[0]);
+    LedGroup_commit();
 
+    // Periodic tasks, offsets spread them over different ticks
+    Scheduler_addTask(buttonTask, BUTTON_TASK_PERIOD, 0);
+    Scheduler_addTask(inputTask, INPUT_TASK_PERIOD, 1);
+    Scheduler_addTask(effectTask, EFFECT_TASK_PERIOD, 2);
+    Scheduler_addTask(sequenceTask, SEQUENCE_TASK_PERIOD, 3);
 
-/**
- * @brief Setup function - Arduino framework initialization
- * @details This is a template stub - implement your initialization code here
- * @note Original C++ code was not transpiled by xc8plusplus
- */
-void setup(void) {
-    // TODO: Add your initialization code here
-    // The transpiler failed to convert the C++ setup() function
-    // You may need to manually port the C++ code to C
+    // Start the 1ms Timer0 tick interrupt
+    Timer0_startTick();
 }
 
-/**
- * @brief Loop function - Arduino framework main loop
- * @details This is a template stub - implement your main loop code here
- * @note Original C++ code was not transpiled by xc8plusplus
- */
+// Function: loop (runs released tasks, then one LED write per port)
 void loop(void) {
-    // TODO: Add your main loop code here
-    // The transpiler failed to convert the C++ loop() function
-    // You may need to manually port the C++ code to C
+    Scheduler_runPending();
+    LedGroup_commit();
 }
 
 /**
- * @brief Main function - Arduino framework entry point
- * @details Calls setup() once, then loop() repeatedly
- * @note This function is automatically provided by the Arduino framework
+ * @brief Main C program (transpiled from C++)
+ * @details Arduino-style entry point: setup() once, then loop() forever
  */
 void main(void) {
     setup();
@@ -0,0 +1,77 @@
+/*
+ * XC8 C++ to C Transpilation - Scheduler
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Scheduler
+ */
+
+#include <stdint.h>
+#include <stdbool.h>
+#include <xc.h>
+#include "scheduler.h"
+
+// === Class Scheduler transformed to C ===
+
+// Constructor for Scheduler
+void Scheduler_init(void) {
+    scheduler.taskCount = 0;
+    scheduler.now = 0;
+    scheduler.overruns = 0;
+}
+
+// Method: addTask
+bool Scheduler_addTask(TaskFunction function, unsigned int period, unsigned int offset) {
+    if (scheduler.taskCount >= SCHEDULER_MAX_TASKS) {
+        return false;
+    }
+
+    Task* task = &scheduler.tasks[scheduler.taskCount];
+    task->function = function;
+    task->period = period;
+    task->countdown = offset + 1;
+    task->deadline = 0;
+    task->ready = false;
+    scheduler.taskCount++;
+    return true;
+}
+
+// Method: tick
+void Scheduler_tick(void) {
+    // Interrupt context: only release tasks, never run them here
+    scheduler.now++;
+    for (unsigned char i = 0; i < scheduler.taskCount; i++) {
+        Task* task = &scheduler.tasks[i];
+        if (--task->countdown == 0) {
+            task->countdown = task->period;
+            if (task->ready) {
+                scheduler.overruns++;   // Previous release has not run yet
+            }
+            task->deadline = scheduler.now + task->period;
+            task->ready = true;
+        }
+    }
+}
+
+// Method: runPending
+void Scheduler_runPending(void) {
+    while (true) {
+        // Pick the released task with the earliest deadline. Interrupts are
+        // masked so the 16-bit deadlines are read consistently.
+        Task* next = NULL;
+        INTCONbits.GIE = 0;
+        for (unsigned char i = 0; i < scheduler.taskCount; i++) {
+            Task* task = &scheduler.tasks[i];
+            if (task->ready && (next == NULL || (int)(task->deadline - next->deadline) < 0)) {
+                next = task;
+            }
+        }
+        if (next != NULL) {
+            next->ready = false;
+        }
+        INTCONbits.GIE = 1;
+
+        if (next == NULL) {
+            return;
+        }
+        next->function();
+    }
+}
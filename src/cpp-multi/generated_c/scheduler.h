@@ -0,0 +1,46 @@
+/*
+ * XC8 C++ to C Transpilation - Scheduler Header
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Scheduler
+ */
+
+#ifndef SCHEDULER_H
+#define SCHEDULER_H
+
+#include <stdint.h>
+#include <stdbool.h>
+#include <stddef.h>
+
+// Maximum number of periodic tasks
+#define SCHEDULER_MAX_TASKS 6
+
+// Task entry point (runs to completion, must not block)
+typedef void (*TaskFunction)(void);
+
+// Periodic task descriptor
+typedef struct Task {
+    TaskFunction function;
+    unsigned int period;
+    unsigned int countdown;
+    unsigned int deadline;
+    volatile bool ready;
+} Task;
+
+// Scheduler struct (transpiled from C++ class)
+typedef struct Scheduler {
+    Task tasks[SCHEDULER_MAX_TASKS];
+    unsigned char taskCount;
+    volatile unsigned int now;
+    unsigned char overruns;
+} Scheduler;
+
+// Single instance (defined in main.c), accessed directly by the methods
+extern Scheduler scheduler;
+
+// Function prototypes (transpiled from C++ methods)
+void Scheduler_init(void);
+bool Scheduler_addTask(TaskFunction function, unsigned int period, unsigned int offset);
+void Scheduler_tick(void);
+void Scheduler_runPending(void);
+
+#endif // SCHEDULER_H
@@ -1,229 +1,47 @@
 /*
- * XC8 C++ to C Transpilation
- * Generated using semantic AST analysis
- * Architecture demonstrates proper Clang LibTooling approach
+ * XC8 C++ to C Transpilation - Timer0
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Timer0
  */
 
 #include <stdint.h>
 #include <stdbool.h>
-#include <stddef.h>
-
-// === Class Button transformed to C ===
-
-typedef struct Button {
-    int buttonId;
-    int currentState;
-    int previousState;
-    unsigned int debounceCounter;
-} Button;
-
-// Constructor for Button
-void Button_init(Button* self) {
-    // Initialize Button instance
-    self->debounceCounter = 0;
-}
-
-// Method: update
-void Button_update(Button* self) {
-    // Method implementation needed
-}
-
-// Method: isPressed
-bool Button_isPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustPressed
-bool Button_wasJustPressed(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: wasJustReleased
-bool Button_wasJustReleased(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: getId
-int Button_getId(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: getState
-int Button_getState(Button* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: readHardwareState
-bool Button_readHardwareState(Button* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Destructor for Button
-void Button_cleanup(Button* self) {
-    // Cleanup Button instance
-}
-
-// === Class Led transformed to C ===
-
-typedef struct Led {
-    int ledId;
-    bool state;
-} Led;
-
-// Constructor for Led
-void Led_init(Led* self) {
-    // Initialize Led instance
-    self->state = false;
-}
-
-// Method: turnOn
-void Led_turnOn(Led* self) {
-    self->state = true;
-    // TODO: Set GPIO pin high
-}
-
-// Method: turnOff
-void Led_turnOff(Led* self) {
-    self->state = false;
-    // TODO: Set GPIO pin low
-}
-
-// Method: toggle
-void Led_toggle(Led* self) {
-    self->state = !self->state;
-    // TODO: Toggle GPIO pin
-}
-
-// Method: setState
-void Led_setState(Led* self) {
-    // Method implementation needed
-}
-
-// Method: isOn
-bool Led_isOn(Led* self) {
-    return self->state;
-}
-
-// Method: getId
-int Led_getId(Led* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Method: blink
-void Led_blink(Led* self) {
-    // Method implementation needed
-}
-
-// Destructor for Led
-void Led_cleanup(Led* self) {
-    // Cleanup Led instance
-}
+#include <xc.h>
+#include "device_config.h"
+#include "timer0.h"
 
 // === Class Timer0 transformed to C ===
 
-typedef struct Timer0 {
-    bool initialized;
-} Timer0;
-
 // Constructor for Timer0
-void Timer0_init(Timer0* self) {
-    // Initialize Timer0 instance
-    self->initialized = false;
-}
-
-// Method: initialize
-void Timer0_initialize(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: isInitialized
-bool Timer0_isInitialized(Timer0* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: delay50ms
-void Timer0_delay50ms(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: delay
-void Timer0_delay(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: start
-void Timer0_start(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: stop
-void Timer0_stop(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: reset
-void Timer0_reset(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: getValue
-int Timer0_getValue(Timer0* self) {
-    // Method implementation needed
-    return (int)0;
+void Timer0_init(void) {
+    timer.initialized = false;
+    timer.tickRunning = false;
+    timer.ticks = 0;
+}
+
+// Method: startTick
+void Timer0_startTick(void) {
+    // Prescaler picked from _XTAL_FREQ so that one tick is
+    // TIMER0_TICK_COUNTS counts (1:4 at 4MHz)
+    OPTION_REGbits.T0CS = 0;    // Internal instruction cycle clock
+    OPTION_REGbits.PSA = 0;     // Prescaler assigned to Timer0
+    OPTION_REGbits.PS2 = (TIMER0_TICK_PS >> 2) & 1;
+    OPTION_REGbits.PS1 = (TIMER0_TICK_PS >> 1) & 1;
+    OPTION_REGbits.PS0 = TIMER0_TICK_PS & 1;
+
+    timer.ticks = 0;
+    TMR0 = TIMER0_TICK_RELOAD;
+    INTCONbits.T0IF = 0;
+    INTCONbits.T0IE = 1;        // Enable Timer0 interrupt
+    INTCONbits.GIE = 1;         // Enable global interrupts
+
+    timer.initialized = true;
+    timer.tickRunning = true;
+}
+
+// Method: handleInterrupt
+void Timer0_handleInterrupt(void) {
+    TMR0 += TIMER0_TICK_RELOAD;
+    INTCONbits.T0IF = 0;
+    timer.ticks++;
 }
-
-// Method: initialize
-void Timer0_initialize(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: isInitialized
-bool Timer0_isInitialized(Timer0* self) {
-    // Method implementation needed
-    return (bool)0;
-}
-
-// Method: delay50ms
-void Timer0_delay50ms(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: delay
-void Timer0_delay(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: start
-void Timer0_start(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: stop
-void Timer0_stop(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: reset
-void Timer0_reset(Timer0* self) {
-    // Method implementation needed
-}
-
-// Method: getValue
-int Timer0_getValue(Timer0* self) {
-    // Method implementation needed
-    return (int)0;
-}
-
-// Destructor for Timer0
-void Timer0_cleanup(Timer0* self) {
-    // Cleanup Timer0 instance
-}
-
@@ -1,90 +1,84 @@
-#include <xc.h>
-/**
- * @file timer0.hpp
- * @brief Timer0 C++ class for PIC16F876A
- * @author Sébastien Celles
- * @date 2025
- * @version 1.0
- *
- * @details C++ class wrapper for Timer0 configuration and management
- *          for PIC16F876A for delay generation and timing.
- *          This file will be transpiled to C using xc8plusplus.
+/*
+ * XC8 C++ to C Transpilation - Timer0 Header
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Timer0
  */
 
 #ifndef TIMER0_H
 #define TIMER0_H
 
-#include <xc.h>
+#include <stdint.h>
+#include <stdbool.h>
+#include "device_config.h"
 
-/**
- * @brief Timer0 C++ class for PIC16F876A
- * @details Provides object-oriented interface for Timer0 operations
- */
-class Timer0 {
-private:
-    bool initialized;
-    
-public:
-    /**
-     * @brief Timer0 constructor
-     * @details Initializes the Timer0 instance
-     */
-    Timer0();
-    
-    /**
-     * @brief Timer0 destructor
-     * @details Cleanup Timer0 resources
-     */
-    ~Timer0();
-    
-    /**
-     * @brief Initialize Timer0
-     * @details Configures Timer0 for timer mode operation
-     *          with appropriate prescaler for 4MHz frequency
-     */
-    void initialize();
-    
-    /**
-     * @brief Check if Timer0 is initialized
-     * @return true if initialized, false otherwise
-     */
-    bool isInitialized() const;
-    
-    /**
-     * @brief 50ms delay using Timer0
-     * @details Delay function based on Timer0 for precise timing
-     */
-    void delay50ms();
-    
-    /**
-     * @brief Custom delay using Timer0
-     * @param milliseconds Delay time in milliseconds
-     */
-    void delay(unsigned int milliseconds);
-    
-    /**
-     * @brief Start Timer0
-     * @details Start the timer counting
-     */
-    void start();
-    
-    /**
-     * @brief Stop Timer0
-     * @details Stop the timer counting
-     */
-    void stop();
-    
-    /**
-     * @brief Reset Timer0
-     * @details Reset the timer counter to 0
-     */
-    void reset();
-    
-    /**
-     * @brief Get Timer0 value
-     * @return Current timer value
-     */
-    unsigned char getValue() const;
-};
+// Tick period of the Timer0 interrupt, in milliseconds
+#define TIMER0_TICK_MS 1
+
+// Instruction cycles per tick (1000 at 4MHz)
+#define TIMER0_TICK_CYCLES (_XTAL_FREQ / 4UL / 1000UL * TIMER0_TICK_MS)
+
+// PS2:PS0 of the tick: the smallest prescaler fitting a tick in TMR0
+// (1:4 at 4MHz, 1:8 at 8MHz, 1:32 at 20MHz)
+#if TIMER0_TICK_CYCLES <= 2UL * 256
+#define TIMER0_TICK_PS 0
+#elif TIMER0_TICK_CYCLES <= 4UL * 256
+#define TIMER0_TICK_PS 1
+#elif TIMER0_TICK_CYCLES <= 8UL * 256
+#define TIMER0_TICK_PS 2
+#elif TIMER0_TICK_CYCLES <= 16UL * 256
+#define TIMER0_TICK_PS 3
+#elif TIMER0_TICK_CYCLES <= 32UL * 256
+#define TIMER0_TICK_PS 4
+#elif TIMER0_TICK_CYCLES <= 64UL * 256
+#define TIMER0_TICK_PS 5
+#elif TIMER0_TICK_CYCLES <= 128UL * 256
+#define TIMER0_TICK_PS 6
+#elif TIMER0_TICK_CYCLES <= 256UL * 256
+#define TIMER0_TICK_PS 7
+#else
+#error "TIMER0_TICK_MS is too long for Timer0 at this _XTAL_FREQ (more than 256 counts at 1:256)"
+#endif
+
+// Timer0 prescaler divisor and counts per tick (250 at 4MHz)
+#define TIMER0_TICK_PRESCALE (2UL << TIMER0_TICK_PS)
+#define TIMER0_TICK_COUNTS (TIMER0_TICK_CYCLES / TIMER0_TICK_PRESCALE)
+
+#if TIMER0_TICK_COUNTS == 0 || TIMER0_TICK_COUNTS > 256
+#error "Timer0 tick does not fit in TMR0: check _XTAL_FREQ and TIMER0_TICK_MS"
+#endif
+#if (TIMER0_TICK_CYCLES % TIMER0_TICK_PRESCALE) != 0
+#warning "_XTAL_FREQ is not a multiple of the Timer0 tick prescaler: the tick is rounded down"
+#endif
+
+// Value added to TMR0 on each tick interrupt
+#define TIMER0_TICK_RELOAD ((unsigned char)(256 - TIMER0_TICK_COUNTS))
+
+// Timer0 counts per millisecond for delays (1:4 prescaler, 250 at 4MHz),
+// exact when _XTAL_FREQ (board_build.f_cpu) is a multiple of 16kHz
+#define TIMER0_DELAY_COUNTS_PER_MS (_XTAL_FREQ / 4UL / 4UL / 1000UL)
+
+#if (_XTAL_FREQ % 16000UL) != 0
+#warning "_XTAL_FREQ is not a multiple of 16kHz: Timer0 delays are rounded down"
+#endif
+
+// Timer0 overflows and final TMR0 value of a delay (folded at compile time)
+#define TIMER0_DELAY_COUNTS(ms)    ((unsigned long)(ms) * TIMER0_DELAY_COUNTS_PER_MS)
+#define TIMER0_DELAY_OVERFLOWS(ms) ((unsigned int)(TIMER0_DELAY_COUNTS(ms) >> 8))
+#define TIMER0_DELAY_REMAINDER(ms) ((unsigned char)(TIMER0_DELAY_COUNTS(ms) & 0xFF))
+
+// Timer0 struct (transpiled from C++ class)
+typedef struct Timer0 {
+    bool initialized : 1;
+    bool tickRunning : 1;
+    volatile unsigned int ticks;
+} Timer0;
+
+// Single instance (defined in main.c), accessed directly by the methods
+extern Timer0 timer;
+
+// Function prototypes (transpiled from C++ methods)
+void Timer0_init(void);
+void Timer0_startTick(void);
+void Timer0_handleInterrupt(void);
 
 #endif // TIMER0_H
@@ -102,3 +102,48 @@ void Led::blink(unsigned int count, unsigned int delayMs) {
         __delay_ms(delayMs);
     }
 }
+
+LedGroup::LedGroup()
+    : state(0),
+      shadowA(PORTA & ~LED_GROUP_PORTA_MASK),
+      shadowC(PORTC & ~LED_GROUP_PORTC_MASK) {
+    // Constructor - ports read once, one write per port, every LED off
+    PORTA = shadowA;
+    PORTC = shadowC;
+}
+
+void LedGroup::set(unsigned char mask) {
+    state |= mask;
+}
+
+void LedGroup::clear(unsigned char mask) {
+    state &= ~mask;
+}
+
+void LedGroup::toggle(unsigned char mask) {
+    state ^= mask;
+}
+
+void LedGroup::write(unsigned char mask) {
+    state = mask;
+}
+
+unsigned char LedGroup::getState() const {
+    return state;
+}
+
+void LedGroup::commit() {
+    unsigned char portA = (shadowA & ~LED_GROUP_PORTA_MASK) | LED_GROUP_PORTA_BITS(state);
+    unsigned char portC = (shadowC & ~LED_GROUP_PORTC_MASK) | LED_GROUP_PORTC_BITS(state);
+
+    // Whole-byte writes from the shadows: never read back the port pins,
+    // and only the LED bits of the port image change
+    if (portA != shadowA) {
+        shadowA = portA;
+        PORTA = shadowA;
+    }
+    if (portC != shadowC) {
+        shadowC = portC;
+        PORTC = shadowC;
+    }
+}
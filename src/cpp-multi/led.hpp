@@ -85,4 +85,81 @@ public:
     void blink(unsigned int count, unsigned int delayMs);
 };
 
+/**
+ * @brief LED bit masks for LedGroup (bit n = LED n)
+ */
+#define LED_MASK_0   0x01
+#define LED_MASK_1   0x02
+#define LED_MASK_2   0x04
+#define LED_MASK_3   0x08
+#define LED_MASK_4   0x10
+#define LED_MASK_ALL 0x1F
+
+/**
+ * @brief Port bits driven by a LED mask
+ * @details LED0 = RA3, LED1 = RA5, LED2-LED4 = RC0-RC2 (see pin_manager.h)
+ */
+#define LED_GROUP_PORTA_BITS(mask) ((unsigned char)((((mask) & LED_MASK_0) << 3) | (((mask) & LED_MASK_1) << 4)))
+#define LED_GROUP_PORTC_BITS(mask) ((unsigned char)(((mask) & LED_MASK_ALL) >> 2))
+#define LED_GROUP_PORTA_MASK       LED_GROUP_PORTA_BITS(LED_MASK_ALL)
+#define LED_GROUP_PORTC_MASK       LED_GROUP_PORTC_BITS(LED_MASK_ALL)
+
+/**
+ * @brief LED group C++ class with shadow port registers
+ * @details Bit updates only change an LED mask in RAM; commit() writes
+ *          PORTA and PORTC once each, from shadow bytes, instead of a
+ *          read-modify-write per LED. A shadow holds the whole port image:
+ *          only its LED bits change, the other outputs (RA0, RC3/4/6/7)
+ *          keep the level they had when the group was created.
+ */
+class LedGroup {
+private:
+    unsigned char state;        ///< Requested LEDs, bit n = LED n
+    unsigned char shadowA;      ///< Last value written to PORTA (whole port)
+    unsigned char shadowC;      ///< Last value written to PORTC (whole port)
+
+public:
+    /**
+     * @brief LED group constructor
+     * @details Turns every LED off
+     */
+    LedGroup();
+
+    /**
+     * @brief Turn LEDs on
+     * @param mask LED_MASK_x bits to set
+     */
+    void set(unsigned char mask);
+
+    /**
+     * @brief Turn LEDs off
+     * @param mask LED_MASK_x bits to clear
+     */
+    void clear(unsigned char mask);
+
+    /**
+     * @brief Toggle LEDs
+     * @param mask LED_MASK_x bits to invert
+     */
+    void toggle(unsigned char mask);
+
+    /**
+     * @brief Replace the whole LED pattern
+     * @param mask LED_MASK_x bits to light, all others off
+     */
+    void write(unsigned char mask);
+
+    /**
+     * @brief Get the requested LED pattern
+     * @return LED_MASK_x bits that are on (committed or not)
+     */
+    unsigned char getState() const;
+
+    /**
+     * @brief Write pending changes to the hardware
+     * @details One write per port, ports whose LEDs did not change are skipped
+     */
+    void commit();
+};
+
 #endif // LED_HPP
@@ -6,7 +6,10 @@
  * @version 1.0
  *
  * @details C++ test program for PIC16F876A with LED and button management
- *          Uses device_config, pin_manager, Timer0, Led and Button classes
+ *          Uses device_config, pin_manager, Timer0, LedGroup, ButtonBank and
+ *          Scheduler classes. The Timer0 interrupt drives a 1ms tick and
+ *          every activity is a short periodic task: buttons are debounced
+ *          at a fixed rate and the LED sequence never blocks.
  *          This file will be transpiled to C using xc8plusplus
  */
 
@@ -16,122 +19,164 @@
 #include "timer0.hpp"
 #include "led.hpp"
 #include "button.hpp"
+#include "scheduler.hpp"
+
+// Task periods and start offsets in ticks (1 tick = 1ms)
+#define BUTTON_TASK_PERIOD    5
+#define INPUT_TASK_PERIOD     10
+#define EFFECT_TASK_PERIOD    50
+#define SEQUENCE_TASK_PERIOD  100
+
+// LED sequence: 5 sweep steps followed by a 5-step (500ms) pause
+#define SEQUENCE_LEDS   5
+#define SEQUENCE_STEPS  10
+
+// Effects, in EFFECT_TASK_PERIOD steps
+#define BLINK_STEPS     6   // LED4 blinks 3 times
+#define FLASH_ON_STEP   4   // All LEDs on after 200ms...
+#define FLASH_OFF_STEP  8   // ...and off again 200ms later
 
 // Global instances - Arduino style
 Timer0 timer;
-Led led0(LedId::LED_0);
-Led led1(LedId::LED_1);
-Led led2(LedId::LED_2);
-Led led3(LedId::LED_3);
-Led led4(LedId::LED_4);
-Button button0(ButtonId::PB_0);
-Button button1(ButtonId::PB_1);
-Button button2(ButtonId::PB_2);
+Scheduler scheduler;
+LedGroup leds;
+ButtonBank buttons;
+
+// LEDs lit at each sequence step (the pause steps light none)
+const unsigned char sequencePattern[SEQUENCE_STEPS] = {
+    LED_MASK_0, LED_MASK_1, LED_MASK_2, LED_MASK_3, LED_MASK_4,
+    0, 0, 0, 0, 0
+};
+
+unsigned char sequenceStep = 0;     // 0-4: LED lit by the sweep, 5-9: pause
+unsigned char blinkSteps = 0;       // Remaining LED4 blink half-periods
+unsigned char flashStep = 0;        // Flash effect progress, 0 = idle
 
 /**
- * @brief Setup function - Arduino style initialization
- * @details Called once at startup to initialize the system
+ * @brief Button task - debounces every button at a fixed rate
+ * @details One PORTA read for all buttons
  */
-void setup(void) {
-    // System initialization
-    PIN_MANAGER_Initialize();
-    
-    // Initialize Timer0
-    timer.initialize();
-    
-    // Ensure all LEDs are off initially
-    led0.turnOff();
-    led1.turnOff();
-    led2.turnOff();
-    led3.turnOff();
-    led4.turnOff();
+void buttonTask(void) {
+    buttons.update();
 }
 
 /**
- * @brief Loop function - Arduino style main loop
- * @details Called repeatedly - contains the main program logic
+ * @brief Input task - reacts to button edges and mirrors buttons on LEDs
+ * @details Buttons are shown on the LEDs during the sequence pause
  */
-void loop(void) {
-    // Update button states (for debouncing)
-    button0.update();
-    button1.update();
-    button2.update();
-    
-    // LED test - blinking sequence using C++ methods
-    led0.turnOn();
-    __delay_ms(100);
-    led0.turnOff();
-    
-    led1.turnOn();
-    __delay_ms(100);
-    led1.turnOff();
-    
-    led2.turnOn();
-    __delay_ms(100);
-    led2.turnOff();
-    
-    led3.turnOn();
-    __delay_ms(100);
-    led3.turnOff();
-    
-    led4.turnOn();
-    __delay_ms(100);
-    led4.turnOff();
-    
-    // Pause between sequences
-    __delay_ms(500);
-    
-    // Button test using C++ button objects
-    if (button0.isPressed()) {
-        led0.turnOn();
-        led1.turnOn();
-    } else {
-        led0.turnOff();
-        led1.turnOff();
+void inputTask(void) {
+    if (buttons.wasJustPressed(BUTTON_PB0_MASK)) {
+        // Button 0 was just pressed - blink LED4 3 times
+        blinkSteps = BLINK_STEPS;
+    }
+
+    if (buttons.wasJustPressed(BUTTON_PB1_MASK)) {
+        // Button 1 was just pressed - toggle LED0
+        leds.toggle(LED_MASK_0);
     }
-    
-    if (button1.isPressed()) {
-        led2.turnOn();
-        led3.turnOn();
-    } else {
-        led2.turnOff();
-        led3.turnOff();
+
+    if (buttons.wasJustPressed(BUTTON_PB2_MASK)) {
+        // Button 2 was just pressed - flash all LEDs
+        flashStep = 1;
     }
-    
-    if (button2.isPressed()) {
-        led4.turnOn();
-    } else {
-        led4.turnOff();
+
+    if (sequenceStep < SEQUENCE_LEDS || blinkSteps != 0 || flashStep != 0) {
+        return;
     }
-    
-    // Demonstrate edge detection
-    if (button0.wasJustPressed()) {
-        // Button 0 was just pressed - blink LED4 3 times
-        led4.blink(3, 50);
+
+    unsigned char mirror = 0;
+    if (buttons.isPressed(BUTTON_PB0_MASK)) {
+        mirror |= LED_MASK_0 | LED_MASK_1;
     }
-    
-    if (button1.wasJustPressed()) {
-        // Button 1 was just pressed - toggle LED0
-        led0.toggle();
+    if (buttons.isPressed(BUTTON_PB1_MASK)) {
+        mirror |= LED_MASK_2 | LED_MASK_3;
     }
-    
-    // Use Timer0 for some delays
-    if (button2.wasJustPressed()) {
-        // Button 2 was just pressed - use Timer0 delay
-        timer.delay(200);
-        led0.turnOn();
-        led1.turnOn();
-        led2.turnOn();
-        led3.turnOn();
-        led4.turnOn();
-        timer.delay(200);
-        led0.turnOff();
-        led1.turnOff();
-        led2.turnOff();
-        led3.turnOff();
-        led4.turnOff();
+    if (buttons.isPressed(BUTTON_PB2_MASK)) {
+        mirror |= LED_MASK_4;
     }
+    leds.write(mirror);
+}
 
-    // Small delay to prevent excessive polling
-    __delay_ms(10);
+/**
+ * @brief Effect task - runs the blink and flash effects one step at a time
+ */
+void effectTask(void) {
+    if (blinkSteps != 0) {
+        leds.toggle(LED_MASK_4);
+        blinkSteps--;
+    }
+
+    if (flashStep != 0) {
+        if (flashStep == FLASH_ON_STEP) {
+            leds.write(LED_MASK_ALL);
+        } else if (flashStep == FLASH_OFF_STEP) {
+            leds.write(0);
+            flashStep = 0;
+            return;
+        }
+        flashStep++;
+    }
+}
+
+/**
+ * @brief Sequence task - advances the LED sweep by one step
+ * @details Paused while an effect owns the LEDs
+ */
+void sequenceTask(void) {
+    if (blinkSteps != 0 || flashStep != 0) {
+        return;
+    }
+
+    leds.clear(sequencePattern[sequenceStep]);
+
+    sequenceStep++;
+    if (sequenceStep == SEQUENCE_STEPS) {
+        sequenceStep = 0;
+        leds.write(0);
+    }
+
+    leds.set(sequencePattern[sequenceStep]);
+}
+
+/**
+ * @brief Interrupt service routine
+ * @details Timer0 overflow: reload and release due tasks
+ */
+void __interrupt() isr(void) {
+    if (INTCONbits.T0IE && INTCONbits.T0IF) {
+        timer.handleInterrupt();
+        scheduler.tick();
+    }
+}
+
+/**
+ * @brief Setup function - Arduino style initialization
+ * @details Called once at startup to initialize the system
+ */
+void setup(void) {
+    // System initialization
+    PIN_MANAGER_Initialize();
+
+    // Start the sequence with LED0 lit
+    leds.write(sequencePattern[0]);
+    leds.commit();
+
+    // Periodic tasks, offsets spread them over different ticks
+    scheduler.addTask(buttonTask, BUTTON_TASK_PERIOD, 0);
+    scheduler.addTask(inputTask, INPUT_TASK_PERIOD, 1);
+    scheduler.addTask(effectTask, EFFECT_TASK_PERIOD, 2);
+    scheduler.addTask(sequenceTask, SEQUENCE_TASK_PERIOD, 3);
+
+    // Start the 1ms Timer0 tick interrupt
+    timer.startTick();
+}
+
+/**
+ * @brief Loop function - Arduino style main loop
+ * @details Called repeatedly - runs the tasks released by the tick, then
+ *          writes their LED changes with one write per port
+ */
+void loop(void) {
+    scheduler.runPending();
+    leds.commit();
 }
@@ -5,18 +5,34 @@ Creates hand-optimized C code that demonstrates the xc8plusplus concept
 """
 
 import os
+import sys
+import argparse
 from pathlib import Path
 
+from transpile_passes import PASSES, optimize, parse_passes, print_report
 
-def create_manual_transpiled_c():
+# --profile support lives with the other build tooling in draft/
+draft_dir = str(Path(__file__).resolve().parent.parent.parent / "draft")
+if draft_dir not in sys.path:
+    sys.path.append(draft_dir)
+
+from profiling import StageProfiler, add_arguments as add_profile_arguments
+
+# C headers shared with src/multi, included from src/common (-I src/common)
+COMMON_DIR = Path(__file__).resolve().parent.parent / "common"
+SHARED_HEADERS = ["device_config.h", "pin_manager.h"]
+
+
+def create_manual_transpiled_c(output_dir=None, passes=PASSES, profiler=None):
     """Create manually transpiled C files from C++ sources"""
+    profiler = profiler or StageProfiler(None, "manual_transpile")
 
     # Define source and output directories
     cpp_multi_dir = Path(__file__).parent
-    output_dir = cpp_multi_dir / "generated_c"
+    output_dir = Path(output_dir) if output_dir else cpp_multi_dir / "generated_c"
 
     # Create output directory if it doesn't exist
-    output_dir.mkdir(exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     print("*** Manual C++ to C Transpilation for cpp-multi project")
     print("=" * 55)
@@ -42,6 +58,8 @@ def create_manual_transpiled_c():
 // Constructor for Timer0
 void Timer0_init(Timer0* self) {
     self->initialized = false;
+    self->tickRunning = false;
+    self->ticks = 0;
 }
 
 // Destructor for Timer0
@@ -54,14 +72,14 @@ void Timer0_cleanup(Timer0* self) {
 // Method: initialize
 void Timer0_initialize(Timer0* self) {
     // Configure Timer0
-    // Timer0 configuration for 4MHz oscillator (1MHz instruction cycle)
-    // Prescaler 1:256, Timer0 = internal clock
+    // Prescaler 1:4, Timer0 = internal clock: TIMER0_DELAY_COUNTS_PER_MS
+    // counts per millisecond (250 at 4MHz)
     
     OPTION_REGbits.T0CS = 0;    // Timer0 clock source = internal instruction cycle
     OPTION_REGbits.T0SE = 0;    // Timer0 source edge = increment on low-to-high transition
     OPTION_REGbits.PSA = 0;     // Prescaler assigned to Timer0
-    OPTION_REGbits.PS2 = 1;     // Prescaler rate select bits
-    OPTION_REGbits.PS1 = 1;     // 111 = 1:256 prescaler
+    OPTION_REGbits.PS2 = 0;     // Prescaler rate select bits
+    OPTION_REGbits.PS1 = 0;     // 001 = 1:4 prescaler
     OPTION_REGbits.PS0 = 1;
     
     TMR0 = 0;                   // Clear Timer0 register
@@ -80,20 +98,14 @@ void Timer0_delay50ms(Timer0* self) {
     if (!self->initialized) {
         return;
     }
-    
-    // For 50ms delay with 4MHz clock (1MHz instruction cycle) and 1:256 prescaler:
-    // Timer0 increments every 256 instruction cycles = 256us
-    // For 50ms delay: 50000us / 256us = 195.3 approx 195 counts
-    // Load Timer0 with (256 - 195) = 61
-    
-    TMR0 = 61;                  // Load Timer0 for 50ms delay
-    INTCONbits.T0IF = 0;        // Clear overflow flag
-    
-    while (!INTCONbits.T0IF) {  // Wait for Timer0 overflow
-        // Wait for overflow
+
+    if (self->tickRunning) {
+        Timer0_delay(self, 50);     // Timer0 is owned by the tick interrupt
+        return;
     }
-    
-    INTCONbits.T0IF = 0;        // Clear overflow flag
+
+    // 50ms = 12500 counts at 4MHz: 48 overflows + 212 counts
+    TIMER0_DELAY_MS(self, 50);
 }
 
 // Method: delay
@@ -101,32 +113,67 @@ void Timer0_delay(Timer0* self, unsigned int milliseconds) {
     if (!self->initialized) {
         return;
     }
-    
-    // Delay using multiple 50ms delays for accuracy
-    unsigned int fiftyMsCount = milliseconds / 50;
-    unsigned int remainder = milliseconds % 50;
-    
-    // Perform 50ms delays
-    for (unsigned int i = 0; i < fiftyMsCount; i++) {
-        Timer0_delay50ms(self);
+
+    if (self->tickRunning) {
+        // Wait on the tick counter (wraparound-safe subtraction)
+        unsigned int start = Timer0_getTicks(self);
+        while (Timer0_getTicks(self) - start < milliseconds / TIMER0_TICK_MS) {
+            // Interrupts keep running meanwhile
+        }
+        return;
     }
     
-    // Handle remainder using proportional calculation
-    if (remainder > 0) {
-        // Calculate Timer0 load value for remainder
-        // remainder ms = remainder * 1000us
-        // Timer0 counts needed = (remainder * 1000) / 256
-        unsigned int counts = (remainder * 1000) / 256;
-        if (counts > 255) counts = 255;
-        
-        TMR0 = 256 - counts;
-        INTCONbits.T0IF = 0;
-        
+    // Timer0 runs freely from here: each millisecond moves the target
+    // TMR0 value by TIMER0_DELAY_COUNTS_PER_MS counts, and the overflows
+    // it carries into are waited for as they come.
+    unsigned int overflows = 0;
+    unsigned char target = 0;
+
+    TMR0 = 0;
+    INTCONbits.T0IF = 0;
+
+    while (milliseconds != 0) {
+        unsigned char previous = target;
+        overflows += TIMER0_DELAY_OVERFLOWS(1);
+        target += TIMER0_DELAY_REMAINDER(1);
+        if (target < previous) {
+            overflows++;        // Carry out of the 8-bit target
+        }
+        milliseconds--;
+
+        while (overflows != 0) {
+            while (!INTCONbits.T0IF) {
+                // Wait for overflow
+            }
+            INTCONbits.T0IF = 0;
+            overflows--;
+        }
+    }
+
+    while (TMR0 < target) {
+        // Wait for the last partial period
+    }
+}
+
+// Method: delayCounts
+void Timer0_delayCounts(Timer0* self, unsigned int overflows, unsigned char remainder) {
+    if (!self->initialized || self->tickRunning) {
+        return;
+    }
+
+    TMR0 = 0;                   // Start of the delay (also clears the prescaler)
+    INTCONbits.T0IF = 0;
+
+    while (overflows != 0) {
         while (!INTCONbits.T0IF) {
             // Wait for overflow
         }
-        
         INTCONbits.T0IF = 0;
+        overflows--;
+    }
+
+    while (TMR0 < remainder) {
+        // Wait for the last partial period
     }
 }
 
@@ -159,6 +206,42 @@ unsigned char Timer0_getValue(Timer0* self) {
     }
     return 0;
 }
+
+// Method: startTick
+void Timer0_startTick(Timer0* self) {
+    // Prescaler picked from _XTAL_FREQ so that one tick is
+    // TIMER0_TICK_COUNTS counts (1:4 at 4MHz)
+    OPTION_REGbits.T0CS = 0;    // Internal instruction cycle clock
+    OPTION_REGbits.PSA = 0;     // Prescaler assigned to Timer0
+    OPTION_REGbits.PS2 = (TIMER0_TICK_PS >> 2) & 1;
+    OPTION_REGbits.PS1 = (TIMER0_TICK_PS >> 1) & 1;
+    OPTION_REGbits.PS0 = TIMER0_TICK_PS & 1;
+
+    self->ticks = 0;
+    TMR0 = TIMER0_TICK_RELOAD;
+    INTCONbits.T0IF = 0;
+    INTCONbits.T0IE = 1;        // Enable Timer0 interrupt
+    INTCONbits.GIE = 1;         // Enable global interrupts
+
+    self->initialized = true;
+    self->tickRunning = true;
+}
+
+// Method: handleInterrupt
+void Timer0_handleInterrupt(Timer0* self) {
+    TMR0 += TIMER0_TICK_RELOAD;
+    INTCONbits.T0IF = 0;
+    self->ticks++;
+}
+
+// Method: getTicks
+unsigned int Timer0_getTicks(Timer0* self) {
+    unsigned int value;
+    INTCONbits.GIE = 0;         // 16-bit read must not be torn by the ISR
+    value = self->ticks;
+    INTCONbits.GIE = 1;
+    return value;
+}
 """
 
     # Create transpiled led.c
@@ -274,6 +357,60 @@ void Led_blink(Led* self, unsigned int count, unsigned int delayMs) {
         __delay_ms(delayMs);
     }
 }
+
+// === Class LedGroup transformed to C ===
+
+// Constructor for LedGroup
+void LedGroup_init(LedGroup* self) {
+    self->state = 0;
+    self->shadowA = PORTA & ~LED_GROUP_PORTA_MASK;
+    self->shadowC = PORTC & ~LED_GROUP_PORTC_MASK;
+    // Ports read once, one write per port, every LED off
+    PORTA = self->shadowA;
+    PORTC = self->shadowC;
+}
+
+// Method: set
+void LedGroup_set(LedGroup* self, unsigned char mask) {
+    self->state |= mask;
+}
+
+// Method: clear
+void LedGroup_clear(LedGroup* self, unsigned char mask) {
+    self->state &= ~mask;
+}
+
+// Method: toggle
+void LedGroup_toggle(LedGroup* self, unsigned char mask) {
+    self->state ^= mask;
+}
+
+// Method: write
+void LedGroup_write(LedGroup* self, unsigned char mask) {
+    self->state = mask;
+}
+
+// Method: getState
+unsigned char LedGroup_getState(LedGroup* self) {
+    return self->state;
+}
+
+// Method: commit
+void LedGroup_commit(LedGroup* self) {
+    unsigned char portA = (self->shadowA & ~LED_GROUP_PORTA_MASK) | LED_GROUP_PORTA_BITS(self->state);
+    unsigned char portC = (self->shadowC & ~LED_GROUP_PORTC_MASK) | LED_GROUP_PORTC_BITS(self->state);
+
+    // Whole-byte writes from the shadows: never read back the port pins,
+    // and only the LED bits of the port image change
+    if (portA != self->shadowA) {
+        self->shadowA = portA;
+        PORTA = self->shadowA;
+    }
+    if (portC != self->shadowC) {
+        self->shadowC = portC;
+        PORTC = self->shadowC;
+    }
+}
 """
 
     # Create transpiled button.c
@@ -378,6 +515,59 @@ bool Button_readHardwareState(Button* self) {
             return false;
     }
 }
+
+// === Class ButtonBank transformed to C ===
+
+// Constructor for ButtonBank
+void ButtonBank_init(ButtonBank* self) {
+    self->state = 0;
+    self->count0 = 0xFF;
+    self->count1 = 0xFF;
+    self->pressed = 0;
+    self->released = 0;
+}
+
+// Method: update
+void ButtonBank_update(ButtonBank* self) {
+    // Single port read; pull-ups make a pressed button read as 0
+    unsigned char sample = (unsigned char)(~BUTTON_BANK_PORT) & BUTTON_BANK_MASK;
+
+    // Bits whose sample differs from the debounced state count down,
+    // the others reset their counter to 3
+    unsigned char changed = sample ^ self->state;
+    self->count0 = ~(self->count0 & changed);
+    self->count1 = self->count0 ^ (self->count1 & changed);
+
+    // Counter rolled over: accept the new level
+    changed &= self->count0 & self->count1;
+    self->state ^= changed;
+    self->pressed |= self->state & changed;
+    self->released |= ~self->state & changed;
+}
+
+// Method: isPressed
+unsigned char ButtonBank_isPressed(ButtonBank* self, unsigned char mask) {
+    return self->state & mask;
+}
+
+// Method: wasJustPressed
+unsigned char ButtonBank_wasJustPressed(ButtonBank* self, unsigned char mask) {
+    unsigned char edges = self->pressed & mask;
+    self->pressed &= ~mask;
+    return edges;
+}
+
+// Method: wasJustReleased
+unsigned char ButtonBank_wasJustReleased(ButtonBank* self, unsigned char mask) {
+    unsigned char edges = self->released & mask;
+    self->released &= ~mask;
+    return edges;
+}
+
+// Method: getState
+unsigned char ButtonBank_getState(ButtonBank* self) {
+    return self->state;
+}
 """
 
     # Create transpiled main.c
@@ -395,127 +585,257 @@ bool Button_readHardwareState(Button* self) {
 #include "timer0.h"
 #include "led.h"
 #include "button.h"
+#include "scheduler.h"
+
+// Task periods and start offsets in ticks (1 tick = 1ms)
+#define BUTTON_TASK_PERIOD    5
+#define INPUT_TASK_PERIOD     10
+#define EFFECT_TASK_PERIOD    50
+#define SEQUENCE_TASK_PERIOD  100
+
+// LED sequence: 5 sweep steps followed by a 5-step (500ms) pause
+#define SEQUENCE_LEDS   5
+#define SEQUENCE_STEPS  10
+
+// Effects, in EFFECT_TASK_PERIOD steps
+#define BLINK_STEPS     6   // LED4 blinks 3 times
+#define FLASH_ON_STEP   4   // All LEDs on after 200ms...
+#define FLASH_OFF_STEP  8   // ...and off again 200ms later
+
+// Global instances (transpiled from C++ globals, constructed in setup)
+Timer0 timer;
+Scheduler scheduler;
+LedGroup leds;
+ButtonBank buttons;
+
+// LEDs lit at each sequence step (the pause steps light none)
+const unsigned char sequencePattern[SEQUENCE_STEPS] = {
+    LED_MASK_0, LED_MASK_1, LED_MASK_2, LED_MASK_3, LED_MASK_4,
+    0, 0, 0, 0, 0
+};
+
+unsigned char sequenceStep = 0;     // 0-4: LED lit by the sweep, 5-9: pause
+unsigned char blinkSteps = 0;       // Remaining LED4 blink half-periods
+unsigned char flashStep = 0;        // Flash effect progress, 0 = idle
+
+// Task: debounce every button at a fixed rate (one PORTA read)
+void buttonTask(void) {
+    ButtonBank_update(&buttons);
+}
+
+// Task: react to button edges and mirror buttons on LEDs during the pause
+void inputTask(void) {
+    if (ButtonBank_wasJustPressed(&buttons, BUTTON_PB0_MASK)) {
+        // Button 0 was just pressed - blink LED4 3 times
+        blinkSteps = BLINK_STEPS;
+    }
+
+    if (ButtonBank_wasJustPressed(&buttons, BUTTON_PB1_MASK)) {
+        // Button 1 was just pressed - toggle LED0
+        LedGroup_toggle(&leds, LED_MASK_0);
+    }
+
+    if (ButtonBank_wasJustPressed(&buttons, BUTTON_PB2_MASK)) {
+        // Button 2 was just pressed - flash all LEDs
+        flashStep = 1;
+    }
+
+    if (sequenceStep < SEQUENCE_LEDS || blinkSteps != 0 || flashStep != 0) {
+        return;
+    }
+
+    unsigned char mirror = 0;
+    if (ButtonBank_isPressed(&buttons, BUTTON_PB0_MASK)) {
+        mirror |= LED_MASK_0 | LED_MASK_1;
+    }
+    if (ButtonBank_isPressed(&buttons, BUTTON_PB1_MASK)) {
+        mirror |= LED_MASK_2 | LED_MASK_3;
+    }
+    if (ButtonBank_isPressed(&buttons, BUTTON_PB2_MASK)) {
+        mirror |= LED_MASK_4;
+    }
+    LedGroup_write(&leds, mirror);
+}
+
+// Task: run the blink and flash effects one step at a time
+void effectTask(void) {
+    if (blinkSteps != 0) {
+        LedGroup_toggle(&leds, LED_MASK_4);
+        blinkSteps--;
+    }
+
+    if (flashStep != 0) {
+        if (flashStep == FLASH_ON_STEP) {
+            LedGroup_write(&leds, LED_MASK_ALL);
+        } else if (flashStep == FLASH_OFF_STEP) {
+            LedGroup_write(&leds, 0);
+            flashStep = 0;
+            return;
+        }
+        flashStep++;
+    }
+}
+
+// Task: advance the LED sweep by one step (paused while an effect runs)
+void sequenceTask(void) {
+    if (blinkSteps != 0 || flashStep != 0) {
+        return;
+    }
+
+    LedGroup_clear(&leds, sequencePattern[sequenceStep]);
+
+    sequenceStep++;
+    if (sequenceStep == SEQUENCE_STEPS) {
+        sequenceStep = 0;
+        LedGroup_write(&leds, 0);
+    }
+
+    LedGroup_set(&leds, sequencePattern[sequenceStep]);
+}
+
+// Interrupt service routine: Timer0 overflow reloads and releases due tasks
+void __interrupt() isr(void) {
+    if (INTCONbits.T0IE && INTCONbits.T0IF) {
+        Timer0_handleInterrupt(&timer);
+        Scheduler_tick(&scheduler);
+    }
+}
+
+// Function: setup
+void setup(void) {
+    // Construct global instances
+    Timer0_init(&timer);
+    Scheduler_init(&scheduler);
+    LedGroup_init(&leds);
+    ButtonBank_init(&buttons);
+
+    // System initialization
+    PIN_MANAGER_Initialize();
+
+    // Start the sequence with LED0 lit
+    LedGroup_write(&leds, sequencePattern[0]);
+    LedGroup_commit(&leds);
+
+    // Periodic tasks, offsets spread them over different ticks
+    Scheduler_addTask(&scheduler, buttonTask, BUTTON_TASK_PERIOD, 0);
+    Scheduler_addTask(&scheduler, inputTask, INPUT_TASK_PERIOD, 1);
+    Scheduler_addTask(&scheduler, effectTask, EFFECT_TASK_PERIOD, 2);
+    Scheduler_addTask(&scheduler, sequenceTask, SEQUENCE_TASK_PERIOD, 3);
+
+    // Start the 1ms Timer0 tick interrupt
+    Timer0_startTick(&timer);
+}
+
+// Function: loop (runs released tasks, then one LED write per port)
+void loop(void) {
+    Scheduler_runPending(&scheduler);
+    LedGroup_commit(&leds);
+}
 
 /**
  * @brief Main C program (transpiled from C++)
- * @details Initializes the system and runs the main loop using transpiled C++ classes
+ * @details Arduino-style entry point: setup() once, then loop() forever
  */
 void main(void) {
-    // System initialization
-    PIN_MANAGER_Initialize();
-    
-    // Create Timer0 instance and initialize
-    Timer0 timer;
-    Timer0_init(&timer);
-    Timer0_initialize(&timer);
-    
-    // Create LED instances
-    Led led0, led1, led2, led3, led4;
-    Led_init(&led0, LED_0);
-    Led_init(&led1, LED_1);
-    Led_init(&led2, LED_2);
-    Led_init(&led3, LED_3);
-    Led_init(&led4, LED_4);
-    
-    // Create Button instances
-    Button button0, button1, button2;
-    Button_init(&button0, PB_0);
-    Button_init(&button1, PB_1);
-    Button_init(&button2, PB_2);
-    
-    // Ensure all LEDs are off initially
-    Led_turnOff(&led0);
-    Led_turnOff(&led1);
-    Led_turnOff(&led2);
-    Led_turnOff(&led3);
-    Led_turnOff(&led4);
-    
-    // Main loop
+    setup();
     while(1) {
-        // Update button states (for debouncing)
-        Button_update(&button0);
-        Button_update(&button1);
-        Button_update(&button2);
-        
-        // LED test - blinking sequence using transpiled C++ methods
-        Led_turnOn(&led0);
-        __delay_ms(100);
-        Led_turnOff(&led0);
-        
-        Led_turnOn(&led1);
-        __delay_ms(100);
-        Led_turnOff(&led1);
-        
-        Led_turnOn(&led2);
-        __delay_ms(100);
-        Led_turnOff(&led2);
-        
-        Led_turnOn(&led3);
-        __delay_ms(100);
-        Led_turnOff(&led3);
-        
-        Led_turnOn(&led4);
-        __delay_ms(100);
-        Led_turnOff(&led4);
-        
-        // Pause between sequences
-        __delay_ms(500);
-        
-        // Button test using transpiled C++ button objects
-        if (Button_isPressed(&button0)) {
-            Led_turnOn(&led0);
-            Led_turnOn(&led1);
-        } else {
-            Led_turnOff(&led0);
-            Led_turnOff(&led1);
-        }
-        
-        if (Button_isPressed(&button1)) {
-            Led_turnOn(&led2);
-            Led_turnOn(&led3);
-        } else {
-            Led_turnOff(&led2);
-            Led_turnOff(&led3);
+        loop();
+    }
+}
+"""
+
+    # Create transpiled scheduler.c
+    scheduler_c = """/*
+ * XC8 C++ to C Transpilation - Scheduler
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Scheduler
+ */
+
+#include <stdint.h>
+#include <stdbool.h>
+#include <xc.h>
+#include "scheduler.h"
+
+// === Class Scheduler transformed to C ===
+
+// Constructor for Scheduler
+void Scheduler_init(Scheduler* self) {
+    self->taskCount = 0;
+    self->now = 0;
+    self->overruns = 0;
+}
+
+// Method: addTask
+bool Scheduler_addTask(Scheduler* self, TaskFunction function, unsigned int period, unsigned int offset) {
+    if (self->taskCount >= SCHEDULER_MAX_TASKS) {
+        return false;
+    }
+
+    Task* task = &self->tasks[self->taskCount];
+    task->function = function;
+    task->period = period;
+    task->countdown = offset + 1;
+    task->deadline = 0;
+    task->ready = false;
+    self->taskCount++;
+    return true;
+}
+
+// Method: tick
+void Scheduler_tick(Scheduler* self) {
+    // Interrupt context: only release tasks, never run them here
+    self->now++;
+    for (unsigned char i = 0; i < self->taskCount; i++) {
+        Task* task = &self->tasks[i];
+        if (--task->countdown == 0) {
+            task->countdown = task->period;
+            if (task->ready) {
+                self->overruns++;   // Previous release has not run yet
+            }
+            task->deadline = self->now + task->period;
+            task->ready = true;
         }
-        
-        if (Button_isPressed(&button2)) {
-            Led_turnOn(&led4);
-        } else {
-            Led_turnOff(&led4);
+    }
+}
+
+// Method: runPending
+void Scheduler_runPending(Scheduler* self) {
+    while (true) {
+        // Pick the released task with the earliest deadline. Interrupts are
+        // masked so the 16-bit deadlines are read consistently.
+        Task* next = NULL;
+        INTCONbits.GIE = 0;
+        for (unsigned char i = 0; i < self->taskCount; i++) {
+            Task* task = &self->tasks[i];
+            if (task->ready && (next == NULL || (int)(task->deadline - next->deadline) < 0)) {
+                next = task;
+            }
         }
-        
-        // Demonstrate edge detection
-        if (Button_wasJustPressed(&button0)) {
-            // Button 0 was just pressed - blink LED4 3 times
-            Led_blink(&led4, 3, 50);
+        if (next != NULL) {
+            next->ready = false;
         }
-        
-        if (Button_wasJustPressed(&button1)) {
-            // Button 1 was just pressed - toggle LED0
-            Led_toggle(&led0);
-        }
-        
-        // Use Timer0 for some delays
-        if (Button_wasJustPressed(&button2)) {
-            // Button 2 was just pressed - use Timer0 delay
-            Timer0_delay(&timer, 200);
-            Led_turnOn(&led0);
-            Led_turnOn(&led1);
-            Led_turnOn(&led2);
-            Led_turnOn(&led3);
-            Led_turnOn(&led4);
-            Timer0_delay(&timer, 200);
-            Led_turnOff(&led0);
-            Led_turnOff(&led1);
-            Led_turnOff(&led2);
-            Led_turnOff(&led3);
-            Led_turnOff(&led4);
+        INTCONbits.GIE = 1;
+
+        if (next == NULL) {
+            return;
         }
-        
-        // Small delay to prevent excessive polling
-        __delay_ms(10);
+        next->function();
     }
 }
+
+// Method: getTicks
+unsigned int Scheduler_getTicks(Scheduler* self) {
+    unsigned int ticks;
+    INTCONbits.GIE = 0;
+    ticks = self->now;
+    INTCONbits.GIE = 1;
+    return ticks;
+}
+
+// Method: getOverruns
+unsigned char Scheduler_getOverruns(Scheduler* self) {
+    return self->overruns;
+}
 """
 
     # Create C header files
@@ -530,10 +850,72 @@ void main(void) {
 
 #include <stdint.h>
 #include <stdbool.h>
+#include "device_config.h"
+
+// Tick period of the Timer0 interrupt, in milliseconds
+#define TIMER0_TICK_MS 1
+
+// Instruction cycles per tick (1000 at 4MHz)
+#define TIMER0_TICK_CYCLES (_XTAL_FREQ / 4UL / 1000UL * TIMER0_TICK_MS)
+
+// PS2:PS0 of the tick: the smallest prescaler fitting a tick in TMR0
+// (1:4 at 4MHz, 1:8 at 8MHz, 1:32 at 20MHz)
+#if TIMER0_TICK_CYCLES <= 2UL * 256
+#define TIMER0_TICK_PS 0
+#elif TIMER0_TICK_CYCLES <= 4UL * 256
+#define TIMER0_TICK_PS 1
+#elif TIMER0_TICK_CYCLES <= 8UL * 256
+#define TIMER0_TICK_PS 2
+#elif TIMER0_TICK_CYCLES <= 16UL * 256
+#define TIMER0_TICK_PS 3
+#elif TIMER0_TICK_CYCLES <= 32UL * 256
+#define TIMER0_TICK_PS 4
+#elif TIMER0_TICK_CYCLES <= 64UL * 256
+#define TIMER0_TICK_PS 5
+#elif TIMER0_TICK_CYCLES <= 128UL * 256
+#define TIMER0_TICK_PS 6
+#elif TIMER0_TICK_CYCLES <= 256UL * 256
+#define TIMER0_TICK_PS 7
+#else
+#error "TIMER0_TICK_MS is too long for Timer0 at this _XTAL_FREQ (more than 256 counts at 1:256)"
+#endif
+
+// Timer0 prescaler divisor and counts per tick (250 at 4MHz)
+#define TIMER0_TICK_PRESCALE (2UL << TIMER0_TICK_PS)
+#define TIMER0_TICK_COUNTS (TIMER0_TICK_CYCLES / TIMER0_TICK_PRESCALE)
+
+#if TIMER0_TICK_COUNTS == 0 || TIMER0_TICK_COUNTS > 256
+#error "Timer0 tick does not fit in TMR0: check _XTAL_FREQ and TIMER0_TICK_MS"
+#endif
+#if (TIMER0_TICK_CYCLES % TIMER0_TICK_PRESCALE) != 0
+#warning "_XTAL_FREQ is not a multiple of the Timer0 tick prescaler: the tick is rounded down"
+#endif
+
+// Value added to TMR0 on each tick interrupt
+#define TIMER0_TICK_RELOAD ((unsigned char)(256 - TIMER0_TICK_COUNTS))
+
+// Timer0 counts per millisecond for delays (1:4 prescaler, 250 at 4MHz),
+// exact when _XTAL_FREQ (board_build.f_cpu) is a multiple of 16kHz
+#define TIMER0_DELAY_COUNTS_PER_MS (_XTAL_FREQ / 4UL / 4UL / 1000UL)
+
+#if (_XTAL_FREQ % 16000UL) != 0
+#warning "_XTAL_FREQ is not a multiple of 16kHz: Timer0 delays are rounded down"
+#endif
+
+// Timer0 overflows and final TMR0 value of a delay (folded at compile time)
+#define TIMER0_DELAY_COUNTS(ms)    ((unsigned long)(ms) * TIMER0_DELAY_COUNTS_PER_MS)
+#define TIMER0_DELAY_OVERFLOWS(ms) ((unsigned int)(TIMER0_DELAY_COUNTS(ms) >> 8))
+#define TIMER0_DELAY_REMAINDER(ms) ((unsigned char)(TIMER0_DELAY_COUNTS(ms) & 0xFF))
+
+// Delay for a constant number of milliseconds (busy-wait mode only)
+#define TIMER0_DELAY_MS(self, ms) \\
+    Timer0_delayCounts((self), TIMER0_DELAY_OVERFLOWS(ms), TIMER0_DELAY_REMAINDER(ms))
 
 // Timer0 struct (transpiled from C++ class)
 typedef struct Timer0 {
     bool initialized;
+    bool tickRunning;
+    volatile unsigned int ticks;
 } Timer0;
 
 // Function prototypes (transpiled from C++ methods)
@@ -543,10 +925,14 @@ void Timer0_initialize(Timer0* self);
 bool Timer0_isInitialized(Timer0* self);
 void Timer0_delay50ms(Timer0* self);
 void Timer0_delay(Timer0* self, unsigned int milliseconds);
+void Timer0_delayCounts(Timer0* self, unsigned int overflows, unsigned char remainder);
 void Timer0_start(Timer0* self);
 void Timer0_stop(Timer0* self);
 void Timer0_reset(Timer0* self);
 unsigned char Timer0_getValue(Timer0* self);
+void Timer0_startTick(Timer0* self);
+void Timer0_handleInterrupt(Timer0* self);
+unsigned int Timer0_getTicks(Timer0* self);
 
 #endif // TIMER0_H
 """
@@ -589,6 +975,37 @@ bool Led_isOn(Led* self);
 LedId_t Led_getId(Led* self);
 void Led_blink(Led* self, unsigned int count, unsigned int delayMs);
 
+// LED bit masks for LedGroup (bit n = LED n)
+#define LED_MASK_0   0x01
+#define LED_MASK_1   0x02
+#define LED_MASK_2   0x04
+#define LED_MASK_3   0x08
+#define LED_MASK_4   0x10
+#define LED_MASK_ALL 0x1F
+
+// Port bits driven by a LED mask: LED0 = RA3, LED1 = RA5, LED2-LED4 = RC0-RC2
+#define LED_GROUP_PORTA_BITS(mask) ((unsigned char)((((mask) & LED_MASK_0) << 3) | (((mask) & LED_MASK_1) << 4)))
+#define LED_GROUP_PORTC_BITS(mask) ((unsigned char)(((mask) & LED_MASK_ALL) >> 2))
+#define LED_GROUP_PORTA_MASK       LED_GROUP_PORTA_BITS(LED_MASK_ALL)
+#define LED_GROUP_PORTC_MASK       LED_GROUP_PORTC_BITS(LED_MASK_ALL)
+
+// LedGroup struct (transpiled from C++ class): LED mask plus one shadow
+// byte per port (the whole port image, only its LED bits change),
+// committed with a single write per port
+typedef struct LedGroup {
+    unsigned char state;        // Requested LEDs, bit n = LED n
+    unsigned char shadowA;      // Last value written to PORTA (whole port)
+    unsigned char shadowC;      // Last value written to PORTC (whole port)
+} LedGroup;
+
+void LedGroup_init(LedGroup* self);
+void LedGroup_set(LedGroup* self, unsigned char mask);
+void LedGroup_clear(LedGroup* self, unsigned char mask);
+void LedGroup_toggle(LedGroup* self, unsigned char mask);
+void LedGroup_write(LedGroup* self, unsigned char mask);
+unsigned char LedGroup_getState(LedGroup* self);
+void LedGroup_commit(LedGroup* self);
+
 #endif // LED_H
 """
 
@@ -639,7 +1056,80 @@ ButtonId_t Button_getId(Button* self);
 ButtonState_t Button_getState(Button* self);
 bool Button_readHardwareState(Button* self);
 
+// Port read by ButtonBank (PB0-PB2 are on PORTA)
+#define BUTTON_BANK_PORT PORTA
+
+// Button bit masks within BUTTON_BANK_PORT
+#define BUTTON_PB0_MASK  0x04   // RA2
+#define BUTTON_PB1_MASK  0x02   // RA1
+#define BUTTON_PB2_MASK  0x10   // RA4
+#define BUTTON_BANK_MASK (BUTTON_PB0_MASK | BUTTON_PB1_MASK | BUTTON_PB2_MASK)
+
+// ButtonBank struct (transpiled from C++ class): 2-bit vertical counters
+// debounce up to 8 buttons from a single port read
+typedef struct ButtonBank {
+    unsigned char state;        // Debounced state, 1 = pressed
+    unsigned char count0;       // Vertical counter, bit 0
+    unsigned char count1;       // Vertical counter, bit 1
+    unsigned char pressed;      // Press edges not yet consumed
+    unsigned char released;     // Release edges not yet consumed
+} ButtonBank;
+
+void ButtonBank_init(ButtonBank* self);
+void ButtonBank_update(ButtonBank* self);
+unsigned char ButtonBank_isPressed(ButtonBank* self, unsigned char mask);
+unsigned char ButtonBank_wasJustPressed(ButtonBank* self, unsigned char mask);
+unsigned char ButtonBank_wasJustReleased(ButtonBank* self, unsigned char mask);
+unsigned char ButtonBank_getState(ButtonBank* self);
+
 #endif // BUTTON_H
+"""
+
+    scheduler_h = """/*
+ * XC8 C++ to C Transpilation - Scheduler Header
+ * Generated using manual transpilation to demonstrate xc8plusplus concept
+ * Original C++ class: Scheduler
+ */
+
+#ifndef SCHEDULER_H
+#define SCHEDULER_H
+
+#include <stdint.h>
+#include <stdbool.h>
+#include <stddef.h>
+
+// Maximum number of periodic tasks
+#define SCHEDULER_MAX_TASKS 6
+
+// Task entry point (runs to completion, must not block)
+typedef void (*TaskFunction)(void);
+
+// Periodic task descriptor
+typedef struct Task {
+    TaskFunction function;
+    unsigned int period;
+    unsigned int countdown;
+    unsigned int deadline;
+    volatile bool ready;
+} Task;
+
+// Scheduler struct (transpiled from C++ class)
+typedef struct Scheduler {
+    Task tasks[SCHEDULER_MAX_TASKS];
+    unsigned char taskCount;
+    volatile unsigned int now;
+    unsigned char overruns;
+} Scheduler;
+
+// Function prototypes (transpiled from C++ methods)
+void Scheduler_init(Scheduler* self);
+bool Scheduler_addTask(Scheduler* self, TaskFunction function, unsigned int period, unsigned int offset);
+void Scheduler_tick(Scheduler* self);
+void Scheduler_runPending(Scheduler* self);
+unsigned int Scheduler_getTicks(Scheduler* self);
+unsigned char Scheduler_getOverruns(Scheduler* self);
+
+#endif // SCHEDULER_H
 """
 
     # Write all files
@@ -648,23 +1138,34 @@ bool Button_readHardwareState(Button* self);
         "led.c": led_c,
         "button.c": button_c,
         "main.c": main_c,
+        "scheduler.c": scheduler_c,
         "timer0.h": timer0_h,
         "led.h": led_h,
         "button.h": button_h,
+        "scheduler.h": scheduler_h,
     }
 
-    for filename, content in files.items():
-        output_file = output_dir / filename
-        output_file.write_text(content, encoding="utf-8")
-        print(f"[OK] Created: {filename}")
-
-    # Copy device_config.h and pin_manager.h
-    for h_file in ["device_config.h", "pin_manager.h"]:
-        src_file = cpp_multi_dir / h_file
-        dst_file = output_dir / h_file
-        if src_file.exists():
-            dst_file.write_text(src_file.read_text(encoding="utf-8"), encoding="utf-8")
-            print(f"[OK] Copied: {h_file}")
+    if passes:
+        headers = {h: (COMMON_DIR / h).read_text(encoding="utf-8") for h in SHARED_HEADERS}
+        with profiler.stage("optimize"):
+            report = optimize(files, headers, passes)
+        print_report(report)
+        print()
+
+    with profiler.stage("write"):
+        for filename, content in files.items():
+            output_file = output_dir / filename
+            output_file.write_text(content, encoding="utf-8")
+            print(f"[OK] Created: {filename}")
+
+        # device_config.h and pin_manager.h are not copied: the include
+        # path resolves them in src/common. A copy left here by an older
+        # run would shadow them, so it is removed
+        for h_file in SHARED_HEADERS:
+            stale_copy = output_dir / h_file
+            if stale_copy.exists():
+                stale_copy.unlink()
+            print(f"[OK] Shared: {h_file} (src/common)")
 
     print()
     print("*** Manual transpilation completed!")
@@ -678,4 +1179,14 @@ bool Button_readHardwareState(Button* self);
 
 
 if __name__ == "__main__":
-    create_manual_transpiled_c()
+    parser = argparse.ArgumentParser(description="Manual C++ to C transpilation for cpp-multi")
+    parser.add_argument("--output", help="Output directory (default: generated_c)")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="Skip the transpile_passes optimizations (full out-of-line API)")
+    parser.add_argument("--passes", type=parse_passes, default=PASSES,
+                        help=f"Comma-separated passes to run (default: {','.join(PASSES)})")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler.from_args(args, "manual_transpile")
+    create_manual_transpiled_c(args.output, passes=() if args.no_optimize else args.passes, profiler=profiler)
+    profiler.print_summary()
@@ -0,0 +1,84 @@
+/**
+ * @file scheduler.cpp
+ * @brief Cooperative task scheduler C++ class implementation for PIC16F876A
+ * @author Sébastien Celles
+ * @date 2025
+ * @version 1.0
+ *
+ * @details Implementation of the Scheduler class methods.
+ *          This file will be transpiled to C using xc8plusplus.
+ */
+
+#include <xc.h>
+#include "scheduler.hpp"
+
+Scheduler::Scheduler() : taskCount(0), now(0), overruns(0) {
+    // Constructor - tasks are added with addTask()
+}
+
+bool Scheduler::addTask(TaskFunction function, unsigned int period, unsigned int offset) {
+    if (taskCount >= SCHEDULER_MAX_TASKS) {
+        return false;
+    }
+
+    Task* task = &tasks[taskCount];
+    task->function = function;
+    task->period = period;
+    task->countdown = offset + 1;
+    task->deadline = 0;
+    task->ready = false;
+    taskCount++;
+    return true;
+}
+
+void Scheduler::tick() {
+    // Interrupt context: only release tasks, never run them here
+    now++;
+    for (unsigned char i = 0; i < taskCount; i++) {
+        Task* task = &tasks[i];
+        if (--task->countdown == 0) {
+            task->countdown = task->period;
+            if (task->ready) {
+                overruns++;         // Previous release has not run yet
+            }
+            task->deadline = now + task->period;
+            task->ready = true;
+        }
+    }
+}
+
+void Scheduler::runPending() {
+    while (true) {
+        // Pick the released task with the earliest deadline. Interrupts are
+        // masked so the 16-bit deadlines are read consistently.
+        Task* next = 0;
+        INTCONbits.GIE = 0;
+        for (unsigned char i = 0; i < taskCount; i++) {
+            Task* task = &tasks[i];
+            if (task->ready && (next == 0 || (int)(task->deadline - next->deadline) < 0)) {
+                next = task;
+            }
+        }
+        if (next != 0) {
+            next->ready = false;
+        }
+        INTCONbits.GIE = 1;
+
+        if (next == 0) {
+            return;
+        }
+        next->function();
+    }
+}
+
+unsigned int Scheduler::getTicks() const {
+    unsigned int ticks;
+    INTCONbits.GIE = 0;
+    ticks = now;
+    INTCONbits.GIE = 1;
+    return ticks;
+}
+
+unsigned char Scheduler::getOverruns() const {
+    return overruns;
+}
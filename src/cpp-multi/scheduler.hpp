@@ -0,0 +1,92 @@
+/**
+ * @file scheduler.hpp
+ * @brief Cooperative task scheduler C++ class for PIC16F876A
+ * @author Sébastien Celles
+ * @date 2025
+ * @version 1.0
+ *
+ * @details Runs periodic tasks from the main loop, driven by the Timer0
+ *          interrupt tick. Tasks and their run-queue flags live in a
+ *          fixed-size array: no dynamic allocation, no busy-wait delays.
+ *          This file will be transpiled to C using xc8plusplus.
+ */
+
+#ifndef SCHEDULER_HPP
+#define SCHEDULER_HPP
+
+/**
+ * @brief Maximum number of periodic tasks
+ */
+#define SCHEDULER_MAX_TASKS 6
+
+/**
+ * @brief Task entry point (runs to completion, must not block)
+ */
+typedef void (*TaskFunction)(void);
+
+/**
+ * @brief Periodic task descriptor
+ */
+struct Task {
+    TaskFunction function;       ///< Task entry point
+    unsigned int period;         ///< Period in ticks
+    unsigned int countdown;      ///< Ticks until the next release
+    unsigned int deadline;       ///< Tick by which the current release must run
+    volatile bool ready;         ///< Queued for execution
+};
+
+/**
+ * @brief Cooperative scheduler C++ class
+ * @details tick() is called from the Timer0 ISR and releases due tasks;
+ *          runPending() is called from loop() and runs released tasks,
+ *          earliest deadline first.
+ */
+class Scheduler {
+private:
+    Task tasks[SCHEDULER_MAX_TASKS];
+    unsigned char taskCount;
+    volatile unsigned int now;
+    unsigned char overruns;
+
+public:
+    /**
+     * @brief Scheduler constructor
+     * @details Starts with an empty task table
+     */
+    Scheduler();
+
+    /**
+     * @brief Register a periodic task
+     * @param function Task entry point
+     * @param period Period in ticks (1 tick = 1ms)
+     * @param offset Ticks before the first release (spreads tasks apart)
+     * @return false if the task table is full
+     */
+    bool addTask(TaskFunction function, unsigned int period, unsigned int offset);
+
+    /**
+     * @brief Advance time by one tick
+     * @details Called from the Timer0 interrupt service routine
+     */
+    void tick();
+
+    /**
+     * @brief Run every released task
+     * @details Called from loop(); returns once the run queue is empty
+     */
+    void runPending();
+
+    /**
+     * @brief Get the number of ticks since start
+     * @return Tick counter (wraps at 65536)
+     */
+    unsigned int getTicks() const;
+
+    /**
+     * @brief Get the number of missed releases
+     * @return Releases that found their task still queued
+     */
+    unsigned char getOverruns() const;
+};
+
+#endif // SCHEDULER_HPP
@@ -12,7 +12,7 @@
 #include "timer0.hpp"
 #include "device_config.h"
 
-Timer0::Timer0() : initialized(false) {
+Timer0::Timer0() : initialized(false), tickRunning(false), ticks(0) {
     // Constructor - initialization will be done in initialize() method
 }
 
@@ -25,14 +25,14 @@ Timer0::~Timer0() {
 
 void Timer0::initialize() {
     // Configure Timer0
-    // Timer0 configuration for 4MHz oscillator (1MHz instruction cycle)
-    // Prescaler 1:256, Timer0 = internal clock
+    // Prescaler 1:4, Timer0 = internal clock: TIMER0_DELAY_COUNTS_PER_MS
+    // counts per millisecond (250 at 4MHz)
     
     OPTION_REGbits.T0CS = 0;    // Timer0 clock source = internal instruction cycle
     OPTION_REGbits.T0SE = 0;    // Timer0 source edge = increment on low-to-high transition
     OPTION_REGbits.PSA = 0;     // Prescaler assigned to Timer0
-    OPTION_REGbits.PS2 = 1;     // Prescaler rate select bits
-    OPTION_REGbits.PS1 = 1;     // 111 = 1:256 prescaler
+    OPTION_REGbits.PS2 = 0;     // Prescaler rate select bits
+    OPTION_REGbits.PS1 = 0;     // 001 = 1:4 prescaler
     OPTION_REGbits.PS0 = 1;
     
     TMR0 = 0;                   // Clear Timer0 register
@@ -49,52 +49,80 @@ void Timer0::delay50ms() {
     if (!initialized) {
         return;
     }
-    
-    // For 50ms delay with 4MHz clock (1MHz instruction cycle) and 1:256 prescaler:
-    // Timer0 increments every 256 instruction cycles = 256µs
-    // For 50ms delay: 50000µs / 256µs = 195.3 ≈ 195 counts
-    // Load Timer0 with (256 - 195) = 61
-    
-    TMR0 = 61;                  // Load Timer0 for 50ms delay
-    INTCONbits.T0IF = 0;        // Clear overflow flag
-    
-    while (!INTCONbits.T0IF) {  // Wait for Timer0 overflow
-        // Wait for overflow
+
+    if (tickRunning) {
+        delay(50);              // Timer0 is owned by the tick interrupt
+        return;
     }
-    
-    INTCONbits.T0IF = 0;        // Clear overflow flag
+
+    // 50ms = 12500 counts at 4MHz: 48 overflows + 212 counts
+    TIMER0_DELAY_MS(*this, 50);
 }
 
 void Timer0::delay(unsigned int milliseconds) {
     if (!initialized) {
         return;
     }
-    
-    // Delay using multiple 50ms delays for accuracy
-    unsigned int fiftyMsCount = milliseconds / 50;
-    unsigned int remainder = milliseconds % 50;
-    
-    // Perform 50ms delays
-    for (unsigned int i = 0; i < fiftyMsCount; i++) {
-        delay50ms();
+
+    if (tickRunning) {
+        // Wait on the tick counter (wraparound-safe subtraction)
+        unsigned int start = getTicks();
+        while (getTicks() - start < milliseconds / TIMER0_TICK_MS) {
+            // Interrupts keep running meanwhile
+        }
+        return;
     }
     
-    // Handle remainder using proportional calculation
-    if (remainder > 0) {
-        // Calculate Timer0 load value for remainder
-        // remainder ms = remainder * 1000µs
-        // Timer0 counts needed = (remainder * 1000) / 256
-        unsigned int counts = (remainder * 1000) / 256;
-        if (counts > 255) counts = 255;
-        
-        TMR0 = 256 - counts;
-        INTCONbits.T0IF = 0;
-        
+    // Timer0 runs freely from here: each millisecond moves the target
+    // TMR0 value by TIMER0_DELAY_COUNTS_PER_MS counts, and the overflows
+    // it carries into are waited for as they come.
+    unsigned int overflows = 0;
+    unsigned char target = 0;
+
+    TMR0 = 0;
+    INTCONbits.T0IF = 0;
+
+    while (milliseconds != 0) {
+        unsigned char previous = target;
+        overflows += TIMER0_DELAY_OVERFLOWS(1);
+        target += TIMER0_DELAY_REMAINDER(1);
+        if (target < previous) {
+            overflows++;        // Carry out of the 8-bit target
+        }
+        milliseconds--;
+
+        while (overflows != 0) {
+            while (!INTCONbits.T0IF) {
+                // Wait for overflow
+            }
+            INTCONbits.T0IF = 0;
+            overflows--;
+        }
+    }
+
+    while (TMR0 < target) {
+        // Wait for the last partial period
+    }
+}
+
+void Timer0::delayCounts(unsigned int overflows, unsigned char remainder) {
+    if (!initialized || tickRunning) {
+        return;
+    }
+
+    TMR0 = 0;                   // Start of the delay (also clears the prescaler)
+    INTCONbits.T0IF = 0;
+
+    while (overflows != 0) {
         while (!INTCONbits.T0IF) {
             // Wait for overflow
         }
-        
         INTCONbits.T0IF = 0;
+        overflows--;
+    }
+
+    while (TMR0 < remainder) {
+        // Wait for the last partial period
     }
 }
 
@@ -123,3 +151,36 @@ unsigned char Timer0::getValue() const {
     }
     return 0;
 }
+
+void Timer0::startTick() {
+    // Prescaler picked from _XTAL_FREQ so that one tick is
+    // TIMER0_TICK_COUNTS counts (1:4 at 4MHz)
+    OPTION_REGbits.T0CS = 0;    // Internal instruction cycle clock
+    OPTION_REGbits.PSA = 0;     // Prescaler assigned to Timer0
+    OPTION_REGbits.PS2 = (TIMER0_TICK_PS >> 2) & 1;
+    OPTION_REGbits.PS1 = (TIMER0_TICK_PS >> 1) & 1;
+    OPTION_REGbits.PS0 = TIMER0_TICK_PS & 1;
+
+    ticks = 0;
+    TMR0 = TIMER0_TICK_RELOAD;
+    INTCONbits.T0IF = 0;
+    INTCONbits.T0IE = 1;        // Enable Timer0 interrupt
+    INTCONbits.GIE = 1;         // Enable global interrupts
+
+    initialized = true;
+    tickRunning = true;
+}
+
+void Timer0::handleInterrupt() {
+    TMR0 += TIMER0_TICK_RELOAD;
+    INTCONbits.T0IF = 0;
+    ticks++;
+}
+
+unsigned int Timer0::getTicks() const {
+    unsigned int value;
+    INTCONbits.GIE = 0;         // 16-bit read must not be torn by the ISR
+    value = ticks;
+    INTCONbits.GIE = 1;
+    return value;
+}
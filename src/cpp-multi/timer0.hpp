@@ -14,6 +14,94 @@
 #define TIMER0_HPP
 
 #include <xc.h>
+#include "device_config.h"
+
+/**
+ * @brief Tick period of the Timer0 interrupt, in milliseconds
+ */
+#define TIMER0_TICK_MS 1
+
+/**
+ * @brief Instruction cycles per tick (1000 at 4MHz)
+ */
+#define TIMER0_TICK_CYCLES (_XTAL_FREQ / 4UL / 1000UL * TIMER0_TICK_MS)
+
+/**
+ * @brief PS2:PS0 of the tick: the smallest prescaler fitting a tick in TMR0
+ * @details 1:4 at 4MHz, 1:8 at 8MHz, 1:32 at 20MHz
+ */
+#if TIMER0_TICK_CYCLES <= 2UL * 256
+#define TIMER0_TICK_PS 0
+#elif TIMER0_TICK_CYCLES <= 4UL * 256
+#define TIMER0_TICK_PS 1
+#elif TIMER0_TICK_CYCLES <= 8UL * 256
+#define TIMER0_TICK_PS 2
+#elif TIMER0_TICK_CYCLES <= 16UL * 256
+#define TIMER0_TICK_PS 3
+#elif TIMER0_TICK_CYCLES <= 32UL * 256
+#define TIMER0_TICK_PS 4
+#elif TIMER0_TICK_CYCLES <= 64UL * 256
+#define TIMER0_TICK_PS 5
+#elif TIMER0_TICK_CYCLES <= 128UL * 256
+#define TIMER0_TICK_PS 6
+#elif TIMER0_TICK_CYCLES <= 256UL * 256
+#define TIMER0_TICK_PS 7
+#else
+#error "TIMER0_TICK_MS is too long for Timer0 at this _XTAL_FREQ (more than 256 counts at 1:256)"
+#endif
+
+/**
+ * @brief Timer0 prescaler divisor selected by TIMER0_TICK_PS
+ */
+#define TIMER0_TICK_PRESCALE (2UL << TIMER0_TICK_PS)
+
+/**
+ * @brief Timer0 counts per tick (250 at 4MHz)
+ */
+#define TIMER0_TICK_COUNTS (TIMER0_TICK_CYCLES / TIMER0_TICK_PRESCALE)
+
+#if TIMER0_TICK_COUNTS == 0 || TIMER0_TICK_COUNTS > 256
+#error "Timer0 tick does not fit in TMR0: check _XTAL_FREQ and TIMER0_TICK_MS"
+#endif
+#if (TIMER0_TICK_CYCLES % TIMER0_TICK_PRESCALE) != 0
+#warning "_XTAL_FREQ is not a multiple of the Timer0 tick prescaler: the tick is rounded down"
+#endif
+
+/**
+ * @brief Value added to TMR0 on each tick interrupt
+ * @details Adding (rather than loading) keeps the interrupt latency
+ *          out of the tick period.
+ */
+#define TIMER0_TICK_RELOAD ((unsigned char)(256 - TIMER0_TICK_COUNTS))
+
+/**
+ * @brief Timer0 counts per millisecond for delays (1:4 prescaler, 250 at 4MHz)
+ * @details Derived from _XTAL_FREQ (board_build.f_cpu). Delays are exact
+ *          to the count when _XTAL_FREQ is a multiple of 16kHz.
+ */
+#define TIMER0_DELAY_COUNTS_PER_MS (_XTAL_FREQ / 4UL / 4UL / 1000UL)
+
+#if (_XTAL_FREQ % 16000UL) != 0
+#warning "_XTAL_FREQ is not a multiple of 16kHz: Timer0 delays are rounded down"
+#endif
+
+/**
+ * @brief Timer0 overflows and final TMR0 value of a delay
+ * @details Folded by the compiler for constant arguments, so
+ *          TIMER0_DELAY_MS() costs no runtime arithmetic.
+ */
+#define TIMER0_DELAY_COUNTS(ms)    ((unsigned long)(ms) * TIMER0_DELAY_COUNTS_PER_MS)
+#define TIMER0_DELAY_OVERFLOWS(ms) ((unsigned int)(TIMER0_DELAY_COUNTS(ms) >> 8))
+#define TIMER0_DELAY_REMAINDER(ms) ((unsigned char)(TIMER0_DELAY_COUNTS(ms) & 0xFF))
+
+/**
+ * @brief Delay for a constant number of milliseconds
+ * @details Busy-wait mode only: once startTick() runs, use delay()
+ * @param timer Timer0 instance
+ * @param ms Compile-time constant delay (up to 65535 ms at 4MHz)
+ */
+#define TIMER0_DELAY_MS(timer, ms) \
+    (timer).delayCounts(TIMER0_DELAY_OVERFLOWS(ms), TIMER0_DELAY_REMAINDER(ms))
 
 /**
  * @brief Timer0 C++ class for PIC16F876A
@@ -22,6 +110,8 @@
 class Timer0 {
 private:
     bool initialized;
+    bool tickRunning;
+    volatile unsigned int ticks;
     
 public:
     /**
@@ -39,7 +129,7 @@ public:
     /**
      * @brief Initialize Timer0
      * @details Configures Timer0 for timer mode operation
-     *          with appropriate prescaler for 4MHz frequency
+     *          with the 1:4 delay prescaler
      */
     void initialize();
     
@@ -57,9 +147,22 @@ public:
     
     /**
      * @brief Custom delay using Timer0
+     * @details Runtime fallback for variable delays: the per-millisecond
+     *          counts are accumulated while Timer0 runs, without division
+     *          or multiplication. Prefer TIMER0_DELAY_MS() for constants.
      * @param milliseconds Delay time in milliseconds
      */
     void delay(unsigned int milliseconds);
+
+    /**
+     * @brief Delay for a precomputed number of Timer0 counts
+     * @details TMR0 is written once at the start and then runs freely, so
+     *          the only error is the polling latency (a few cycles).
+     *          Does nothing while the tick interrupt owns Timer0.
+     * @param overflows Full 256-count Timer0 periods
+     * @param remainder Counts after the last overflow
+     */
+    void delayCounts(unsigned int overflows, unsigned char remainder);
     
     /**
      * @brief Start Timer0
@@ -84,6 +187,27 @@ public:
      * @return Current timer value
      */
     unsigned char getValue() const;
+
+    /**
+     * @brief Start the periodic tick interrupt
+     * @details Configures Timer0 with a 1:4 prescaler for a TIMER0_TICK_MS
+     *          interrupt and enables interrupts. Delays then wait on the
+     *          tick counter instead of reprogramming Timer0.
+     */
+    void startTick();
+
+    /**
+     * @brief Timer0 interrupt handler
+     * @details Called from the interrupt service routine on T0IF:
+     *          reloads TMR0, clears the flag and counts the tick
+     */
+    void handleInterrupt();
+
+    /**
+     * @brief Get the tick counter
+     * @return Ticks since startTick() (wraps at 65536)
+     */
+    unsigned int getTicks() const;
 };
 
 #endif // TIMER0_HPP
@@ -6,18 +6,24 @@ Uses xc8plusplus Python API to transpile C++ files to C
 
 import os
 import sys
+import argparse
 from pathlib import Path
 
-# Add the xc8plusplus package to Python path
+# Add the xc8plusplus package and draft/ (--profile) to Python path
 project_root = Path(__file__).parent.parent.parent
 xc8plusplus_src = project_root / "xc8plusplus" / "src"
 sys.path.insert(0, str(xc8plusplus_src))
+sys.path.append(str(project_root / "draft"))
 
 from xc8plusplus import XC8Transpiler
 
+from transpile_passes import PASSES, optimize, parse_passes, print_report
+from profiling import StageProfiler, add_arguments as add_profile_arguments
 
-def transpile_cpp_to_c():
+
+def transpile_cpp_to_c(passes=PASSES, profiler=None):
     """Transpile all C++ files in cpp-multi to C equivalents"""
+    profiler = profiler or StageProfiler(None, "transpile")
 
     # Define source and output directories
     cpp_multi_dir = Path(__file__).parent
@@ -48,7 +54,8 @@ def transpile_cpp_to_c():
         print(f"📄 Transpiling {cpp_file.name} -> {output_file.name}")
 
         try:
-            success = transpiler.transpile(cpp_file, output_file)
+            with profiler.stage(f"transpile:{cpp_file.name}"):
+                success = transpiler.transpile(cpp_file, output_file)
             if success:
                 print(f"   ✅ Success: {output_file}")
             else:
@@ -65,24 +72,36 @@ def transpile_cpp_to_c():
         try:
             # For headers, we'll do a simple conversion
             # Remove C++ specific syntax and convert to C-compatible headers
-            convert_hpp_to_h(hpp_file, output_file)
+            with profiler.stage(f"headers:{hpp_file.name}"):
+                convert_hpp_to_h(hpp_file, output_file)
             print(f"   ✅ Success: {output_file}")
         except Exception as e:
             print(f"   ❌ Error: {e}")
         print()
 
-    # Copy device_config.h and pin_manager.h as-is
-    for h_file in ["device_config.h", "pin_manager.h"]:
-        src_file = cpp_multi_dir / h_file
-        dst_file = output_dir / h_file
-        if src_file.exists():
-            print(f"📄 Copying {h_file}")
-            try:
-                dst_file.write_text(src_file.read_text())
-                print(f"   ✅ Success: {dst_file}")
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
-            print()
+    # device_config.h and pin_manager.h are shared with src/multi and
+    # resolved in src/common through the include path, so nothing is
+    # copied; a copy left by an older run would shadow them
+    common_dir = cpp_multi_dir.parent / "common"
+    shared = ["device_config.h", "pin_manager.h"]
+    for h_file in shared:
+        stale_copy = output_dir / h_file
+        if stale_copy.exists():
+            stale_copy.unlink()
+        print(f"📄 Shared: {h_file} ({common_dir})")
+    print()
+
+    # Optimization passes over the whole program (see transpile_passes.py)
+    if passes:
+        print("⚡ Optimizing generated C")
+        files = {path.name: path.read_text() for path in sorted(output_dir.glob("*.[ch]"))}
+        headers = {name: (common_dir / name).read_text() for name in shared}
+        with profiler.stage("optimize"):
+            report = optimize(files, headers, passes)
+        print_report(report)
+        for name, content in files.items():
+            (output_dir / name).write_text(content)
+        print()
 
     print("🎉 Transpilation completed!")
     print(f"Generated C files are in: {output_dir}")
@@ -125,4 +144,13 @@ def convert_hpp_to_h(hpp_file, h_file):
 
 
 if __name__ == "__main__":
-    transpile_cpp_to_c()
+    parser = argparse.ArgumentParser(description="C++ to C transpilation with xc8plusplus")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="Skip the transpile_passes optimizations (full out-of-line API)")
+    parser.add_argument("--passes", type=parse_passes, default=PASSES,
+                        help=f"Comma-separated passes to run (default: {','.join(PASSES)})")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler.from_args(args, "transpile")
+    transpile_cpp_to_c(passes=() if args.no_optimize else args.passes, profiler=profiler)
+    profiler.print_summary()
@@ -0,0 +1,741 @@
+#!/usr/bin/env python3
+"""
+Optimization passes over the transpiled C of the cpp-multi project
+
+The transpiler (manual_transpile.py, or xc8plusplus via transpile.py) maps
+every C++ method to an out-of-line `Class_method(Class* self, ...)`
+function. On the PIC16 each call costs a level of the 8-deep hardware
+stack and every field access goes through FSR/INDF. These passes rewrite
+the generated files (a {filename: C source} dict) before they are written:
+
+  - specialize_singletons: classes with a single global instance get
+    methods without `self` that access the instance's fields directly
+  - inline_trivial_methods: one-statement methods and accessors become
+    `static inline` functions in the class header
+  - eliminate_dead_methods: methods not reachable from main/setup/loop or
+    an interrupt handler are not emitted at all
+  - lower_pin_switches: dense enum switches selecting a pin_manager.h pin
+    become `const` port address/mask tables (RETLW tables in program
+    memory)
+  - pack_struct_fields: bool and small enum fields of a class share flag
+    bytes as bitfields instead of taking a byte each
+
+optimize() runs them all; `passes` (--passes in the transpile scripts)
+selects some of them, e.g. "switches" keeps the full out-of-line API of
+the host build while still lowering its pin switches.
+"""
+
+import re
+from dataclasses import dataclass
+
+C_KEYWORDS = {
+    "if", "else", "for", "while", "do", "switch", "case", "default", "break",
+    "continue", "return", "goto", "sizeof", "true", "false",
+}
+
+_FUNCTION_HEAD = re.compile(
+    r"^(?P<head>(?:[A-Za-z_]\w*(?:\([^()\n]*\))?[ \t*]+)+)"
+    r"(?P<name>[A-Za-z_]\w*)\((?P<params>[^()]*)\)\s*\{",
+    re.M,
+)
+_IDENTIFIER = re.compile(r"(?<![\w.>])(?<!->)\b([A-Za-z_]\w*)\b")
+_INSTANCE = re.compile(r"^(?P<type>[A-Za-z_]\w*)[ \t]+(?P<names>[A-Za-z_]\w*(?:[ \t]*,[ \t]*[A-Za-z_]\w*)*)[ \t]*;", re.M)
+_STRUCT = re.compile(r"typedef struct (\w+) \{.*?\} \1;", re.S)
+_MACRO = re.compile(r"^#define[ \t]+([A-Za-z_]\w*)", re.M)
+_MACRO_BODY = re.compile(r"^#define[ \t]+([A-Za-z_]\w*)(?:\([^)]*\))?((?:[^\n]*\\\n)*[^\n]*)", re.M)
+_SELF_MACRO = re.compile(r"#define[ \t]+\w+\(\s*self\s*[,)]")
+
+_PIN = re.compile(r"^#define[ \t]+(\w+)[ \t]+PORT([A-C])bits\.R[A-C]([0-7])[ \t]*$", re.M)
+_ENUM = re.compile(r"typedef enum\s*\w*\s*\{(?P<body>[^}]*)\}\s*(?P<name>\w+);")
+_SWITCH = re.compile(r"^(?P<indent>[ \t]*)switch[ \t]*\((?P<subject>[\w.>\-]+)\)[ \t]*\{", re.M)
+_LABEL = re.compile(r"\b(?:case[ \t]+(\w+)|default)[ \t]*:")
+_FIELD = re.compile(
+    r"^(?P<indent>[ \t]+)(?P<type>(?:volatile[ \t]+)?[A-Za-z_]\w*)[ \t]+(?P<name>\w+)[ \t]*;"
+    r"(?P<comment>[ \t]*//[^\n]*)?$", re.M
+)
+
+# Entry points of the firmware, besides the interrupt handlers
+ROOTS = ("main", "setup", "loop")
+
+# Passes, in the order they run (names as in the report and --passes)
+PASSES = ("dead", "singletons", "switches", "packed", "inlined")
+
+# Data memory address of each port (PIC16F87xA datasheet, bank 0)
+PORT_ADDRESSES = {"A": 0x05, "B": 0x06, "C": 0x07}
+
+# Register at a data address, for the port address tables. The host build
+# (draft/host/xc.h) defines its own, reaching its simulated registers
+PIN_PORT_MACRO = """#ifndef PIN_PORT_AT
+#define PIN_PORT_AT(address) (*(volatile unsigned char *)(address))
+#endif
+"""
+
+
+@dataclass
+class Function:
+    """A function definition located in a C source"""
+
+    name: str
+    head: str        # Return type and qualifiers, e.g. "unsigned char "
+    params: str
+    body: str        # Between the braces
+    start: int       # Start of the definition, leading comment lines included
+    end: int         # Just past the closing brace and its newline
+
+    @property
+    def param_names(self):
+        names = []
+        for param in self.params.split(","):
+            match = re.search(r"(\w+)\s*(?:\[[^\]]*\])?\s*$", param.strip())
+            if match and match.group(1) != "void":
+                names.append(match.group(1))
+        return names
+
+
+def strip_comments(source):
+    """Source with comments replaced by spaces (offsets are preserved)"""
+    def blank(match):
+        return re.sub(r"[^\n]", " ", match.group(0))
+    return re.sub(r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\])*\"", blank, source, flags=re.S)
+
+
+def find_functions(source):
+    """Function definitions in a C source, in order"""
+    code = strip_comments(source)
+    functions = []
+    for match in _FUNCTION_HEAD.finditer(code):
+        if functions and match.start() < functions[-1].end:
+            continue
+        depth = 0
+        for index in range(match.end() - 1, len(code)):
+            if code[index] == "{":
+                depth += 1
+            elif code[index] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+        end = index + 1
+        if end < len(source) and source[end] == "\n":
+            end += 1
+
+        # Take the comment lines directly above the definition with it
+        start = leading_comment_start(source, match.start())
+
+        functions.append(Function(
+            name=match.group("name"),
+            head=match.group("head"),
+            params=match.group("params").strip(),
+            body=source[match.end():index],
+            start=start,
+            end=end,
+        ))
+    return functions
+
+
+def class_of(function, classes):
+    """Class whose method this is (first parameter `Class* self`), or None"""
+    match = re.match(r"(\w+)\s*\*\s*self\b", function.params)
+    if match and match.group(1) in classes and function.name.startswith(match.group(1) + "_"):
+        return match.group(1)
+    return None
+
+
+def find_classes(files):
+    """Struct typedefs of the headers: {class name: header file}"""
+    classes = {}
+    for filename, source in files.items():
+        if filename.endswith(".h"):
+            for match in _STRUCT.finditer(source):
+                classes[match.group(1)] = filename
+    return classes
+
+
+def find_instances(files, classes):
+    """Global instances declared at file scope: {class name: [names]}"""
+    instances = {}
+    for filename, source in files.items():
+        if not filename.endswith(".c"):
+            continue
+        code = strip_comments(source)
+        inside = [(f.start, f.end) for f in find_functions(source)]
+        for match in _INSTANCE.finditer(code):
+            if match.group("type") not in classes:
+                continue
+            if any(start <= match.start() < end for start, end in inside):
+                continue
+            names = [name.strip() for name in match.group("names").split(",")]
+            instances.setdefault(match.group("type"), []).extend(names)
+    return instances
+
+
+def unused_classes(files):
+    """Struct typedefs no code refers to outside the typedef itself
+
+    A class with no instance, parameter, field or cast of its type left
+    (e.g. once its methods are all dead) only survives as a declaration.
+    """
+    classes = find_classes(files)
+    used = set()
+    for filename, source in files.items():
+        code = strip_comments(source)
+        if filename.endswith(".h"):
+            code = _STRUCT.sub("", code)
+        used.update(_IDENTIFIER.findall(code))
+    return sorted(set(classes) - used)
+
+
+def replace_spans(source, replacements):
+    """Apply (start, end, text) replacements to a source"""
+    for start, end, text in sorted(replacements, reverse=True):
+        source = source[:start] + text + source[end:]
+    return source
+
+
+def leading_comment_start(source, start):
+    """Start of the `//` comment lines directly above `start`"""
+    while start > 0:
+        previous = source.rfind("\n", 0, start - 1) + 1
+        if not source[previous:start].lstrip().startswith("//"):
+            break
+        start = previous
+    return start
+
+
+def self_macros(files, methods):
+    """Function-like macros taking `self` first and calling one of `methods`
+
+    e.g. `#define TIMER0_DELAY_MS(self, ms) Timer0_delayCounts((self), ...)`:
+    they are rewritten along with the methods they call.
+    """
+    macros = []
+    for source in files.values():
+        for match in _MACRO_BODY.finditer(strip_comments(source)):
+            if not _SELF_MACRO.match(match.group(0)):
+                continue
+            if set(_IDENTIFIER.findall(match.group(2))) & set(methods):
+                macros.append(match.group(1))
+    return macros
+
+
+def _self_call(method, instance):
+    """Calls passing `self` or `&instance` as the first argument"""
+    return re.compile(
+        rf"\b{method}\(\s*\(?\s*(?:&\s*{instance}|self)\s*\)?\s*(?:,\s*|(?=\)))"
+    )
+
+
+def specialize_singletons(files):
+    """Drop `self` from the methods of classes with one global instance
+
+    `Class_method(&instance, args)` becomes `Class_method(args)` and the
+    method reads `instance.field` instead of `self->field`, so XC8 uses
+    direct (banked) addressing instead of FSR/INDF. A class qualifies only
+    if every use of its methods is a call on that instance.
+    """
+    classes = find_classes(files)
+    instances = find_instances(files, classes)
+    specialized = {}
+
+    for cls, names in instances.items():
+        if len(names) != 1:
+            continue
+        instance = names[0]
+        methods = []
+        for source in files.values():
+            methods += [f.name for f in find_functions(source) if class_of(f, classes) == cls]
+        if not methods:
+            continue
+        macros = self_macros(files, methods)
+        methods += macros
+
+        # Every reference must be a prototype, a definition or a self call
+        eligible = True
+        for filename, source in files.items():
+            code = strip_comments(source)
+            for method in methods:
+                uses = len(re.findall(rf"\b{method}\b", code))
+                calls = len(_self_call(method, instance).findall(code))
+                declared = len(re.findall(rf"\b{method}\(\s*{cls}\s*\*\s*self\b", code))
+                if uses != calls + declared:
+                    eligible = False
+        if not eligible:
+            continue
+
+        for filename, source in files.items():
+            for method in methods:
+                source = re.sub(rf"\b{method}\(\s*{cls}\s*\*\s*self\s*\)", f"{method}(void)", source)
+                source = re.sub(rf"\b{method}\(\s*{cls}\s*\*\s*self\s*,\s*", f"{method}(", source)
+                source = _self_call(method, instance).sub(f"{method}(", source)
+
+            # Method bodies: self->field is now instance.field
+            replacements = []
+            for function in find_functions(source):
+                if function.name in methods:
+                    body = re.sub(r"\bself->", f"{instance}.", function.body)
+                    body = re.sub(r"\bself\b", f"&{instance}", body)
+                    text = source[function.start:function.end]
+                    head_end = text.index("{", text.index(function.name)) + 1
+                    text = text[:head_end] + body + text[head_end + len(function.body):]
+                    replacements.append((function.start, function.end, text))
+            # Macro bodies: (self)->field and self as well
+            for match in _MACRO_BODY.finditer(source):
+                if match.group(1) in macros:
+                    body = re.sub(r"\(\s*self\s*\)->|\bself->", f"{instance}.", match.group(2))
+                    body = re.sub(r"\bself\b", f"(&{instance})", body)
+                    replacements.append((match.start(2), match.end(2), body))
+            files[filename] = replace_spans(source, replacements)
+
+        # The methods now reference the instance, which lives in main.c
+        header = classes[cls]
+        typedef = re.search(rf"\}} {cls};\n", files[header])
+        declaration = (f"\n// Single instance (defined in main.c), accessed directly by the methods\n"
+                       f"extern {cls} {instance};\n")
+        files[header] = files[header][:typedef.end()] + declaration + files[header][typedef.end():]
+        specialized[cls] = instance
+
+    return specialized
+
+
+def is_trivial(function, allowed):
+    """One statement, no control flow, only fields/params/known names"""
+    body = strip_comments(function.body).strip()
+    if body.count(";") != 1 or not body.endswith(";") or "{" in body:
+        return False
+    first = re.match(r"[A-Za-z_]\w*", body)
+    if not first or (first.group(0) in C_KEYWORDS and first.group(0) != "return"):
+        return False
+    names = set(_IDENTIFIER.findall(body)) - {"return"}
+    return names <= allowed | set(function.param_names)
+
+
+def inline_trivial_methods(files):
+    """Move one-statement methods into their header as `static inline`"""
+    classes = find_classes(files)
+    inlined = []
+
+    for filename in [name for name in files if name.endswith(".c")]:
+        source = files[filename]
+        removals = []
+        for function in find_functions(source):
+            cls = next((c for c in classes if function.name.startswith(c + "_")), None)
+            if cls is None or "static" in function.head:
+                continue
+            header = classes[cls]
+            prototype = re.compile(
+                rf"^{re.escape(function.head.strip())}[ \t]+{function.name}\([^)]*\);[ \t]*\n", re.M
+            )
+            declaration = prototype.search(files[header])
+            if not declaration:
+                continue
+
+            # Names the header can resolve: its macros, the instance, self
+            allowed = {"self", "true", "false"} | set(_MACRO.findall(files[header]))
+            allowed |= set(re.findall(r"^extern \w+ (\w+);", files[header], re.M))
+            if not is_trivial(function, allowed):
+                continue
+
+            body = strip_comments(function.body).strip()
+            inline = (f"static inline {function.head.strip()} {function.name}({function.params}) {{\n"
+                      f"    {body}\n}}\n")
+            files[header] = files[header][:declaration.start()] + inline + files[header][declaration.end():]
+            removals.append((function.start, function.end, ""))
+            inlined.append(function.name)
+
+        source = replace_spans(source, removals)
+        files[filename] = re.sub(r"\n{3,}", "\n\n", source)
+
+    return inlined
+
+
+def call_graph(files):
+    """Definitions and the names each one references
+
+    Returns ({function or macro: names referenced}, names referenced at
+    file scope of the .c files, e.g. by initializers). Macros are nodes
+    too, so a method only reached through a macro stays alive.
+    """
+    graph = {}
+    top_level = set()
+    for filename, source in files.items():
+        code = strip_comments(source)
+        for match in _MACRO_BODY.finditer(code):
+            graph.setdefault(match.group(1), set()).update(_IDENTIFIER.findall(match.group(2)))
+        functions = find_functions(source)
+        for function in functions:
+            graph.setdefault(function.name, set()).update(
+                _IDENTIFIER.findall(strip_comments(function.body)))
+        if filename.endswith(".c"):
+            outside = replace_spans(code, [(f.start, f.end, "") for f in functions])
+            outside = re.sub(r"^#[^\n]*(?:\\\n[^\n]*)*", "", outside, flags=re.M)
+            top_level.update(_IDENTIFIER.findall(outside))
+    return graph, top_level
+
+
+def eliminate_dead_methods(files):
+    """Drop the methods no entry point can reach
+
+    Walks the call graph from main/setup/loop, the `__interrupt`
+    functions and the names used at file scope (function pointers in
+    initializers); any other method is removed with its prototype.
+    Only class methods are candidates, plain C functions are kept.
+    Macros naming a removed method are unreachable too (a macro is a
+    node of the graph) and are removed with it, so none is left
+    expanding to an undeclared function. So are the struct typedefs of
+    classes nothing refers to any more.
+    """
+    classes = find_classes(files)
+    definitions = {}
+    for filename, source in files.items():
+        for function in find_functions(source):
+            definitions[function.name] = function
+
+    graph, reachable = call_graph(files)
+    reachable |= set(ROOTS)
+    reachable |= {name for name, f in definitions.items() if "__interrupt" in f.head}
+    pending = list(reachable)
+    while pending:
+        for name in graph.get(pending.pop(), ()):
+            if name not in reachable:
+                reachable.add(name)
+                pending.append(name)
+
+    dead = sorted(
+        name for name in definitions
+        if name not in reachable and any(name.startswith(cls + "_") for cls in classes)
+    )
+    dead_macros = set()
+    for filename, source in files.items():
+        removals = [(f.start, f.end, "") for f in find_functions(source) if f.name in dead]
+        for match in _MACRO_BODY.finditer(strip_comments(source)):
+            if set(_IDENTIFIER.findall(match.group(2))) & set(dead):
+                end = match.end() + 1 if source[match.end():match.end() + 1] == "\n" else match.end()
+                removals.append((leading_comment_start(source, match.start()), end, ""))
+                dead_macros.add(match.group(1))
+        source = replace_spans(source, removals)
+        for name in dead:
+            source = re.sub(rf"^[^\n;{{}}#]*\b{name}\([^;{{]*\);[ \t]*\n", "", source, flags=re.M)
+        # Section comments left without anything under them
+        source = re.sub(r"^// Function prototypes[^\n]*\n(?=\n|#endif)", "", source, flags=re.M)
+        source = re.sub(r"^// === Class \w+ transformed to C ===\n\s*(?=// === Class|\Z)", "", source, flags=re.M)
+        files[filename] = re.sub(r"\n{3,}", "\n\n", source).rstrip("\n") + "\n"
+
+    # A dead struct can be the only user of another one: repeat until stable
+    dead_classes = []
+    while True:
+        unused = unused_classes(files)
+        if not unused:
+            break
+        for filename, source in files.items():
+            removals = [
+                (leading_comment_start(source, match.start()), match.end() + 1, "")
+                for match in _STRUCT.finditer(source) if match.group(1) in unused
+            ]
+            if removals:
+                source = replace_spans(source, removals)
+                files[filename] = re.sub(r"\n{3,}", "\n\n", source)
+        dead_classes += unused
+    return dead + sorted(dead_macros) + sorted(dead_classes)
+
+
+def find_pins(sources):
+    """Pin macros of the form `#define LED0 PORTAbits.RA3`: {name: (port, bit)}"""
+    pins = {}
+    for source in sources:
+        for match in _PIN.finditer(source):
+            pins[match.group(1)] = (match.group(2), int(match.group(3)))
+    return pins
+
+
+def find_enumerators(sources):
+    """Enumerators of the typedef enums: {name: (enum type, value)}"""
+    enumerators = {}
+    for source in sources:
+        for match in _ENUM.finditer(strip_comments(source)):
+            value = -1
+            for item in match.group("body").split(","):
+                item = item.strip()
+                if not item:
+                    continue
+                name, _, number = item.partition("=")
+                value = int(number.strip(), 0) if number.strip() else value + 1
+                enumerators[name.strip()] = (match.group("name"), value)
+    return enumerators
+
+
+def _pin_statements(template, port, mask):
+    """C lines for a case template, `@PIN` standing for the looked-up pin"""
+    read = f"(({port} & {mask}) != 0)"
+    template = re.sub(r"\(\s*@PIN\s*==\s*1\s*\)", read, template)
+    template = re.sub(r"@PIN\s*==\s*1\b", read, template)
+    template = re.sub(r"@PIN\s*==\s*0\b", f"(({port} & {mask}) == 0)", template)
+    lines = []
+    for statement in re.findall(r"[^;]+;", template):
+        statement = statement.strip()
+        assignment = re.fullmatch(r"@PIN\s*=\s*(.+);", statement)
+        if assignment is None:
+            lines.append(statement.replace("@PIN", read))
+        elif assignment.group(1) == "1":
+            lines.append(f"{port} |= {mask};")
+        elif assignment.group(1) == "0":
+            lines.append(f"{port} &= (unsigned char)~{mask};")
+        else:
+            lines += [f"if ({assignment.group(1)}) {{", f"    {port} |= {mask};",
+                      "} else {", f"    {port} &= (unsigned char)~{mask};", "}"]
+    return lines
+
+
+def _lower_switch(code, match, pins, enumerators, tables):
+    """Replacement text for one switch, or None if it is not a pin switch"""
+    depth, index = 0, match.end() - 1
+    for index in range(match.end() - 1, len(code)):
+        depth += {"{": 1, "}": -1}.get(code[index], 0)
+        if depth == 0:
+            break
+    block = code[match.end():index]
+    if "{" in block or "switch" in block:
+        return None
+
+    labels = list(_LABEL.finditer(block))
+    if not labels or block[:labels[0].start()].strip():
+        return None
+    cases, default = {}, None
+    for label, following in zip(labels, labels[1:] + [None]):
+        body = " ".join(block[label.end():following.start() if following else len(block)].split())
+        if label.group(1) is None:
+            default = body
+        elif label.group(1) in enumerators:
+            cases[label.group(1)] = body
+        else:
+            return None
+
+    # Dense: the cases cover every value 0..N-1 of one enum
+    enum = {enumerators[name][0] for name in cases}
+    values = sorted(enumerators[name][1] for name in cases)
+    if len(enum) != 1 or values != list(range(len(values))):
+        return None
+
+    # Every case must be the same code on a different pin
+    templates, case_pins = set(), {}
+    for name, body in cases.items():
+        used = {word for word in re.findall(r"\b\w+\b", body) if word in pins}
+        if len(used) != 1:
+            return None
+        pin = used.pop()
+        case_pins[enumerators[name][1]] = pins[pin]
+        templates.add(re.sub(rf"\b{pin}\b", "@PIN", body))
+    if len(templates) != 1:
+        return None
+    template = templates.pop()
+    if template.endswith("break;"):
+        template = template[:-len("break;")].strip()
+    elif not template.startswith("return"):
+        return None  # falls through to the next case
+
+    enum = enum.pop()
+    prefix = enum[:-2] if enum.endswith("_t") else enum
+    layout = tuple(case_pins[value] for value in range(len(values)))
+    name = tables.setdefault(layout, (prefix, enum))[0]
+    subject = match.group("subject")
+    port = f"PIN_PORT_AT({name}_pinPort[{subject}])"
+    mask = f"{name}_pinMask[{subject}]"
+
+    indent = match.group("indent")
+    lines = [f"// {enum} switch lowered to a pin lookup table",
+             f"if ((unsigned char){subject} < {len(values)}) {{"]
+    lines += ["    " + line for line in _pin_statements(template, port, mask)]
+    if default and default != "break;":
+        lines += ["} else {"] + ["    " + line for line in _pin_statements(default.removesuffix("break;"), port, mask)]
+    lines.append("}")
+    text = "\n".join(indent + line for line in lines)
+    return match.start(), index + 1, text, enum, len(values)
+
+
+def lower_pin_switches(files, headers=None):
+    """Replace enum switches over pin_manager.h pins with table lookups
+
+    A switch qualifies when its cases cover one enum densely (0..N-1) and
+    each case runs the same statements on a different pin macro. The pins
+    become a port address table and a bit mask table (`static const`, so
+    XC8 places them in program memory) and the compare chain becomes one
+    bounds check plus an indirect access through FSR/INDF.
+    """
+    sources = list(files.values()) + list((headers or {}).values())
+    pins = find_pins(sources)
+    enumerators = find_enumerators(sources)
+    lowered = []
+
+    for filename in [name for name in files if name.endswith(".c")]:
+        source = files[filename]
+        tables = {}
+        replacements = []
+        for function in find_functions(source):
+            offset = source.index("{", source.index(function.name + "(", function.start)) + 1
+            code = strip_comments(source)[:function.end]
+            for match in _SWITCH.finditer(code, offset):
+                result = _lower_switch(code, match, pins, enumerators, tables)
+                if result is None:
+                    continue
+                start, end, text, enum, count = result
+                replacements.append((start, end, text))
+                lowered.append((function.name, enum, count))
+        if not replacements:
+            continue
+
+        definitions = [PIN_PORT_MACRO + "\n"]
+        for layout, (name, enum) in tables.items():
+            ports = ", ".join(f"0x{PORT_ADDRESSES[port]:02X}" for port, _ in layout)
+            masks = ", ".join(f"0x{1 << bit:02X}" for _, bit in layout)
+            definitions.append(
+                f"// Pin of each {enum}: port address (PORTA-PORTC) and bit mask\n"
+                f"static const unsigned char {name}_pinPort[{len(layout)}] = {{ {ports} }};\n"
+                f"static const unsigned char {name}_pinMask[{len(layout)}] = {{ {masks} }};\n\n"
+            )
+        # Tables go after the includes, ahead of the first class
+        banner = source.find("// === Class")
+        position = banner if banner >= 0 else find_functions(source)[0].start
+        replacements.append((position, position, "".join(definitions)))
+        files[filename] = replace_spans(source, replacements)
+
+    return lowered
+
+
+def pack_struct_fields(files):
+    """Pack the bool and small enum fields of each struct into bitfields
+
+    A bool takes one bit (`bool flag : 1` keeps the conversion to 0/1),
+    an enum the bits of its largest value (`unsigned id : 2`), so a
+    Button's id and two states share one byte instead of three. Fields
+    that are volatile (shared with the ISR: a bitfield write is a
+    read-modify-write of the whole byte) or whose address is taken are
+    left alone. A struct is only rewritten if it gets smaller, and only
+    if something uses its type: the bytes of a class without instances
+    are not saved anywhere.
+
+    Returns {class: (packed field names, bytes saved per instance)}.
+    """
+    enums = {}
+    for source in files.values():
+        for match in _ENUM.finditer(strip_comments(source)):
+            enums[match.group("name")] = []
+    for name, (enum, value) in find_enumerators(files.values()).items():
+        enums[enum].append(value)
+    code = "\n".join(strip_comments(source) for source in files.values())
+    unused = set(unused_classes(files))
+    packed = {}
+
+    for filename, source in list(files.items()):
+        if not filename.endswith(".h"):
+            continue
+        replacements = []
+        for struct in _STRUCT.finditer(source):
+            if struct.group(1) in unused:
+                continue
+            fields = []
+            for field in _FIELD.finditer(source, struct.start(), struct.end()):
+                kind = field.group("type")
+                if kind == "bool":
+                    bits = 1
+                elif kind in enums and enums[kind] and min(enums[kind]) >= 0:
+                    bits = max(max(enums[kind]).bit_length(), 1)
+                else:
+                    continue
+                address = rf"(?:[(,=]|\breturn)\s*&\s*\(?\s*(?:\w+\s*(?:->|\.)\s*)+{field.group('name')}\b"
+                if re.search(address, code):
+                    continue
+                fields.append((field, bits))
+
+            # Bitfields fill a byte before starting the next one
+            units = []
+            for _, bits in fields:
+                for index, used in enumerate(units):
+                    if used + bits <= 8:
+                        units[index] += bits
+                        break
+                else:
+                    units.append(bits)
+            saved = len(fields) - len(units)
+            if saved <= 0:
+                continue
+
+            # Adjacent bitfields share storage: group them at the first one
+            lines = []
+            for field, bits in fields:
+                kind, name = field.group("type"), field.group("name")
+                if kind == "bool":
+                    declaration = f"bool {name} : 1;"
+                    comment = field.group("comment") or ""
+                else:
+                    declaration = f"unsigned int {name} : {bits};"
+                    comment = (field.group("comment") or "").strip()
+                    comment = f" // {kind}" + (f", {comment[2:].strip()}" if comment else "")
+                lines.append(f"{field.group('indent')}{declaration}{comment}")
+                replacements.append((field.start(), field.end() + 1, ""))
+            first = fields[0][0]
+            replacements[-len(fields)] = (first.start(), first.end() + 1, "\n".join(lines) + "\n")
+            packed[struct.group(1)] = ([field.group("name") for field, _ in fields], saved)
+        files[filename] = replace_spans(source, replacements)
+
+    return packed
+
+
+def parse_passes(text):
+    """--passes value: "dead,switches" -> ("dead", "switches"), in run order"""
+    import argparse
+
+    names = {name.strip() for name in text.split(",") if name.strip()}
+    unknown = names - set(PASSES)
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown pass(es) {', '.join(sorted(unknown))} (available: {', '.join(PASSES)})"
+        )
+    return tuple(name for name in PASSES if name in names)
+
+
+def optimize(files, headers=None, passes=PASSES):
+    """Run the passes over the generated files, in place; returns a report
+
+    `headers` are included files the passes read but do not rewrite
+    (pin_manager.h for the pin definitions).
+    """
+    report = {}
+    if "dead" in passes:
+        report["dead"] = eliminate_dead_methods(files)
+    if "singletons" in passes:
+        report["singletons"] = specialize_singletons(files)
+    if "switches" in passes:
+        report["switches"] = lower_pin_switches(files, headers)
+    if "packed" in passes:
+        report["packed"] = pack_struct_fields(files)
+    if "inlined" in passes:
+        report["inlined"] = inline_trivial_methods(files)
+    return report
+
+
+def print_report(report):
+    """Summary printed by the transpile scripts"""
+    dead = report.get("dead", [])
+    if dead:
+        print(f"Unreachable methods, macros and classes removed ({len(dead)}):")
+        for name in dead:
+            print(f"   * {name}")
+    singletons = report.get("singletons", {})
+    if singletons:
+        print("Direct field access (single instance):")
+        for cls, instance in sorted(singletons.items()):
+            print(f"   * {cls} -> {instance}")
+    switches = report.get("switches", [])
+    if switches:
+        print(f"Pin switches lowered to lookup tables ({len(switches)}):")
+        for function, enum, count in switches:
+            print(f"   * {function}: {enum}, {count} cases")
+    packed = report.get("packed", {})
+    if packed:
+        print("Fields packed into bitfields (RAM layout):")
+        for cls, (fields, saved) in sorted(packed.items()):
+            print(f"   * {cls}: {', '.join(fields)} -> {saved} byte{'s' if saved > 1 else ''} "
+                  f"saved per instance")
+    inlined = report.get("inlined", [])
+    if inlined:
+        print(f"Inlined trivial methods ({len(inlined)}):")
+        for name in inlined:
+            print(f"   * {name}")
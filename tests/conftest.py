@@ -0,0 +1,11 @@
+"""
+Test configuration: the draft/ tools are scripts, not a package, so their
+directory is put on sys.path as when they are run from it
+"""
+
+import sys
+from pathlib import Path
+
+DRAFT_DIR = Path(__file__).resolve().parent.parent / "draft"
+if str(DRAFT_DIR) not in sys.path:
+    sys.path.insert(0, str(DRAFT_DIR))
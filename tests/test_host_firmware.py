@@ -0,0 +1,113 @@
+"""
+Button, LED and Timer0 scenarios on the host build of the firmware
+
+The classes run from draft/host_harness.py: the transpiled C compiled
+with the host gcc against the stand-in xc.h, registers mapped with
+ctypes, busy-waits on a virtual clock.
+"""
+
+import shutil
+
+import pytest
+
+from host_harness import CC, HostFirmware
+
+pytestmark = pytest.mark.skipif(shutil.which(CC) is None, reason=f"{CC} is not installed")
+
+# Outputs configured by pin_manager.c besides the LEDs keep their reset level
+PORTA_OTHER_BITS = 0xD7
+PORTC_OTHER_BITS = 0xF8
+
+
+@pytest.fixture(scope="module")
+def api():
+    """cpp-multi classes with their full self-pointer API"""
+    return HostFirmware("cpp-multi-api")
+
+
+@pytest.fixture
+def fw(api):
+    api.reset()
+    return api
+
+
+@pytest.mark.parametrize("level, pressed", [(0, True), (1, False)])
+def test_button_debounce(fw, level, pressed):
+    button = fw.new()
+    fw.lib.Button_init(button, 0)
+    fw.set_pin("PORTA", 2, level)  # PB0 on RA2, active low
+    for _ in range(6):
+        fw.lib.Button_update(button)
+    assert bool(fw.lib.Button_isPressed(button)) == pressed
+
+
+def test_button_needs_stable_samples(fw):
+    button = fw.new()
+    fw.lib.Button_init(button, 0)
+    fw.set_pin("PORTA", 2, 0)
+    fw.lib.Button_update(button)
+    assert not fw.lib.Button_isPressed(button)
+
+
+@pytest.mark.parametrize("pressed", [0x00, 0x02, 0x04, 0x10, 0x16])
+def test_button_bank_debounce(fw, pressed):
+    bank = fw.new()
+    fw.lib.ButtonBank_init(bank)
+    fw.set_register("PORTA", 0xFF & ~pressed)
+    for _ in range(4):
+        fw.lib.ButtonBank_update(bank)
+    assert fw.lib.ButtonBank_getState(bank) == pressed
+
+
+@pytest.mark.parametrize("led, port, bit", [(0, "PORTA", 3), (1, "PORTA", 5), (4, "PORTC", 2)])
+def test_led_toggle(fw, led, port, bit):
+    fw.set_register("TRISA", 0)
+    fw.set_register("TRISC", 0)
+    handle = fw.new()
+    fw.lib.Led_init(handle, led)
+    assert fw.pin(port, bit) == 0
+    fw.lib.Led_toggle(handle)
+    assert fw.pin(port, bit) == 1
+    assert fw.lib.Led_isOn(handle)
+    fw.lib.Led_toggle(handle)
+    assert fw.pin(port, bit) == 0
+
+
+@pytest.mark.parametrize("mask", range(0x20))
+def test_led_group_commit_keeps_other_pins(fw, mask):
+    fw.set_register("TRISA", 0)
+    fw.set_register("TRISC", 0)
+    group = fw.new()
+    fw.lib.LedGroup_init(group)
+    fw.lib.LedGroup_write(group, mask)
+    fw.lib.LedGroup_commit(group)
+    assert fw.register("PORTA") == PORTA_OTHER_BITS | (mask & 1) << 3 | (mask & 2) << 4
+    assert fw.register("PORTC") == PORTC_OTHER_BITS | (mask & 0x1F) >> 2
+
+
+@pytest.mark.parametrize("ms", [1, 50, 200])
+def test_timer0_delay(fw, ms):
+    timer = fw.new()
+    fw.lib.Timer0_init(timer)
+    fw.lib.Timer0_initialize(timer)
+    start = fw.cycles
+    fw.lib.Timer0_delay(timer, ms)
+    elapsed_ms = (fw.cycles - start) * 4000.0 / fw.f_cpu
+    assert elapsed_ms == pytest.approx(ms, abs=0.05)
+
+
+@pytest.mark.parametrize("target", ["cpp-multi", "cpp-multi-api"])
+def test_main_ticks_every_millisecond(target):
+    fw = HostFirmware(target)
+    fw.set_isr("isr")
+    fw.run("main", ms=100)
+    assert fw.state.interrupts == pytest.approx(100, abs=1)
+
+
+def test_multi_delay_50ms():
+    fw = HostFirmware("multi")
+    fw.lib.TIMER0_Initialize()
+    start = fw.cycles
+    fw.lib.delay_50ms_timer0()
+    # Polled overflows: the loop overhead adds a fraction of a percent
+    assert (fw.cycles - start) * 4000.0 / fw.f_cpu == pytest.approx(50, rel=0.01)
@@ -0,0 +1,33 @@
+"""
+Import-time budget of the draft/ entry points (see draft/import_time.py)
+
+compile.py and upload.py must start fast: the wrappers, logbook and
+colorama are imported when first needed, never at module level.
+"""
+
+import importlib.util
+
+import pytest
+
+from import_time import DEFAULT_BUDGETS_MS, DEFAULT_REPEAT, best_of
+
+# Imported on first use only: loading them at module level is the
+# regression import_time.py exists to catch
+DEFERRED_MODULES = ("xc8_wrapper", "ipecmd_wrapper", "logbook", "colorama")
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("typer") is None, reason="typer is not installed"
+)
+
+
+@pytest.mark.parametrize("module", sorted(DEFAULT_BUDGETS_MS))
+def test_import_within_budget(module):
+    entry, _ = best_of(module, DEFAULT_REPEAT)
+    assert entry.cumulative_us / 1000 <= DEFAULT_BUDGETS_MS[module]
+
+
+@pytest.mark.parametrize("module", sorted(DEFAULT_BUDGETS_MS))
+def test_heavy_modules_deferred(module):
+    _, children = best_of(module, 1)
+    imported = {child.name.split(".")[0] for child in children}
+    assert not imported & set(DEFERRED_MODULES)